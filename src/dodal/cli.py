@@ -5,6 +5,7 @@ from bluesky.run_engine import RunEngine
 from ophyd_async.core import NotConnected
 
 from dodal.beamlines import all_beamline_names, module_name_for_beamline
+from dodal.common.beamlines.beamline_utils import connect_devices
 from dodal.utils import make_all_devices
 
 from . import __version__
@@ -53,16 +54,31 @@ def connect(beamline: str, all: bool, sim_backend: bool) -> None:
     RunEngine()
 
     print(f"Attempting connection to {beamline} (using {full_module_path})")
+    # Make every device without connecting, then connect them all at once so that
+    # slow connections time out in parallel rather than one after another
     devices, exceptions = make_all_devices(
         full_module_path,
         include_skipped=all,
+        wait_for_connection=False,
         fake_with_ophyd_sim=sim_backend,
     )
+    connection_exceptions, timings = connect_devices(devices, mock=sim_backend)
+    exceptions = {**exceptions, **connection_exceptions}
+    devices = {
+        name: device
+        for name, device in devices.items()
+        if name not in connection_exceptions
+    }
     sim_statement = " (sim mode)" if sim_backend else ""
 
     print(f"{len(devices)} devices connected{sim_statement}:")
     connected_devices = "\n".join(
-        sorted([f"\t{device_name}" for device_name in devices.keys()])
+        sorted(
+            [
+                f"\t{device_name} ({timings.get(device_name, 0.0):.2f}s)"
+                for device_name in devices.keys()
+            ]
+        )
     )
     print(connected_devices)
 
@@ -1,4 +1,7 @@
-from typing import Any, cast
+import os
+import threading
+from collections.abc import Iterable
+from typing import Any
 
 from dodal.log import LOGGER
 from dodal.utils import get_beamline_name
@@ -11,6 +14,9 @@ BEAMLINE_PARAMETER_PATHS = {
     "s03": "tests/test_data/test_beamline_parameters.txt",
 }
 
+# XXX removes all whitespace instead of just trim
+_REMOVE_WHITESPACE = str.maketrans("", "", " \n\t\r")
+
 
 class GDABeamlineParameters:
     params: dict[str, Any]
@@ -25,36 +31,27 @@ class GDABeamlineParameters:
         return self.params[item]
 
     @classmethod
-    def from_lines(cls, file_name: str, config_lines: list[str]):
-        config_lines_nocomments = [line.split("#", 1)[0] for line in config_lines]
-        config_lines_sep_key_and_value = [
-            # XXX removes all whitespace instead of just trim
-            line.translate(str.maketrans("", "", " \n\t\r")).split("=")
-            for line in config_lines_nocomments
-        ]
-        config_pairs: list[tuple[str, Any]] = [
-            cast(tuple[str, Any], param)
-            for param in config_lines_sep_key_and_value
-            if len(param) == 2
-        ]
-        for i, (param, value) in enumerate(config_pairs):
+    def from_lines(cls, file_name: str, config_lines: Iterable[str]):
+        params: dict[str, Any] = {}
+        for line_number, line in enumerate(config_lines, start=1):
+            key_and_value = line.partition("#")[0]
+            if key_and_value.count("=") != 1:
+                continue
+            param, _, value = key_and_value.translate(_REMOVE_WHITESPACE).partition("=")
             try:
                 # BEAMLINE_PARAMETER_KEYWORDS effectively raw string but whitespace removed
                 if value not in BEAMLINE_PARAMETER_KEYWORDS:
-                    config_pairs[i] = (
-                        param,
-                        cls.parse_value(value),
-                    )
+                    value = cls.parse_value(value)
             except Exception as e:
-                LOGGER.warning(f"Unable to parse {file_name} line {i}: {e}")
+                LOGGER.warning(f"Unable to parse {file_name} line {line_number}: {e}")
+            params[param] = value
 
-        return cls(params=dict(config_pairs))
+        return cls(params=params)
 
     @classmethod
     def from_file(cls, path: str):
         with open(path) as f:
-            config_lines = f.readlines()
-        return cls.from_lines(path, config_lines)
+            return cls.from_lines(path, f)
 
     @classmethod
     def parse_value(cls, value: str):
@@ -88,9 +85,13 @@ class GDABeamlineParameters:
         return list_output
 
 
-def get_beamline_parameters(beamline_param_path: str | None = None):
-    """Loads the beamline parameters from the specified path, or according to the
-    environment variable if none is given"""
+# Parameters by path, along with the modification time and size of the file they were
+# read from
+_beamline_parameters: dict[str, tuple[tuple[int, int], GDABeamlineParameters]] = {}
+_beamline_parameters_lock = threading.Lock()
+
+
+def _get_beamline_parameter_path(beamline_param_path: str | None) -> str:
     if not beamline_param_path:
         beamline_name = get_beamline_name("s03")
         beamline_param_path = BEAMLINE_PARAMETER_PATHS.get(beamline_name)
@@ -98,4 +99,43 @@ def get_beamline_parameters(beamline_param_path: str | None = None):
             raise KeyError(
                 "No beamline parameter path found, maybe 'BEAMLINE' environment variable is not set!"
             )
-    return GDABeamlineParameters.from_file(beamline_param_path)
+    return beamline_param_path
+
+
+def _file_version(path: str) -> tuple[int, int]:
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_beamline_parameters(beamline_param_path: str | None = None):
+    """Loads the beamline parameters from the specified path, or according to the
+    environment variable if none is given.
+
+    The parameters are cached for the whole process and the file is only parsed again
+    if its modification time or size has changed, so the returned parameters are shared
+    and must not be changed."""
+    path = _get_beamline_parameter_path(beamline_param_path)
+    version = _file_version(path)
+    with _beamline_parameters_lock:
+        cached_version, params = _beamline_parameters.get(path, (None, None))
+    if params is None or cached_version != version:
+        params = _load_beamline_parameters(path, version)
+    return params
+
+
+def refresh_beamline_parameters(beamline_param_path: str | None = None):
+    """Parses the beamline parameters from the specified path, or according to the
+    environment variable if none is given, even if the file looks unchanged, and
+    caches them for get_beamline_parameters"""
+    path = _get_beamline_parameter_path(beamline_param_path)
+    return _load_beamline_parameters(path, _file_version(path))
+
+
+def _load_beamline_parameters(
+    path: str, version: tuple[int, int]
+) -> GDABeamlineParameters:
+    LOGGER.info(f"Reading beamline parameters from {path}")
+    params = GDABeamlineParameters.from_file(path)
+    with _beamline_parameters_lock:
+        _beamline_parameters[path] = (version, params)
+    return params
@@ -1,5 +1,9 @@
+import asyncio
 import inspect
-from collections.abc import Callable
+import threading
+import time
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from typing import Final, TypeVar, cast
 
 from bluesky.run_engine import call_in_bluesky_event_loop
@@ -14,6 +18,8 @@ from dodal.utils import AnyDevice, BeamlinePrefix, skip_device
 DEFAULT_CONNECTION_TIMEOUT: Final[float] = 5.0
 
 ACTIVE_DEVICES: dict[str, AnyDevice] = {}
+_INSTANTIATION_LOCKS: dict[str, threading.RLock] = {}
+_INSTANTIATION_LOCKS_LOCK = threading.Lock()
 BL = ""
 PATH_PROVIDER: UpdatingPathProvider | None = None
 
@@ -34,6 +40,11 @@ def clear_device(name: str):
     del ACTIVE_DEVICES[name]
 
 
+def _instantiation_lock(name: str) -> threading.RLock:
+    with _INSTANTIATION_LOCKS_LOCK:
+        return _INSTANTIATION_LOCKS.setdefault(name, threading.RLock())
+
+
 def list_active_devices() -> list[str]:
     global ACTIVE_DEVICES
     return list(ACTIVE_DEVICES.keys())
@@ -64,6 +75,77 @@ def wait_for_connection(
         )
 
 
+def connect_devices(
+    devices: Mapping[str, AnyDevice],
+    timeout: float = DEFAULT_CONNECTION_TIMEOUT,
+    mock: bool = False,
+) -> tuple[dict[str, Exception], dict[str, float]]:
+    """Connect many devices at once rather than waiting on each in turn. All ophyd-async
+    devices are connected in a single gather on the bluesky event loop while ophyd v1
+    devices wait for their connections in a thread pool.
+
+    Args:
+        devices: Mapping of device name -> device, as returned by make_all_devices
+        timeout: The connection timeout for each device
+        mock: Whether to connect ophyd-async devices in mock mode
+
+    Returns:
+        Tuple[Dict[str, Exception], Dict[str, float]]: Tuple of two dictionaries. One
+        mapping device name to exception for any device that failed to connect, one
+        mapping device name to the time in seconds spent connecting it
+    """
+    exceptions: dict[str, Exception] = {}
+    timings: dict[str, float] = {}
+
+    def connect_v1_device(name: str, device: OphydV1Device) -> None:
+        start = time.monotonic()
+        try:
+            device.wait_for_connection(timeout=timeout)
+        finally:
+            timings[name] = time.monotonic() - start
+
+    async def connect_v2_device(name: str, device: OphydV2Device) -> None:
+        start = time.monotonic()
+        try:
+            await device.connect(mock=mock, timeout=timeout)
+        finally:
+            timings[name] = time.monotonic() - start
+
+    async def connect_v2_devices() -> list[BaseException | None]:
+        return await asyncio.gather(
+            *(connect_v2_device(name, device) for name, device in v2_devices.items()),
+            return_exceptions=True,
+        )
+
+    v1_devices: dict[str, OphydV1Device] = {}
+    v2_devices: dict[str, OphydV2Device] = {}
+    for name, device in devices.items():
+        if isinstance(device, OphydV1Device):
+            v1_devices[name] = device
+        elif isinstance(device, OphydV2Device):
+            v2_devices[name] = device
+        else:
+            exceptions[name] = TypeError(
+                f"Invalid type {device.__class__.__name__} in connect_devices"
+            )
+
+    with ThreadPoolExecutor(thread_name_prefix="dodal_v1_connect") as executor:
+        v1_futures = {
+            name: executor.submit(connect_v1_device, name, device)
+            for name, device in v1_devices.items()
+        }
+        if v2_devices:
+            v2_results = call_in_bluesky_event_loop(connect_v2_devices())
+            for name, result in zip(v2_devices, v2_results, strict=True):
+                if isinstance(result, Exception):
+                    exceptions[name] = result
+        for name, future in v1_futures.items():
+            if (exception := future.exception()) is not None:
+                exceptions[name] = cast(Exception, exception)
+
+    return exceptions, timings
+
+
 T = TypeVar("T", bound=AnyDevice)
 
 
@@ -94,34 +176,37 @@ def device_instantiation(
     Returns:
         The instance of the device.
     """
-    already_existing_device: AnyDevice | None = ACTIVE_DEVICES.get(name)
-    if fake:
-        device_factory = cast(Callable[..., T], make_fake_device(device_factory))
-    if already_existing_device is None:
-        device_instance = device_factory(
-            name=name,
-            prefix=(
-                f"{(BeamlinePrefix(BL).beamline_prefix)}{prefix}"
-                if bl_prefix
-                else prefix
-            ),
-            **kwargs,
-        )
-        ACTIVE_DEVICES[name] = device_instance
-        if wait:
-            wait_for_connection(device_instance, mock=fake)
-
-    else:
-        if not active_device_is_same_type(already_existing_device, device_factory):
-            raise TypeError(
-                f"Can't instantiate device of type {device_factory} with the same "
-                f"name as an existing device. Device name '{name}' already used for "
-                f"a(n) {type(already_existing_device)}."
+    # Factories may be called concurrently and often call each other, so make sure
+    # only one thread creates (and connects) a device with any given name
+    with _instantiation_lock(name):
+        already_existing_device: AnyDevice | None = ACTIVE_DEVICES.get(name)
+        if fake:
+            device_factory = cast(Callable[..., T], make_fake_device(device_factory))
+        if already_existing_device is None:
+            device_instance = device_factory(
+                name=name,
+                prefix=(
+                    f"{(BeamlinePrefix(BL).beamline_prefix)}{prefix}"
+                    if bl_prefix
+                    else prefix
+                ),
+                **kwargs,
             )
-        device_instance = cast(T, already_existing_device)
-    if post_create:
-        post_create(device_instance)
-    return device_instance
+            ACTIVE_DEVICES[name] = device_instance
+            if wait:
+                wait_for_connection(device_instance, mock=fake)
+
+        else:
+            if not active_device_is_same_type(already_existing_device, device_factory):
+                raise TypeError(
+                    f"Can't instantiate device of type {device_factory} with the same "
+                    f"name as an existing device. Device name '{name}' already used for "
+                    f"a(n) {type(already_existing_device)}."
+                )
+            device_instance = cast(T, already_existing_device)
+        if post_create:
+            post_create(device_instance)
+        return device_instance
 
 
 def set_path_provider(provider: UpdatingPathProvider):
@@ -3,6 +3,10 @@ from dataclasses import dataclass
 from enum import Enum
 from typing import Literal
 
+# Conversion constant for energy and wavelength, taken from the X-Ray data booklet
+# Converts between energy in KeV and wavelength in angstrom
+ENERGY_WAVELENGTH_CONVERSION_CONSTANT = 12.3984
+
 
 @dataclass(frozen=True)
 class Material:
@@ -1,13 +1,18 @@
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
-from aiohttp import ClientSession
 from ophyd_async.core import FilenameProvider, PathInfo
 from pydantic import BaseModel
 
 from dodal.common.types import UpdatingPathProvider
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
+
+if TYPE_CHECKING:
+    import aiohttp
+else:
+    aiohttp = lazy_import("aiohttp")
 
 """
 Functionality required for/from the API of a DirectoryService which exposes the specifics of the Diamond filesystem.
@@ -73,7 +78,7 @@ class RemoteDirectoryServiceClient(DirectoryServiceClient):
         method: Literal["GET", "POST"],
     ) -> DataCollectionIdentifier:
         async with (
-            ClientSession() as session,
+            aiohttp.ClientSession() as session,
             session.request(method, f"{self._url}/numtracker") as response,
         ):
             response.raise_for_status()
@@ -120,7 +125,7 @@ class StaticVisitPathProvider(UpdatingPathProvider):
         self._filename_provider = DiamondFilenameProvider(self._beamline, self._client)
         self._root = root
         self.current_collection: PathInfo | None
-        self._session: ClientSession | None
+        self._session: aiohttp.ClientSession | None
 
     async def update(self, **kwargs) -> None:
         """
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from typing import Any
 
 import numpy as np
+import numpy.typing as npt
 from bluesky.protocols import Movable
 from ophyd_async.core import (
     AsyncStatus,
@@ -83,6 +84,100 @@ class Lookuptable(RootModel):
     root: dict[str, LookupTableEntries]
 
 
+@dataclass(frozen=True)
+class EnergyPolynomials:
+    """
+    The polynomials for one polarisation of an Apple2 lookup table, compiled so that
+    the gap or phase for many energies can be found at once.
+
+    low and high are the energy range of each polynomial, sorted by low, and each row
+    of coefficients holds a polynomial's coefficients, highest power first, padded with
+    zeros to the highest degree in the table.
+    """
+
+    low: np.ndarray
+    high: np.ndarray
+    coefficients: np.ndarray
+    minimum: float
+    maximum: float
+
+    @classmethod
+    def from_lookup_table_entries(
+        cls, entries: dict[str, dict[str, Any]]
+    ) -> "EnergyPolynomials":
+        """
+        Compiles the entry for one polarisation of a table in Lookuptable format.
+
+        Raises:
+            ValueError: if the table has no energy ranges, a range is empty or ranges
+                overlap, as the polynomial for an energy would then be ambiguous
+        """
+        energies = sorted(entries["Energies"].values(), key=lambda e: e["Low"])
+        if not energies:
+            raise ValueError("Lookup table has no energy ranges")
+        for energy_range in energies:
+            if energy_range["Low"] >= energy_range["High"]:
+                raise ValueError(
+                    f"Lookup table energy range {energy_range['Low']} to "
+                    f"{energy_range['High']} eV is empty"
+                )
+        for below, above in zip(energies, energies[1:], strict=False):
+            if below["High"] > above["Low"]:
+                raise ValueError(
+                    f"Lookup table energy ranges {below['Low']} to {below['High']} eV "
+                    f"and {above['Low']} to {above['High']} eV overlap"
+                )
+        degree = max((e["Poly"].order for e in energies), default=0)
+        coefficients = np.zeros((len(energies), degree + 1))
+        for row, energy_range in zip(coefficients, energies, strict=True):
+            poly_coefficients = energy_range["Poly"].coeffs
+            row[degree + 1 - len(poly_coefficients) :] = poly_coefficients
+        polynomials = cls(
+            low=np.array([e["Low"] for e in energies], dtype=float),
+            high=np.array([e["High"] for e in energies], dtype=float),
+            coefficients=coefficients,
+            minimum=entries["Limit"]["Minimum"],
+            maximum=entries["Limit"]["Maximum"],
+        )
+        # Compiled tables are shared between devices so must not be changed
+        for array in (polynomials.low, polynomials.high, polynomials.coefficients):
+            array.setflags(write=False)
+        return polynomials
+
+    def __call__(self, energy: npt.ArrayLike) -> np.ndarray:
+        """
+        Evaluates the polynomial covering each energy, which may be an array, using
+        Horner's method.
+        """
+        energy = np.asarray(energy, dtype=float)
+        if np.any((energy < self.minimum) | (energy > self.maximum)):
+            raise ValueError(
+                f"Demanding energy must lie between {self.minimum} and "
+                f"{self.maximum} eV!"
+            )
+        index = np.searchsorted(self.low, energy, side="right") - 1
+        if np.any(index < 0) or np.any(energy >= self.high[index]):
+            raise ValueError(
+                """Cannot find polynomial coefficients for your requested energy.
+        There might be gap in the calibration lookup table."""
+            )
+        coefficients = self.coefficients[index]
+        result = np.zeros_like(energy)
+        for power in range(self.coefficients.shape[1]):
+            result = result * energy + coefficients[..., power]
+        return result
+
+
+def compile_lookup_table(
+    lookup_table: dict[str | None, dict[str, dict[str, Any]]],
+) -> dict[str | None, EnergyPolynomials]:
+    """Compiles each polarisation of a table in Lookuptable format"""
+    return {
+        pol: EnergyPolynomials.from_lookup_table_entries(entries)
+        for pol, entries in lookup_table.items()
+    }
+
+
 ROW_PHASE_MOTOR_TOLERANCE = 0.004
 MAXIMUM_ROW_PHASE_MOTOR_POSITION = 24.0
 MAXIMUM_GAP_MOTOR_POSITION = 100
@@ -405,13 +500,19 @@ class Apple2(StandardReadable, Movable):
             "Gap": {},
             "Phase": {},
         }
+        # The same two lookup tables compiled with compile_lookup_table, which is what
+        # is used to convert energies
+        self.energy_polynomials: dict[str, dict[str | None, EnergyPolynomials]] = {
+            "Gap": {},
+            "Phase": {},
+        }
         # List of available polarisation according to the lookup table.
         self._available_pol = []
         # The polarisation state of the id that are use for internal checking before setting.
         self._pol = None
         """
         Abstract method that run at start up to load lookup tables into  self.lookup_tables
-         and set available_pol.
+         and self.energy_polynomials and set available_pol.
         """
         self.update_lookuptable()
 
@@ -464,45 +565,19 @@ class Apple2(StandardReadable, Movable):
         """
         Converts energy and polarisation to gap and phase.
         """
-        gap_poly = self._get_poly(
-            lookup_table=self.lookup_tables["Gap"], new_energy=energy
-        )
-        phase_poly = self._get_poly(
-            lookup_table=self.lookup_tables["Phase"], new_energy=energy
-        )
-        return gap_poly(energy), phase_poly(energy)
+        gap, phase = self.get_id_gaps_phases(energy)
+        return float(gap), float(phase)
 
-    def _get_poly(
-        self,
-        new_energy: float,
-        lookup_table: dict[str | None, dict[str, dict[str, Any]]],
-    ) -> np.poly1d:
+    def get_id_gaps_phases(
+        self, energy: npt.ArrayLike
+    ) -> tuple[np.ndarray, np.ndarray]:
         """
-        Get the correct polynomial for a given energy form lookuptable
-         for any given polarisation.
+        Converts energies, which may be an array, to gaps and phases for the current
+        polarisation without moving anything.
         """
-
-        if (
-            new_energy < lookup_table[self.pol]["Limit"]["Minimum"]
-            or new_energy > lookup_table[self.pol]["Limit"]["Maximum"]
-        ):
-            raise ValueError(
-                "Demanding energy must lie between {} and {} eV!".format(
-                    lookup_table[self.pol]["Limit"]["Minimum"],
-                    lookup_table[self.pol]["Limit"]["Maximum"],
-                )
-            )
-        else:
-            for energy_range in lookup_table[self.pol]["Energies"].values():
-                if (
-                    new_energy >= energy_range["Low"]
-                    and new_energy < energy_range["High"]
-                ):
-                    return energy_range["Poly"]
-
-        raise ValueError(
-            """Cannot find polynomial coefficients for your requested energy.
-        There might be gap in the calibration lookup table."""
+        return (
+            self.energy_polynomials["Gap"][self.pol](energy),
+            self.energy_polynomials["Phase"][self.pol](energy),
         )
 
     @abc.abstractmethod
@@ -512,6 +587,7 @@ class Apple2(StandardReadable, Movable):
         This function should include check to ensure the lookuptable is in the correct format:
             # ensure the importing lookup table is the correct format
             Lookuptable.model_validate(<loockuptable>)
+        and compile it into self.energy_polynomials with compile_lookup_table.
 
         """
 
@@ -1,22 +1,39 @@
+from __future__ import annotations
+
+import asyncio
 from abc import ABC, abstractmethod
+from contextlib import AsyncExitStack
+from functools import partial
 from io import BytesIO
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import aiofiles
-from aiohttp import ClientSession
 from bluesky.protocols import Triggerable
 from ophyd_async.core import AsyncStatus, StandardReadable, soft_signal_rw
 from ophyd_async.epics.signal import epics_signal_r, epics_signal_rw
-from PIL import Image
 
+from dodal.devices.util.mjpeg import MJPEG_CONTENT_TYPE, MJPEGStream
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
+
+if TYPE_CHECKING:
+    import aiohttp
+    from PIL import Image
+else:
+    aiohttp = lazy_import("aiohttp")
+    Image = lazy_import("PIL.Image")
 
 IMG_FORMAT = "png"
 
 
 async def asyncio_save_image(image: Image.Image, path: str):
     buffer = BytesIO()
-    image.save(buffer, format=IMG_FORMAT)
+    # Encoding is slow for large images so is done in an executor, which also allows
+    # several images to be encoded at once
+    await asyncio.get_running_loop().run_in_executor(
+        None, partial(image.save, buffer, format=IMG_FORMAT)
+    )
     async with aiofiles.open(path, "wb") as fh:
         await fh.write(buffer.getbuffer())
 
@@ -26,10 +43,15 @@ class MJPG(StandardReadable, Triggerable, ABC):
 
     This devices uses that stream to grab images. When it is triggered it will send the
     latest image from the stream to the `post_processing` method for child classes to handle.
+
+    When unstaged each trigger fetches a single JPEG from the url. While the device is
+    staged the MJPEG stream at stream_url is kept open instead, so that repeated
+    triggers do not have to connect to the server each time.
     """
 
     def __init__(self, prefix: str, name: str = "") -> None:
         self.url = epics_signal_rw(str, prefix + "JPG_URL_RBV")
+        self.stream_url = epics_signal_r(str, prefix + "MJPG_URL_RBV")
 
         self.x_size = epics_signal_r(int, prefix + "ArraySize1_RBV")
         self.y_size = epics_signal_r(int, prefix + "ArraySize2_RBV")
@@ -41,20 +63,32 @@ class MJPG(StandardReadable, Triggerable, ABC):
 
         self.KICKOFF_TIMEOUT = 30.0
 
+        # Holds the session and stream open while staged
+        self._exit_stack: AsyncExitStack | None = None
+        self._session: aiohttp.ClientSession | None = None
+        self._stream_task: asyncio.Task | None = None
+        self._next_frame: asyncio.Future[bytes] | None = None
+
         super().__init__(name)
 
+    async def _create_directory(self) -> str:
+        """Creates the directory given by the directory signal if it does not exist
+        and returns it"""
+        directory_str = await self.directory.get_value()
+        if not Path(directory_str).is_dir():
+            LOGGER.info(f"Snapshot folder {directory_str} does not exist, creating...")
+            Path(directory_str).mkdir(parents=True)
+        return directory_str
+
     async def _save_image(self, image: Image.Image):
         """A helper function to save a given image to the path supplied by the \
             directory and filename signals. The full resultant path is put on the \
             last_saved_path signal
         """
         filename_str = await self.filename.get_value()
-        directory_str = await self.directory.get_value()
+        directory_str = await self._create_directory()
 
         path = Path(f"{directory_str}/{filename_str}.{IMG_FORMAT}").as_posix()
-        if not Path(directory_str).is_dir():
-            LOGGER.info(f"Snapshot folder {directory_str} does not exist, creating...")
-            Path(directory_str).mkdir(parents=True)
 
         LOGGER.info(f"Saving image to {path}")
 
@@ -62,21 +96,109 @@ class MJPG(StandardReadable, Triggerable, ABC):
 
         await self.last_saved_path.set(path, wait=True)
 
+    @AsyncStatus.wrap
+    async def stage(self):
+        """Opens a session to the server which is kept until the device is unstaged.
+        The MJPEG stream at stream_url is read in the background and triggering uses
+        the next frame from it. If there is no stream the session is still used to
+        fetch single frames from the url."""
+        await super().stage()
+        await self._close()
+        url_str = await self.stream_url.get_value()
+        self._exit_stack = AsyncExitStack()
+        try:
+            self._session = await self._exit_stack.enter_async_context(
+                aiohttp.ClientSession(raise_for_status=True)
+            )
+            if not url_str:
+                return
+            async with AsyncExitStack() as response_stack:
+                response = await response_stack.enter_async_context(
+                    self._session.get(url_str)
+                )
+                if response.content_type == MJPEG_CONTENT_TYPE:
+                    # Keep the stream open until unstaged
+                    self._exit_stack.push_async_exit(response_stack.pop_all())
+                    self._next_frame = asyncio.get_running_loop().create_future()
+                    self._stream_task = asyncio.create_task(
+                        self._read_frames(MJPEGStream(response))
+                    )
+                else:
+                    LOGGER.warning(
+                        f"{url_str} is not an MJPEG stream, snapshots will fetch frames"
+                    )
+        except Exception:
+            await self._close()
+            await super().unstage()
+            raise
+
+    @AsyncStatus.wrap
+    async def unstage(self):
+        await self._close()
+        await super().unstage()
+
+    async def _close(self):
+        if self._stream_task:
+            self._stream_task.cancel()
+            await asyncio.gather(self._stream_task, return_exceptions=True)
+        if self._exit_stack:
+            await self._exit_stack.aclose()
+        self._exit_stack = None
+        self._session = None
+        self._stream_task = None
+        self._next_frame = None
+
+    async def _read_frames(self, stream: MJPEGStream):
+        """Reads frames from the stream for as long as it is open, giving each to
+        anything waiting on the next frame."""
+        try:
+            async for frame in stream:
+                assert self._next_frame
+                next_frame = self._next_frame
+                self._next_frame = asyncio.get_running_loop().create_future()
+                next_frame.set_result(frame)
+            LOGGER.warning("MJPEG stream ended, snapshots will reconnect to the server")
+        except Exception as e:
+            LOGGER.warning(
+                f"Failed to read MJPEG stream, snapshots will reconnect: {e}"
+            )
+
+    async def _get_frame(self) -> bytes:
+        """Gets the next frame from the open stream if there is one, otherwise fetches
+        one from the server, using the open session if there is one."""
+        if self._stream_task and self._next_frame and not self._stream_task.done():
+            next_frame = self._next_frame
+            await asyncio.wait(
+                [next_frame, self._stream_task], return_when=asyncio.FIRST_COMPLETED
+            )
+            if next_frame.done():
+                return next_frame.result()
+        if self._session:
+            return await self._fetch_frame(self._session)
+        async with aiohttp.ClientSession(raise_for_status=True) as session:
+            return await self._fetch_frame(session)
+
+    async def _fetch_frame(self, session: aiohttp.ClientSession) -> bytes:
+        url_str = await self.url.get_value()
+        async with session.get(url_str) as response:
+            if response.content_type == MJPEG_CONTENT_TYPE:
+                return await MJPEGStream(response).read_frame()
+            return await response.read()
+
     @AsyncStatus.wrap
     async def trigger(self):
         """This takes a snapshot image from the MJPG stream and send it to the
         post_processing method, expected to be implemented by a child of this class.
+        If the device is staged the next frame from the already open stream is used,
+        otherwise a frame is fetched from the url, which can be for either a single
+        JPEG or an MJPEG stream.
 
         It is the responsibility of the child class to save any resulting images by \
         calling _save_image.
         """
-        url_str = await self.url.get_value()
-
-        async with ClientSession(raise_for_status=True) as session:
-            async with session.get(url_str) as response:
-                data = await response.read()
-                with Image.open(BytesIO(data)) as image:
-                    await self.post_processing(image)
+        data = await self._get_frame()
+        with Image.open(BytesIO(data)) as image:
+            await self.post_processing(image)
 
     @abstractmethod
     async def post_processing(self, image: Image.Image):
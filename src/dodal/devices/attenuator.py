@@ -1,16 +1,13 @@
-import asyncio
 import string
 
 from bluesky.protocols import Movable
 from ophyd_async.core import (
     AsyncStatus,
-    DeviceVector,
-    SignalR,
     StandardReadable,
-    wait_for_value,
 )
 from ophyd_async.epics.signal import epics_signal_r, epics_signal_rw, epics_signal_x
 
+from dodal.devices.util.bit_array import BitArray
 from dodal.log import LOGGER
 
 
@@ -24,14 +21,14 @@ class Attenuator(StandardReadable, Movable):
     read from the device it is also fractional"""
 
     def __init__(self, prefix: str, name: str = ""):
-        self._calculated_filter_states: DeviceVector[SignalR[int]] = DeviceVector(
+        self._calculated_filter_states: BitArray[int] = BitArray(
             {
                 int(digit, 16): epics_signal_r(int, f"{prefix}DEC_TO_BIN.B{digit}")
                 for digit in string.hexdigits
                 if not digit.islower()
             }
         )
-        self._filters_in_position: DeviceVector[SignalR[bool]] = DeviceVector(
+        self._filters_in_position: BitArray[bool] = BitArray(
             {
                 i - 1: epics_signal_r(bool, f"{prefix}FILTER{i}:INLIM")
                 for i in range(1, 17)
@@ -63,13 +60,7 @@ class Attenuator(StandardReadable, Movable):
         LOGGER.debug("Sending change filter command")
         await self._change.trigger()
 
-        await asyncio.gather(
-            *[
-                wait_for_value(
-                    self._filters_in_position[i],
-                    bool(await self._calculated_filter_states[i].get_value()),
-                    None,
-                )
-                for i in range(16)
-            ]
+        # The monitors of the calculated states may not have updated since the change
+        await self._filters_in_position.wait_for_value(
+            await self._calculated_filter_states.get_value(cached=False)
         )
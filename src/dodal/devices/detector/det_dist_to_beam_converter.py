@@ -1,5 +1,7 @@
 from enum import Enum
 
+import numpy as np
+import numpy.typing as npt
 from numpy import interp, loadtxt
 
 
@@ -14,9 +16,20 @@ class DetectorDistanceToBeamXYConverter:
         self.lookup_table_values: list = self.parse_table()
 
     def get_beam_xy_from_det_dist(self, det_dist_mm: float, beam_axis: Axis) -> float:
+        return float(self.get_beam_xy_from_det_dists(det_dist_mm, beam_axis))
+
+    def get_beam_xy_from_det_dists(
+        self, det_dists_mm: npt.ArrayLike, beam_axis: Axis
+    ) -> np.ndarray:
+        """Gets the beam position in mm along the axis for an array of detector
+        distances in one go, returning an array of the same shape."""
         beam_axis_values = self.lookup_table_values[beam_axis.value]
         det_dist_array = self.lookup_table_values[0]
-        return float(interp(det_dist_mm, det_dist_array, beam_axis_values))
+        return np.asarray(
+            interp(
+                np.asarray(det_dists_mm, dtype=float), det_dist_array, beam_axis_values
+            )
+        )
 
     def get_beam_axis_pixels(
         self,
@@ -1,5 +1,6 @@
 # type: ignore # Eiger will soon be ophyd-async https://github.com/DiamondLightSource/dodal/issues/700
 from enum import Enum
+from itertools import pairwise
 
 from ophyd import Component, Device, EpicsSignalRO, Signal
 from ophyd.areadetector.cam import EigerDetectorCam
@@ -8,7 +9,7 @@ from ophyd.status import AndStatus, Status, StatusBase
 from dodal.devices.detector import DetectorParams, TriggerMode
 from dodal.devices.eiger_odin import EigerOdin
 from dodal.devices.status import await_value
-from dodal.devices.util.epics_util import run_functions_without_blocking
+from dodal.devices.util.epics_util import run_functions_after_dependencies
 from dodal.log import LOGGER
 
 FREE_RUN_MAX_IMAGES = 1000000
@@ -48,6 +49,11 @@ class EigerDetector(Device):
     arming_status = Status()
     arming_status.set_finished()
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # How long each step of the last arming took, in seconds
+        self.arming_step_times: dict[str, float] = {}
+
     @classmethod
     def with_params(
         cls,
@@ -317,6 +323,13 @@ class EigerDetector(Device):
 
     def _finish_arm(self) -> Status:
         LOGGER.info("Eiger staging: Finishing arming")
+        slowest = sorted(
+            self.arming_step_times.items(), key=lambda step: step[1], reverse=True
+        )
+        LOGGER.info(
+            "Eiger staging: slowest arming steps "
+            + ", ".join(f"{name} {duration:.3f}s" for name, duration in slowest[:3])
+        )
         status = Status()
         status.set_finished()
         return status
@@ -335,31 +348,72 @@ class EigerDetector(Device):
         self.cam.acquire.set(0).wait(self.GENERAL_STATUS_TIMEOUT)
 
     def do_arming_chain(self) -> Status:
-        functions_to_do_arm = []
         assert self.detector_params
         detector_params: DetectorParams = self.detector_params
-        if detector_params.use_roi_mode:
-            functions_to_do_arm.append(self.enable_roi_mode)
-
-        arming_sequence_funcs = [
+        functions_to_do_arm = {
             # If a beam dump occurs after arming the eiger but prior to eiger staging,
             # the odin may timeout which will cause the arming sequence to be retried;
             # if this previously completed successfully we must reset the odin first
-            self.odin.stop,
-            lambda: self.change_dev_shm(detector_params.enable_dev_shm),
-            lambda: self.set_detector_threshold(detector_params.expected_energy_ev),
-            self.set_cam_pvs,
-            self.set_odin_number_of_frame_chunks,
-            self.set_odin_pvs,
-            self.set_mx_settings_pvs,
-            self.set_num_triggers_and_captures,
-            lambda: await_value(self.stale_params, 0, 60),
-            self._wait_for_odin_status,
-            lambda: self.cam.acquire.set(1, timeout=self.GENERAL_STATUS_TIMEOUT),
-            self._wait_fan_ready,
-            self._finish_arm,
+            "stop_odin": self.odin.stop,
+            "change_dev_shm": lambda: self.change_dev_shm(
+                detector_params.enable_dev_shm
+            ),
+            "set_detector_threshold": lambda: self.set_detector_threshold(
+                detector_params.expected_energy_ev
+            ),
+            "set_cam_pvs": self.set_cam_pvs,
+            "set_odin_number_of_frame_chunks": self.set_odin_number_of_frame_chunks,
+            "set_odin_pvs": self.set_odin_pvs,
+            "set_mx_settings_pvs": self.set_mx_settings_pvs,
+            "set_num_triggers_and_captures": self.set_num_triggers_and_captures,
+            "wait_for_stale_params": lambda: await_value(self.stale_params, 0, 60),
+            "wait_for_odin_status": self._wait_for_odin_status,
+            "acquire": lambda: self.cam.acquire.set(
+                1, timeout=self.GENERAL_STATUS_TIMEOUT
+            ),
+            "wait_fan_ready": self._wait_fan_ready,
+            "finish_arm": self._finish_arm,
+        }
+        # Odin is reset before anything else is set up. The cam settings are then
+        # independent of odin so are applied while odin is set up, each in the same order
+        # as they have always been applied
+        dependency_chains = [
+            [
+                "stop_odin",
+                "change_dev_shm",
+                "set_odin_number_of_frame_chunks",
+                "set_odin_pvs",
+                "set_num_triggers_and_captures",
+            ],
+            [
+                "stop_odin",
+                "set_detector_threshold",
+                "set_cam_pvs",
+                "set_mx_settings_pvs",
+                "set_num_triggers_and_captures",
+            ],
+            [
+                "set_num_triggers_and_captures",
+                "wait_for_stale_params",
+                "wait_for_odin_status",
+                "acquire",
+                "wait_fan_ready",
+                "finish_arm",
+            ],
         ]
-
-        functions_to_do_arm.extend(arming_sequence_funcs)
-
-        return run_functions_without_blocking(functions_to_do_arm, associated_obj=self)
+        if detector_params.use_roi_mode:
+            functions_to_do_arm["enable_roi_mode"] = self.enable_roi_mode
+            dependency_chains.append(["enable_roi_mode", "stop_odin"])
+
+        dependencies: dict[str, list[str]] = {}
+        for chain in dependency_chains:
+            for before, after in pairwise(chain):
+                dependencies.setdefault(after, []).append(before)
+
+        self.arming_step_times = {}
+        return run_functions_after_dependencies(
+            functions_to_do_arm,
+            dependencies,
+            associated_obj=self,
+            step_times=self.arming_step_times,
+        )
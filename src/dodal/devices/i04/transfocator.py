@@ -1,82 +1,122 @@
+import asyncio
 import math
-from time import sleep, time
 
-from ophyd import Component as Cpt
-from ophyd import Device, EpicsSignal, EpicsSignalRO, Kind
-from ophyd.status import DeviceStatus
+from ophyd_async.core import (
+    AsyncStatus,
+    HintedSignal,
+    SignalR,
+    StandardReadable,
+    observe_value,
+    wait_for_value,
+)
+from ophyd_async.epics.signal import epics_signal_r, epics_signal_rw, epics_signal_x
 
 from dodal.log import LOGGER
 
 
-class Transfocator(Device):
+class Transfocator(StandardReadable):
     """The transfocator is a device that puts a number of lenses in the beam to change
     its shape.
 
     The vertical beamsize can be set using:
-        my_transfocator = Transfocator(name="t")
+        my_transfocator = Transfocator(prefix, name="t")
         vert_beamsize_microns = 20
-        my_transfocator.set(vert_beamsize_microns)
+        yield from bps.abs_set(my_transfocator, vert_beamsize_microns, wait=True)
     """
 
-    beamsize_set_microns = Cpt(EpicsSignal, "VERT_REQ", kind=Kind.hinted)
-    predicted_vertical_num_lenses = Cpt(EpicsSignal, "LENS_PRED")
-
-    number_filters_sp = Cpt(EpicsSignal, "NUM_FILTERS")
-
-    start = Cpt(EpicsSignal, "START.PROC")
-    start_rbv = Cpt(EpicsSignalRO, "START_RBV")
-
-    vertical_lens_rbv = Cpt(EpicsSignalRO, "VER", kind=Kind.hinted)
-
-    TIMEOUT = 120
-    _POLLING_WAIT = 0.01
-
-    def polling_wait_on_start_rbv(self, for_value):
-        # For some reason couldn't get monitors working on START_RBV
-        # (See https://github.com/DiamondLightSource/dodal/issues/152)
-        start_time = time()
-        while time() < start_time + self.TIMEOUT:
-            RBV_value = self.start_rbv.get()
-            if RBV_value == for_value:
-                return
-            sleep(self._POLLING_WAIT)
-
-        # last try
-        if self.start_rbv.get() != for_value:
-            raise TimeoutError()
-
-    def set(self, beamsize_microns: float) -> DeviceStatus:
+    TIMEOUT: float = 120
+    # START_RBV is also polled in case its monitors are not posted, see
+    # https://github.com/DiamondLightSource/dodal/issues/152
+    # It is only high briefly so is polled at this period while waiting for it to go
+    # high, then while waiting for it to go low the period backs off up to the maximum
+    _POLLING_PERIOD: float = 0.01
+    _MAX_POLLING_PERIOD: float = 1
+
+    def __init__(self, prefix: str, name: str = ""):
+        with self.add_children_as_readables(HintedSignal):
+            self.beamsize_set_microns = epics_signal_rw(float, prefix + "VERT_REQ")
+            self.vertical_lens_rbv = epics_signal_r(float, prefix + "VER")
+
+        self.predicted_vertical_num_lenses = epics_signal_rw(
+            float, prefix + "LENS_PRED"
+        )
+        self.number_filters_sp = epics_signal_rw(int, prefix + "NUM_FILTERS")
+        self.start = epics_signal_x(prefix + "START.PROC")
+        self.start_rbv = epics_signal_r(int, prefix + "START_RBV")
+
+        super().__init__(name=name)
+
+    async def _poll_until(
+        self, signal: SignalR[int], value: int, max_polling_period: float
+    ):
+        period = self._POLLING_PERIOD
+        while await signal.get_value(cached=False) != value:
+            await asyncio.sleep(period)
+            period = min(period * 2, max_polling_period)
+
+    async def _wait_on_start_rbv(self, for_value: int, max_polling_period: float):
+        """Waits for START_RBV to reach the value, from whichever of its monitors or
+        polling sees it first"""
+        waits = [
+            asyncio.create_task(wait_for_value(self.start_rbv, for_value, None)),
+            asyncio.create_task(
+                self._poll_until(self.start_rbv, for_value, max_polling_period)
+            ),
+        ]
+        try:
+            done, _ = await asyncio.wait(waits, return_when=asyncio.FIRST_COMPLETED)
+            await done.pop()
+        finally:
+            for wait in waits:
+                wait.cancel()
+
+    @AsyncStatus.wrap
+    async def set(self, value: float):
         """To set the beamsize on the transfocator we must:
         1. Set the beamsize in the calculator part of the transfocator
         2. Get the predicted number of lenses needed from this calculator
         3. Enter this back into the device
         4. Start the device moving
         5. Wait for the start_rbv goes high and low again
+
+        Raises:
+            TimeoutError: if all of this takes longer than TIMEOUT seconds
         """
-        subscriber: int
-        status = DeviceStatus(self, timeout=self.TIMEOUT)
-
-        def set_based_on_predicition(old_value, value, *args, **kwargs):
-            if not math.isclose(old_value, value, abs_tol=1e-8):
-                self.predicted_vertical_num_lenses.unsubscribe(subscriber)
-
-                # We can only put an integer number of lenses in the beam but the
-                # calculation in the IOC returns the theoretical float number of lenses
-                value = round(value)
-                LOGGER.info(f"Transfocator setting {value} filters")
-                self.number_filters_sp.set(value).wait()
-                self.start.set(1).wait()
-                self.polling_wait_on_start_rbv(1)
-                self.polling_wait_on_start_rbv(0)
-            # The value hasn't changed so assume the device is already set up correctly
-            status.set_finished()
-
-        LOGGER.info(f"Transfocator setting {beamsize_microns} beamsize")
-        if self.beamsize_set_microns.get() != beamsize_microns:
-            subscriber = self.predicted_vertical_num_lenses.subscribe(
-                set_based_on_predicition, run=False
-            )
-            self.beamsize_set_microns.set(beamsize_microns)
-        else:
-            status.set_finished()
-        return status
+        try:
+            await asyncio.wait_for(self._set_beamsize(value), self.TIMEOUT)
+        except asyncio.TimeoutError as e:
+            raise TimeoutError(
+                f"{self.name} did not set beamsize {value} in {self.TIMEOUT}s"
+            ) from e
+
+    async def _set_beamsize(self, value: float):
+        LOGGER.info(f"Transfocator setting {value} beamsize")
+        if await self.beamsize_set_microns.get_value() == value:
+            return
+
+        predictions = observe_value(self.predicted_vertical_num_lenses)
+        # The first value is the prediction before the beamsize changes
+        old_prediction = await anext(predictions)
+        await self.beamsize_set_microns.set(value)
+        prediction = await anext(predictions)
+        await predictions.aclose()
+
+        # If the prediction hasn't changed assume the device is already set up correctly
+        if math.isclose(old_prediction, prediction, abs_tol=1e-8):
+            return
+
+        # We can only put an integer number of lenses in the beam but the calculation
+        # in the IOC returns the theoretical float number of lenses
+        number_of_lenses = round(prediction)
+        LOGGER.info(f"Transfocator setting {number_of_lenses} filters")
+        await self.number_filters_sp.set(number_of_lenses)
+        # Start waiting before starting so that START_RBV going high can't be missed
+        started = asyncio.create_task(
+            self._wait_on_start_rbv(1, max_polling_period=self._POLLING_PERIOD)
+        )
+        try:
+            await self.start.trigger()
+            await started
+        finally:
+            started.cancel()
+        await self._wait_on_start_rbv(0, max_polling_period=self._MAX_POLLING_PERIOD)
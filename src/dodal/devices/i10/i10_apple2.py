@@ -1,11 +1,21 @@
 import asyncio
 import csv
+import threading
+import time
+from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, SupportsFloat
 
 import numpy as np
-from bluesky.protocols import Movable
+from bluesky.protocols import (
+    EventPageCollectable,
+    Flyable,
+    Movable,
+    Preparable,
+)
+from event_model.documents.event_descriptor import DataKey
+from event_model.documents.event_page import PartialEventPage
 from ophyd_async.core import (
     AsyncStatus,
     HintedSignal,
@@ -14,14 +24,18 @@ from ophyd_async.core import (
     soft_signal_r_and_setter,
     soft_signal_rw,
 )
+from ophyd_async.epics.motor import FlyMotorInfo
+from pydantic import BaseModel, Field
 
 from dodal.devices.apple2_undulator import (
     Apple2,
     Apple2Val,
+    EnergyPolynomials,
     Lookuptable,
     UndulatorGap,
     UndulatorJawPhase,
     UndulatorPhaseAxes,
+    compile_lookup_table,
 )
 from dodal.devices.pgm import PGM
 from dodal.log import LOGGER
@@ -50,6 +64,99 @@ class LookupTableConfig:
     poly_deg: list | None
 
 
+class EnergyFlyInfo(BaseModel):
+    """Information needed to fly an I10Apple2PGM through a range of energies"""
+
+    #: PGM energy at the start of the fly, in eV
+    start_energy: float = Field(frozen=True)
+
+    #: PGM energy at the end of the fly, in eV
+    end_energy: float = Field(frozen=True)
+
+    #: Time taken to fly from start_energy to end_energy, in seconds
+    time_for_move: float = Field(frozen=True, gt=0)
+
+    #: Number of points, including the start and end, that the ID is moved through.
+    #: The ID stops at each point and its gap moves between them at the speed
+    #: needed to keep up with the PGM.
+    id_points: int = Field(frozen=True, default=11, ge=2)
+
+    #: Time between samples of the PGM energy and ID gap readbacks, in seconds
+    sample_period: float = Field(frozen=True, default=0.1, gt=0)
+
+
+@dataclass(frozen=True)
+class EnergyTrajectory:
+    """The points an I10Apple2PGM flies the ID through, calculated before the fly"""
+
+    pgm_energies: np.ndarray
+    id_energies: np.ndarray
+    gaps: np.ndarray
+    phases: np.ndarray
+    time_per_point: float
+
+
+# Converted and compiled lookup tables, shared between all the devices that use them.
+# They are keyed by the file and the configuration used to convert it, along with the
+# modification time of the file so that changes to it are picked up.
+_lookup_tables: dict[
+    tuple,
+    tuple[
+        int,
+        dict[str | None, dict[str, dict[str, Any]]],
+        dict[str | None, EnergyPolynomials],
+    ],
+] = {}
+_lookup_tables_lock = threading.Lock()
+
+
+def load_lookup_table(
+    file: Path,
+    source: tuple[str, str],
+    mode: str | None = "Mode",
+    min_energy: str | None = "MinEnergy",
+    max_energy: str | None = "MaxEnergy",
+    poly_deg: list | None = None,
+) -> tuple[
+    dict[str | None, dict[str, dict[str, Any]]], dict[str | None, EnergyPolynomials]
+]:
+    """
+    Converts the csv with convert_csv_to_lookup, validates it and compiles it. The
+    result is shared with every other caller loading the same file with the same
+    parameters until the file is modified, so must not be changed.
+
+    return
+    ------
+        The lookup table in the Lookuptable format and compiled by compile_lookup_table
+    """
+    key = (
+        str(file),
+        source,
+        mode,
+        min_energy,
+        max_energy,
+        None if poly_deg is None else tuple(poly_deg),
+    )
+    modified = file.stat().st_mtime_ns
+    with _lookup_tables_lock:
+        cached = _lookup_tables.get(key)
+        if cached is not None and cached[0] == modified:
+            return cached[1], cached[2]
+        lookup_table = convert_csv_to_lookup(
+            file=str(file),
+            source=source,
+            mode=mode,
+            min_energy=min_energy,
+            max_energy=max_energy,
+            poly_deg=poly_deg,
+        )
+        # ensure the importing lookup table is the correct format
+        Lookuptable.model_validate(lookup_table)
+        compiled = compile_lookup_table(lookup_table)
+        _lookup_tables[key] = (modified, lookup_table, compiled)
+    return lookup_table, compiled
+
+
 class I10Apple2(Apple2):
     """
     I10Apple2 is the i10 version of Apple2 ID.
@@ -128,15 +235,30 @@ class I10Apple2(Apple2):
         to calculate the required gap and phases before setting it.
         """
         value = float(value)
+        await self.read_pol_if_not_set()
+        gap, phase = self._get_id_gap_phase(value)
+        await self.move_gap_phase(gap, phase, value)
+        if self.pol != "la":
+            await self.id_jaw_phase.set(0)
+            await self.id_jaw_phase.set_move.set(1)
+
+    async def read_pol_if_not_set(self) -> None:
+        """
+        Read the polarisation from the hardware if it has not been set.
+        """
         if self.pol is None:
             LOGGER.warning("Polarisation not set attempting to read from hardware")
             pol, phase = await self.determinePhaseFromHardware()
             if pol is None:
                 raise ValueError(f"Pol is not set for {self.name}")
             self.pol = pol
-
         self._polarisation_set(self.pol)
-        gap, phase = self._get_id_gap_phase(value)
+
+    async def move_gap_phase(self, gap: float, phase: float, energy: float) -> None:
+        """
+        Move to a gap and phase, from the lookup tables for the energy, in the current
+        polarisation.
+        """
         phase3 = phase * (-1 if self.pol == "la" else (1))
         id_set_val = Apple2Val(
             top_outer=str(phase),
@@ -146,39 +268,52 @@ class I10Apple2(Apple2):
             gap=str(gap),
         )
         LOGGER.info(f"Setting polarisation to {self.pol}, with {id_set_val}")
-        await self._set(value=id_set_val, energy=value)
-        if self.pol != "la":
-            await self.id_jaw_phase.set(0)
-            await self.id_jaw_phase.set_move.set(1)
+        await self._set(value=id_set_val, energy=energy)
 
     def update_lookuptable(self):
         """
-        Update the stored lookup tabled from file.
+        Update the stored lookup tabled from file, which is only read again if it has
+        changed since it was last loaded by any device.
 
         """
         LOGGER.info("Updating lookup dictionary from file.")
         for key, path in self.lookup_table_config.path.__dict__.items():
             if path.exists():
-                self.lookup_tables[key] = convert_csv_to_lookup(
-                    file=path,
-                    source=self.lookup_table_config.source,
-                    mode=self.lookup_table_config.mode,
-                    min_energy=self.lookup_table_config.min_energy,
-                    max_energy=self.lookup_table_config.max_energy,
-                    poly_deg=self.lookup_table_config.poly_deg,
+                self.lookup_tables[key], self.energy_polynomials[key] = (
+                    load_lookup_table(
+                        file=path,
+                        source=self.lookup_table_config.source,
+                        mode=self.lookup_table_config.mode,
+                        min_energy=self.lookup_table_config.min_energy,
+                        max_energy=self.lookup_table_config.max_energy,
+                        poly_deg=self.lookup_table_config.poly_deg,
+                    )
                 )
-                # ensure the importing lookup table is the correct format
-                Lookuptable.model_validate(self.lookup_tables[key])
             else:
                 raise FileNotFoundError(f"{key} look up table is not in path: {path}")
 
         self._available_pol = list(self.lookup_tables["Gap"].keys())
 
 
-class I10Apple2PGM(StandardReadable, Movable):
+class I10Apple2PGM(
+    StandardReadable, Movable, Preparable, Flyable, EventPageCollectable
+):
     """
     Compound device to set both ID and PGM energy at the sample time,poly_deg
 
+    It can also fly through a range of energies. The PGM flies continuously but the ID
+    steps through points calculated up front from the lookup tables, with a complete
+    gap and phase move to each point. Only the gap velocity is set so that each step
+    takes as long as the PGM does to cover it, so the ID matches the PGM energy at the
+    points and lags behind it in between:
+
+    > yield from bps.prepare(id_pgm, EnergyFlyInfo(...), wait=True)
+    > yield from bps.kickoff(id_pgm, wait=True)
+    > yield from bps.declare_stream(id_pgm, name="primary", collect=True)
+    > yield from bps.complete(id_pgm, wait=True)
+    > yield from bps.collect(id_pgm)
+
+    The PGM energy and ID gap readbacks are sampled during the fly and collected.
     """
 
     def __init__(
@@ -201,6 +336,11 @@ class I10Apple2PGM(StandardReadable, Movable):
         self.pgm_ref = Reference(pgm)
         with self.add_children_as_readables(HintedSignal):
             self.energy_offset = soft_signal_rw(float, initial_value=0)
+        self._trajectory: EnergyTrajectory | None = None
+        self._sample_period = 0.0
+        self._fly_status: AsyncStatus | None = None
+        # The time, PGM energy and ID gap at each sample since the last kickoff
+        self._samples: list[tuple[float, float, float]] = []
 
     @AsyncStatus.wrap
     async def set(self, value: float) -> None:
@@ -210,6 +350,135 @@ class I10Apple2PGM(StandardReadable, Movable):
             self.pgm_ref().energy.set(value),
         )
 
+    @AsyncStatus.wrap
+    async def prepare(self, value: EnergyFlyInfo) -> None:
+        """
+        Calculate the ID gap and phase for each point of the fly, then move the ID to
+        the first point and the PGM to where it needs to start to be at speed.
+        """
+        id_ = self.id_ref()
+        await id_.read_pol_if_not_set()
+        pgm_energies = np.linspace(
+            value.start_energy, value.end_energy, value.id_points
+        )
+        id_energies = pgm_energies + await self.energy_offset.get_value()
+        # Fails before anything moves if any energy is outside the lookup tables
+        gaps, phases = id_.get_id_gaps_phases(id_energies)
+        self._trajectory = EnergyTrajectory(
+            pgm_energies=pgm_energies,
+            id_energies=id_energies,
+            gaps=gaps,
+            phases=phases,
+            time_per_point=value.time_for_move / (value.id_points - 1),
+        )
+        self._sample_period = value.sample_period
+        LOGGER.info(
+            f"Preparing {self.name} to fly from {value.start_energy} to "
+            f"{value.end_energy} in {value.time_for_move}s."
+        )
+        await asyncio.gather(
+            id_.set(id_energies[0]),
+            self.pgm_ref().energy.prepare(
+                FlyMotorInfo(
+                    start_position=value.start_energy,
+                    end_position=value.end_energy,
+                    time_for_move=value.time_for_move,
+                )
+            ),
+        )
+
+    @AsyncStatus.wrap
+    async def kickoff(self) -> None:
+        """Start the PGM moving and the ID following it."""
+        assert self._trajectory, f"{self.name} must be prepared before kickoff"
+        self._samples = []
+        await self.pgm_ref().energy.kickoff()
+        self._fly_status = AsyncStatus(self._fly(self._trajectory))
+
+    def complete(self) -> AsyncStatus:
+        """Mark as complete once both the PGM and the ID have reached the end."""
+        assert self._fly_status, "kickoff not called"
+        return self._fly_status
+
+    async def _fly(self, trajectory: EnergyTrajectory) -> None:
+        sampling = asyncio.create_task(self._sample_readbacks())
+        try:
+            await asyncio.gather(
+                self._follow_trajectory(trajectory), self.pgm_ref().energy.complete()
+            )
+        finally:
+            sampling.cancel()
+            await asyncio.gather(sampling, return_exceptions=True)
+
+    async def _follow_trajectory(self, trajectory: EnergyTrajectory) -> None:
+        """
+        Move the ID to each point of the trajectory in turn, waiting for each move to
+        finish before starting the next. The gap velocity is set for each move so that
+        the gap gets to the point as the PGM does, the phase moves at its own velocity.
+        """
+        id_ = self.id_ref()
+        original_velocity, min_velocity, max_velocity = await asyncio.gather(
+            id_.gap.velocity.get_value(),
+            id_.gap.min_velocity.get_value(),
+            id_.gap.max_velocity.get_value(),
+        )
+        start = time.monotonic()
+        try:
+            for point in range(1, len(trajectory.id_energies)):
+                # Don't get ahead of the PGM if the last move was quicker than planned
+                due = start + (point - 1) * trajectory.time_per_point
+                await asyncio.sleep(max(0, due - time.monotonic()))
+                distance = abs(trajectory.gaps[point] - trajectory.gaps[point - 1])
+                await id_.gap.velocity.set(
+                    float(
+                        np.clip(
+                            distance / trajectory.time_per_point,
+                            min_velocity,
+                            max_velocity,
+                        )
+                    )
+                )
+                await id_.move_gap_phase(
+                    float(trajectory.gaps[point]),
+                    float(trajectory.phases[point]),
+                    float(trajectory.id_energies[point]),
+                )
+        finally:
+            await id_.gap.velocity.set(original_velocity)
+
+    async def _sample_readbacks(self) -> None:
+        energy_readback = self.pgm_ref().energy.user_readback
+        gap_readback = self.id_ref().gap.user_readback
+        while True:
+            energy, gap = await asyncio.gather(
+                energy_readback.get_value(), gap_readback.get_value()
+            )
+            self._samples.append((time.time(), energy, gap))
+            await asyncio.sleep(self._sample_period)
+
+    async def describe_collect(self) -> dict[str, DataKey]:
+        return {
+            signal.name: DataKey(source=signal.source, dtype="number", shape=[])
+            for signal in (
+                self.pgm_ref().energy.user_readback,
+                self.id_ref().gap.user_readback,
+            )
+        }
+
+    def collect_pages(self) -> Iterator[PartialEventPage]:
+        """Yield the readbacks sampled since the last kickoff, as one page."""
+        samples, self._samples = self._samples, []
+        if not samples:
+            return
+        times, energies, gaps = (list(column) for column in zip(*samples, strict=True))
+        energy_name = self.pgm_ref().energy.user_readback.name
+        gap_name = self.id_ref().gap.user_readback.name
+        yield PartialEventPage(
+            time=times,
+            data={energy_name: energies, gap_name: gaps},
+            timestamps={energy_name: times, gap_name: times},
+        )
+
 
 class I10Apple2Pol(StandardReadable, Movable):
     """
@@ -12,11 +12,10 @@ from ophyd_async.core import (
 from ophyd_async.epics.motor import Motor
 from ophyd_async.epics.signal import epics_signal_r
 
-from dodal.common.crystal_metadata import CrystalMetadata
-
-# Conversion constant for energy and wavelength, taken from the X-Ray data booklet
-# Converts between energy in KeV and wavelength in angstrom
-_CONVERSION_CONSTANT = 12.3984
+from dodal.common.crystal_metadata import (
+    ENERGY_WAVELENGTH_CONVERSION_CONSTANT,
+    CrystalMetadata,
+)
 
 
 class DoubleCrystalMonochromator(StandardReadable):
@@ -111,7 +110,7 @@ class DoubleCrystalMonochromator(StandardReadable):
         default_reading = await super().read()
         energy: float = default_reading[f"{self.name}-energy"]["value"]
         if energy > 0.0:
-            wavelength = _CONVERSION_CONSTANT / energy
+            wavelength = ENERGY_WAVELENGTH_CONVERSION_CONSTANT / energy
         else:
             wavelength = 0.0
 
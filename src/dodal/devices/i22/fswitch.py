@@ -1,17 +1,17 @@
-import asyncio
 import time
 
 from bluesky.protocols import Reading
 from event_model import DataKey
 from ophyd_async.core import (
     ConfigSignal,
-    DeviceVector,
     StandardReadable,
     StrictEnum,
     soft_signal_r_and_setter,
 )
 from ophyd_async.epics.signal import epics_signal_r
 
+from dodal.devices.util.bit_array import BitArray
+
 
 class FilterState(StrictEnum):
     """
@@ -48,11 +48,12 @@ class FSwitch(StandardReadable):
         cylindrical: bool | None = None,
         lens_material: str | None = None,
     ) -> None:
-        self.filters = DeviceVector(
+        self.filters = BitArray(
             {
                 i: epics_signal_r(FilterState, f"{prefix}FILTER-{i:03}:STATUS_RBV")
                 for i in range(FSwitch.NUM_FILTERS)
-            }
+            },
+            is_set=lambda state: state == FilterState.IN_BEAM,
         )
         with self.add_children_as_readables(ConfigSignal):
             if lens_geometry is not None:
@@ -88,10 +89,7 @@ class FSwitch(StandardReadable):
         }
 
     async def read(self) -> dict[str, Reading]:
-        result = await asyncio.gather(
-            *(filter.get_value() for filter in self.filters.values())
-        )
-        num_in = sum(r.value == FilterState.IN_BEAM for r in result)
+        num_in = await self.filters.count_set()
         default_reading = await super().read()
         return {
             FSwitch.NUM_LENSES_FIELD_NAME: Reading(value=num_in, timestamp=time.time()),
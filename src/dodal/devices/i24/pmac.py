@@ -1,6 +1,11 @@
+import asyncio
+import math
 from asyncio import sleep
+from collections.abc import Sequence
 from enum import Enum, IntEnum
+from numbers import Integral
 
+import numpy as np
 from bluesky.protocols import Flyable, Movable, Triggerable
 from ophyd_async.core import (
     DEFAULT_TIMEOUT,
@@ -19,6 +24,9 @@ from ophyd_async.epics.signal import epics_signal_r, epics_signal_rw
 HOME_STR = r"\#1hmz\#2hmz\#3hmz"  # Command to home the PMAC motors
 ZERO_STR = "!x0y0z0"  # Command to blend any ongoing move into new position
 
+# The longest string that can be put to PMAC_STRING, which is an EPICS string
+PMAC_STRING_MAX_LENGTH = 39
+
 
 class ScanState(IntEnum):
     RUNNING = 1
@@ -55,6 +63,62 @@ class EncReset(str, Enum):
     ENC8 = "m808=100 m809=150"
 
 
+def p_variable_command(number: int, value: float) -> str:
+    """The PMAC command to set a P-variable, which are used to pass parameters to the
+    motion programs. Integers are given exactly and floats to the full precision
+    needed to give the same value back, never in exponent notation."""
+    if isinstance(value, Integral):
+        return f"P{number}={int(value)}"
+    if not math.isfinite(value):
+        raise ValueError(f"P{number} cannot be set to {value}")
+    return f"P{number}={np.format_float_positional(value, trim='-')}"
+
+
+def run_program_command(program_number: int) -> str:
+    """The PMAC command to run a motion program in coordinate system 2"""
+    return f"&2b{program_number}r"
+
+
+def compile_pmac_commands(
+    commands: Sequence[str], max_length: int = PMAC_STRING_MAX_LENGTH
+) -> list[str]:
+    """Packs a sequence of PMAC commands into as few PMAC strings as possible, keeping
+    them in order.
+
+    Each item can be one command or several separated by spaces, as in LaserSettings
+    and EncReset. Selecting a motor (#) or coordinate system (&) applies to all the
+    commands after it, whether in the same string or a later one, so these are packed
+    like any other command.
+
+    Raises:
+        ValueError: if the commands are a single string rather than a sequence of
+            them, there are no commands or any command could never be sent, so that
+            nothing is sent to the PMAC unless it all can be
+    """
+    if isinstance(commands, str):
+        raise ValueError(
+            f"PMAC commands must be a sequence of strings, not the string {commands}"
+        )
+    pmac_strings: list[str] = []
+    current = ""
+    for command in (command for item in commands for command in item.split()):
+        if len(command) > max_length:
+            raise ValueError(
+                f"PMAC command {command} is longer than {max_length} characters"
+            )
+        if current and len(current) + 1 + len(command) <= max_length:
+            current += " " + command
+        else:
+            if current:
+                pmac_strings.append(current)
+            current = command
+    if current:
+        pmac_strings.append(current)
+    if not pmac_strings:
+        raise ValueError("No PMAC commands given")
+    return pmac_strings
+
+
 class PMACStringMove(Triggerable):
     """Trigger a PMAC move by setting the pmac_string."""
 
@@ -109,6 +173,27 @@ class PMACStringEncReset(Device, Movable):
         await self._signal_ref().set(value.value)
 
 
+class PMACStringBatch(Device, Movable):
+    """Send a sequence of PMAC commands, e.g. P-variable writes, encoder resets and
+    laser settings, in as few puts to the pmac_string as possible.
+
+    The commands are all checked before any are sent, see compile_pmac_commands.
+    """
+
+    def __init__(
+        self,
+        pmac_str_sig: SignalRW,
+        name: str = "",
+    ) -> None:
+        self._signal_ref = Reference(pmac_str_sig)
+        super().__init__(name)
+
+    @AsyncStatus.wrap
+    async def set(self, value: Sequence[str]):
+        for pmac_string in compile_pmac_commands(value):
+            await self._signal_ref().set(pmac_string, wait=True)
+
+
 class ProgramRunner(Device, Flyable):
     """Run the collection by setting the program number on the PMAC string.
 
@@ -134,7 +219,7 @@ class ProgramRunner(Device, Flyable):
 
     async def _get_prog_number_string(self) -> str:
         prog_num = await self._prog_num_ref().get_value()
-        return f"&2b{prog_num}r"
+        return run_program_command(prog_num)
 
     @AsyncStatus.wrap
     async def kickoff(self):
@@ -142,12 +227,19 @@ class ProgramRunner(Device, Flyable):
             wait for the scan status PV to go to 1.
         """
         prog_num_str = await self._get_prog_number_string()
-        await self._signal_ref().set(prog_num_str, wait=True)
-        await wait_for_value(
-            self._status_ref(),
-            ScanState.RUNNING,
-            timeout=DEFAULT_TIMEOUT,
+        # Monitor the scan status before starting so a short program isn't missed
+        running = asyncio.create_task(
+            wait_for_value(
+                self._status_ref(),
+                ScanState.RUNNING,
+                timeout=DEFAULT_TIMEOUT,
+            )
         )
+        try:
+            await self._signal_ref().set(prog_num_str, wait=True)
+            await running
+        finally:
+            running.cancel()
 
     @AsyncStatus.wrap
     async def complete(self):
@@ -205,6 +297,8 @@ class PMAC(StandardReadable):
             self.pmac_string,
         )
 
+        self.batch = PMACStringBatch(self.pmac_string)
+
         self.x = Motor(prefix + "X")
         self.y = Motor(prefix + "Y")
         self.z = Motor(prefix + "Z")
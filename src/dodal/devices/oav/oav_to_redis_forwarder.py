@@ -1,10 +1,14 @@
+from __future__ import annotations
+
 import asyncio
+from collections import defaultdict
 from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from datetime import timedelta
 from enum import Enum
+from typing import TYPE_CHECKING
 from uuid import uuid4
 
-from aiohttp import ClientResponse, ClientSession
 from bluesky.protocols import Flyable, Stoppable
 from ophyd_async.core import (
     AsyncStatus,
@@ -15,18 +19,23 @@ from ophyd_async.core import (
     soft_signal_rw,
 )
 from ophyd_async.epics.signal import epics_signal_r
-from redis.asyncio import StrictRedis
 
+from dodal.devices.util.mjpeg import MJPEG_CONTENT_TYPE, MJPEGStream
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
+
+if TYPE_CHECKING:
+    import aiohttp
+    from aiohttp import ClientResponse
+else:
+    aiohttp = lazy_import("aiohttp")
 
 
-async def get_next_jpeg(response: ClientResponse) -> bytes:
-    JPEG_START_BYTE = b"\xff\xd8"
-    JPEG_STOP_BYTE = b"\xff\xd9"
-    while True:
-        line = await response.content.readline()
-        if line.startswith(JPEG_START_BYTE):
-            return line + await response.content.readuntil(JPEG_STOP_BYTE)
+@dataclass
+class _Frame:
+    redis_key: str
+    redis_uuid: str
+    jpeg_bytes: bytes
 
 
 class Source(Enum):
@@ -59,6 +68,13 @@ class OAVToRedisForwarder(StandardReadable, Flyable, Stoppable):
     # This timeout is the maximum time that the forwarder can be streaming for
     TIMEOUT = 30
 
+    # The maximum number of frames waiting to be written to redis, further frames are
+    # dropped until there is space
+    FRAME_QUEUE_SIZE = 100
+
+    # The maximum number of frames written to redis in one pipeline
+    MAX_FRAMES_PER_WRITE = 20
+
     def __init__(
         self,
         prefix: str,
@@ -87,6 +103,9 @@ class OAVToRedisForwarder(StandardReadable, Flyable, Stoppable):
         )
         self.selected_source = soft_signal_rw(int)
 
+        # Importing the redis client is slow so only do it when the device is made
+        from redis.asyncio import StrictRedis
+
         self.forwarding_task = None
         self.redis_client = StrictRedis(
             host=redis_host, password=redis_password, db=redis_db
@@ -96,6 +115,18 @@ class OAVToRedisForwarder(StandardReadable, Flyable, Stoppable):
 
         self.sample_id = soft_signal_rw(int, initial_value=0)
 
+        # Counts of frames since the last kickoff
+        self.frames_read, self._frames_read_setter = soft_signal_r_and_setter(
+            int, initial_value=0
+        )
+        self.frames_written, self._frames_written_setter = soft_signal_r_and_setter(
+            int, initial_value=0
+        )
+        self.frames_dropped, self._frames_dropped_setter = soft_signal_r_and_setter(
+            int, initial_value=0
+        )
+        self._reset_counts()
+
         with self.add_children_as_readables():
             # The uuid that images are being saved under, this should be monitored for
             # callbacks to correlate the data
@@ -103,18 +134,66 @@ class OAVToRedisForwarder(StandardReadable, Flyable, Stoppable):
 
         super().__init__(name=name)
 
-    async def _get_frame_and_put_to_redis(
-        self, redis_uuid: str, response: ClientResponse
+    def _reset_counts(self):
+        self._frames_read = self._frames_written = self._frames_dropped = 0
+        self._frames_read_setter(0)
+        self._frames_written_setter(0)
+        self._frames_dropped_setter(0)
+        # The redis keys which have had their expiry set since the last kickoff
+        self._keys_with_expiry: set[str] = set()
+
+    async def _get_frame_and_queue(
+        self,
+        redis_uuid: str,
+        stream: MJPEGStream,
+        frames: asyncio.Queue[_Frame | None],
     ):
-        """Stores the raw bytes of the jpeg image in redis. Murko ultimately wants a
-        pickled numpy array of pixel values but raw byes are more space efficient. There
-        may be better ways of doing this, see https://github.com/DiamondLightSource/mx-bluesky/issues/592"""
-        jpeg_bytes = await get_next_jpeg(response)
-        self.uuid_setter(redis_uuid)
+        """Reads the next jpeg image from the stream and queues it to be written to
+        redis. If the queue is full the frame is dropped."""
+        jpeg_bytes = await stream.read_frame()
+        self._frames_read += 1
+        self._frames_read_setter(self._frames_read)
         sample_id = await self.sample_id.get_value()
-        redis_key = f"murko:{sample_id}:raw"
-        await self.redis_client.hset(redis_key, redis_uuid, jpeg_bytes)  # type: ignore
-        await self.redis_client.expire(redis_key, timedelta(days=self.DATA_EXPIRY_DAYS))
+        try:
+            frames.put_nowait(_Frame(f"murko:{sample_id}:raw", redis_uuid, jpeg_bytes))
+        except asyncio.QueueFull:
+            self._frames_dropped += 1
+            self._frames_dropped_setter(self._frames_dropped)
+            LOGGER.debug(f"Redis writes are behind, dropped frame {redis_uuid}")
+
+    async def _put_frames_to_redis(self, frames: list[_Frame]):
+        """Stores the raw bytes of the jpeg images in redis, in a single pipeline. Murko
+        ultimately wants a pickled numpy array of pixel values but raw byes are more
+        space efficient. There may be better ways of doing this, see
+        https://github.com/DiamondLightSource/mx-bluesky/issues/592"""
+        frames_by_key: dict[str, dict[str, bytes]] = defaultdict(dict)
+        for frame in frames:
+            frames_by_key[frame.redis_key][frame.redis_uuid] = frame.jpeg_bytes
+        async with self.redis_client.pipeline() as pipeline:
+            for redis_key, jpegs in frames_by_key.items():
+                pipeline.hset(redis_key, mapping=jpegs)  # type: ignore
+                if redis_key not in self._keys_with_expiry:
+                    pipeline.expire(redis_key, timedelta(days=self.DATA_EXPIRY_DAYS))
+            await pipeline.execute()
+        # Only publish the uuids once the frames can be found under them in redis
+        for frame in frames:
+            self.uuid_setter(frame.redis_uuid)
+        self._keys_with_expiry.update(frames_by_key)
+        self._frames_written += len(frames)
+        self._frames_written_setter(self._frames_written)
+
+    async def _write_frames_to_redis(self, frames: asyncio.Queue[_Frame | None]):
+        """Writes queued frames to redis until None is queued. Any frames which queued up
+        while the previous write was in progress are written together."""
+        while True:
+            batch = [await frames.get()]
+            while len(batch) < self.MAX_FRAMES_PER_WRITE and not frames.empty():
+                batch.append(frames.get_nowait())
+            to_write = [frame for frame in batch if frame is not None]
+            if to_write:
+                await self._put_frames_to_redis(to_write)
+            if None in batch:
+                return
 
     async def _open_connection_and_do_function(
         self, function_to_do: Callable[[ClientResponse, OAVSource], Awaitable]
@@ -125,32 +204,50 @@ class OAVToRedisForwarder(StandardReadable, Flyable, Stoppable):
         )
         source = self.sources[source_idx]
         stream_url = await source.url.get_value()
-        async with ClientSession() as session:
+        async with aiohttp.ClientSession() as session:
             async with session.get(stream_url) as response:
                 await function_to_do(response, source)
 
     async def _stream_to_redis(self, response: ClientResponse, source: OAVSource):
         """Uses the update of the frame counter as a trigger to pull an image off the OAV
-        and into redis.
+        and queue it to be written into redis by a separate task, so that reading the
+        stream is not held up by writing to redis.
 
         The frame counter is continually increasing on the timescales we store data and
-        so can be used as a uuid. If the OAV is updating too quickly we may drop frames
+        so can be used as a uuid. If the OAV or redis are too slow we may drop frames
         but in this case a best effort on getting as many frames as possible is sufficient.
         """
+        stream = MJPEGStream(response)
+        frames: asyncio.Queue[_Frame | None] = asyncio.Queue(self.FRAME_QUEUE_SIZE)
+        writer = asyncio.create_task(self._write_frames_to_redis(frames))
         done_status = AsyncStatus(
             asyncio.wait_for(self._stop_flag.wait(), timeout=self.TIMEOUT)
         )
-        async for frame_count in observe_value(self.counter, done_status=done_status):
-            redis_uuid = f"{source.oav_name}-{frame_count}-{uuid4()}"
-            await self._get_frame_and_put_to_redis(redis_uuid, response)
+        try:
+            async for frame_count in observe_value(
+                self.counter, done_status=done_status
+            ):
+                if writer.done():
+                    break
+                redis_uuid = f"{source.oav_name}-{frame_count}-{uuid4()}"
+                await self._get_frame_and_queue(redis_uuid, stream, frames)
+        finally:
+            # Let the writer finish the queued frames, unless it has already failed
+            end_of_frames = asyncio.ensure_future(frames.put(None))
+            await asyncio.wait(
+                [end_of_frames, writer], return_when=asyncio.FIRST_COMPLETED
+            )
+            end_of_frames.cancel()
+            await writer
 
     async def _confirm_mjpg_stream(self, response: ClientResponse, source: OAVSource):
-        if response.content_type != "multipart/x-mixed-replace":
+        if response.content_type != MJPEG_CONTENT_TYPE:
             raise ValueError(f"{await source.url.get_value()} is not an MJPG stream")
 
     @AsyncStatus.wrap
     async def kickoff(self):
         self._stop_flag.clear()
+        self._reset_counts()
         await self._open_connection_and_do_function(self._confirm_mjpg_stream)
         self.forwarding_task = asyncio.create_task(
             self._open_connection_and_do_function(self._stream_to_redis)
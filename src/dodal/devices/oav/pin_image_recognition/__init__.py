@@ -1,5 +1,8 @@
 import asyncio
 import time
+from collections.abc import AsyncGenerator
+from concurrent.futures import Executor
+from contextlib import aclosing
 
 import numpy as np
 from numpy.typing import NDArray
@@ -7,6 +10,8 @@ from ophyd_async.core import (
     Array1D,
     AsyncStatus,
     HintedSignal,
+    SignalDatatypeT,
+    SignalR,
     StandardReadable,
     observe_value,
     soft_signal_r_and_setter,
@@ -17,6 +22,7 @@ from ophyd_async.epics.signal import epics_signal_r
 from dodal.devices.oav.pin_image_recognition.utils import (
     ARRAY_PROCESSING_FUNCTIONS_MAP,
     MxSampleDetect,
+    RegionOfInterest,
     SampleLocation,
     ScanDirections,
     identity,
@@ -31,6 +37,38 @@ class InvalidPinException(Exception):
     pass
 
 
+async def _observe_latest_value(
+    signal: SignalR[SignalDatatypeT],
+) -> AsyncGenerator[SignalDatatypeT, None]:
+    """Like observe_value but if the consumer is slower than the updates of the signal
+    then only the newest value is yielded, older values are dropped."""
+    latest: asyncio.Queue[SignalDatatypeT] = asyncio.Queue(maxsize=1)
+
+    async def _keep_latest():
+        async for value in observe_value(signal):
+            if latest.full():
+                latest.get_nowait()
+            latest.put_nowait(value)
+
+    monitor = asyncio.create_task(_keep_latest())
+    tasks: list[asyncio.Future] = [monitor]
+    try:
+        while True:
+            # Only start waiting once the consumer is ready, so that it gets the newest
+            next_value = asyncio.ensure_future(latest.get())
+            tasks = [monitor, next_value]
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+            if not next_value.done():
+                # Propagates any error from monitoring the signal
+                monitor.result()
+                return
+            yield next_value.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
 class PinTipDetection(StandardReadable):
     """
     A device which will read from an on-axis view and calculate the location of the
@@ -45,13 +83,32 @@ class PinTipDetection(StandardReadable):
     occasionally give incorrect data. Therefore, it is recommended that you trigger
     this device, which will attempt to find a pin within {validity_timeout} seconds if
     no tip is found after this time it will not error but instead return {INVALID_POSITION}.
+
+    The image processing is done in an executor so that it does not block the event
+    loop. By default this is the event loop's default thread pool, as OpenCV releases
+    the GIL, but any executor, including a ProcessPoolExecutor, can be given instead.
+    If frames arrive faster than they can be processed then only the newest frame is
+    processed.
+
+    To reduce the time taken to process each frame, {max_tip_distance} can be set to
+    only search a region of that half size in pixels around the last tip found, e.g.
+    from OAVParameters.get_max_tip_distance_in_pixels. The whole frame is searched if
+    the tip is not found in the region. When the tip is found in the region the top
+    and bottom edges are only found within it and are NONE_VALUE outside of it, so
+    leave {max_tip_distance} at 0 if the edges are needed across the whole frame. The
+    last tip is forgotten when the device is staged or unstaged or no tip is found, so
+    that a new pin is searched for in the whole frame. {pyramid_levels} can also be
+    set to search the whole frame at a reduced size, halved that many times, before
+    refining the tip at full resolution.
     """
 
     INVALID_POSITION = np.array([np.iinfo(np.int32).min, np.iinfo(np.int32).min])
 
-    def __init__(self, prefix: str, name: str = ""):
+    def __init__(self, prefix: str, name: str = "", executor: Executor | None = None):
         self._prefix: str = prefix
         self._name = name
+        self._executor = executor
+        self._last_tip: tuple[int, int] | None = None
 
         self.triggered_tip, self._tip_setter = soft_signal_r_and_setter(
             Tip, name="triggered_tip"
@@ -79,6 +136,9 @@ class PinTipDetection(StandardReadable):
         )
         self.min_tip_height = soft_signal_rw(int, 5, name="min_tip_height")
         self.validity_timeout = soft_signal_rw(float, 5.0, name="validity_timeout")
+        # Soft parameters to speed up pin-tip detection, disabled when 0.
+        self.max_tip_distance = soft_signal_rw(int, 0, name="max_tip_distance")
+        self.pyramid_levels = soft_signal_rw(int, 0, name="pyramid_levels")
 
         self.add_readables(
             [
@@ -91,20 +151,29 @@ class PinTipDetection(StandardReadable):
 
         super().__init__(name=name)
 
+    @AsyncStatus.wrap
+    async def stage(self) -> None:
+        self._last_tip = None
+        await super().stage()
+
+    @AsyncStatus.wrap
+    async def unstage(self) -> None:
+        self._last_tip = None
+        await super().unstage()
+
     def _set_triggered_values(self, results: SampleLocation):
         if results.tip_x is None or results.tip_y is None:
             raise InvalidPinException
         else:
             tip = np.array([results.tip_x, results.tip_y])
             self._tip_setter(tip)
+            self._last_tip = (results.tip_x, results.tip_y)
         self._top_edge_setter(results.edge_top)
         self._bottom_edge_setter(results.edge_bottom)
 
-    async def _get_tip_and_edge_data(
-        self, array_data: NDArray[np.uint8]
-    ) -> SampleLocation:
+    async def _get_sample_detection(self) -> MxSampleDetect:
         """
-        Gets the location of the pin tip and the top and bottom edges.
+        Gets a sample detector configured with the current soft parameters.
         """
         preprocess_key = await self.preprocess_operation.get_value()
         preprocess_iter = await self.preprocess_iterations.get_value()
@@ -124,7 +193,7 @@ class PinTipDetection(StandardReadable):
             else ScanDirections.REVERSE
         )
 
-        sample_detection = MxSampleDetect(
+        return MxSampleDetect(
             preprocess=preprocess_func,
             canny_lower=await self.canny_lower_threshold.get_value(),
             canny_upper=await self.canny_upper_threshold.get_value(),
@@ -134,33 +203,90 @@ class PinTipDetection(StandardReadable):
             min_tip_height=await self.min_tip_height.get_value(),
         )
 
+    def _get_search_region(
+        self, array_data: NDArray[np.uint8], max_tip_distance: int
+    ) -> RegionOfInterest | None:
+        if max_tip_distance <= 0 or self._last_tip is None:
+            return None
+        height, width = array_data.shape[:2]
+        return RegionOfInterest.around(
+            *self._last_tip, half_size=max_tip_distance, width=width, height=height
+        )
+
+    async def _get_tip_and_edge_data(
+        self,
+        array_data: NDArray[np.uint8],
+        sample_detection: MxSampleDetect | None = None,
+        max_tip_distance: int = 0,
+        pyramid_levels: int = 0,
+    ) -> SampleLocation:
+        """
+        Gets the location of the pin tip and the top and bottom edges. If no sample
+        detector is given one is made from the current soft parameters.
+        """
+        if sample_detection is None:
+            sample_detection = await self._get_sample_detection()
+
         start_time = time.time()
-        location = sample_detection.processArray(array_data)
+        location = await asyncio.get_running_loop().run_in_executor(
+            self._executor,
+            sample_detection.processArray,
+            array_data,
+            self._get_search_region(array_data, max_tip_distance),
+            pyramid_levels,
+        )
         end_time = time.time()
         LOGGER.debug(
             f"Sample location detection took {(end_time - start_time) * 1000.0}ms"
         )
         return location
 
+    async def get_tip_and_edge_data_for_frames(
+        self, frames: NDArray[np.uint8]
+    ) -> list[SampleLocation]:
+        """
+        Gets the location of the pin tip and the top and bottom edges in every frame of
+        a stack of frames of shape (N, H, W), or (N, H, W, 3) for colour frames. The
+        soft parameters are read once and used for all frames.
+        """
+        sample_detection = await self._get_sample_detection()
+
+        start_time = time.time()
+        locations = await asyncio.get_running_loop().run_in_executor(
+            self._executor, sample_detection.processArrays, frames
+        )
+        end_time = time.time()
+        LOGGER.debug(
+            f"Sample location detection for {len(frames)} frames took "
+            f"{(end_time - start_time) * 1000.0}ms"
+        )
+        return locations
+
     @AsyncStatus.wrap
     async def trigger(self):
         async def _set_triggered_tip():
             """Monitors the camera data and updates the triggered_tip signal.
 
             If a tip is found it will update the signal and stop monitoring
-            If no tip is found it will retry with the next monitored value
-            This loop will serve as a good example of using 'observe_value' in the ophyd_async documentation
+            If no tip is found it will retry with the newest monitored value
             """
-            async for value in observe_value(self.array_data):
-                try:
-                    location = await self._get_tip_and_edge_data(value)
-                    self._set_triggered_values(location)
-                except Exception as e:
-                    LOGGER.warning(
-                        f"Failed to detect pin-tip location, will retry with next image: {e}"
-                    )
-                else:
-                    return
+            # Take a snapshot of the parameters once rather than for every frame
+            sample_detection = await self._get_sample_detection()
+            max_tip_distance = await self.max_tip_distance.get_value()
+            pyramid_levels = await self.pyramid_levels.get_value()
+            async with aclosing(_observe_latest_value(self.array_data)) as frames:
+                async for value in frames:
+                    try:
+                        location = await self._get_tip_and_edge_data(
+                            value, sample_detection, max_tip_distance, pyramid_levels
+                        )
+                        self._set_triggered_values(location)
+                    except Exception as e:
+                        LOGGER.warning(
+                            f"Failed to detect pin-tip location, will retry with next image: {e}"
+                        )
+                    else:
+                        return
 
         try:
             await asyncio.wait_for(
@@ -170,6 +296,7 @@ class PinTipDetection(StandardReadable):
             LOGGER.error(
                 f"No tip found in {await self.validity_timeout.get_value()} seconds."
             )
+            self._last_tip = None
             self._tip_setter(self.INVALID_POSITION)
             self._bottom_edge_setter(np.array([]))
             self._top_edge_setter(np.array([]))
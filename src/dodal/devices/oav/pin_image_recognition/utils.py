@@ -1,12 +1,18 @@
 from collections.abc import Callable
 from dataclasses import dataclass
 from enum import Enum
-from typing import Final
+from functools import partial
+from typing import TYPE_CHECKING, Final
 
-import cv2
 import numpy as np
 
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
+
+if TYPE_CHECKING:
+    import cv2
+else:
+    cv2 = lazy_import("cv2")
 
 
 class ScanDirections(Enum):
@@ -14,25 +20,42 @@ class ScanDirections(Enum):
     REVERSE = -1
 
 
+# The processing functions below are built from functools.partial of module level
+# functions, rather than lambdas, so that a configured MxSampleDetect can be pickled
+# and sent to a process pool.
+
+
+def _identity(arr: np.ndarray) -> np.ndarray:
+    return arr
+
+
 def identity(*args, **kwargs) -> Callable[[np.ndarray], np.ndarray]:
-    return lambda arr: arr
+    return _identity
+
+
+def _structuring_element(ksize: int) -> np.ndarray:
+    return cv2.getStructuringElement(cv2.MORPH_RECT, (ksize, ksize))
 
 
 def erode(ksize: int, iterations: int) -> Callable[[np.ndarray], np.ndarray]:
-    element = cv2.getStructuringElement(cv2.MORPH_RECT, (ksize, ksize))
-    return lambda arr: cv2.erode(arr, element, iterations=iterations)
+    return partial(cv2.erode, kernel=_structuring_element(ksize), iterations=iterations)
 
 
 def dilate(ksize: int, iterations: int) -> Callable[[np.ndarray], np.ndarray]:
-    element = cv2.getStructuringElement(cv2.MORPH_RECT, (ksize, ksize))
-    return lambda arr: cv2.dilate(arr, element, iterations=iterations)
+    return partial(
+        cv2.dilate, kernel=_structuring_element(ksize), iterations=iterations
+    )
 
 
 def _morph(
     ksize: int, iterations: int, morph_type: int
 ) -> Callable[[np.ndarray], np.ndarray]:
-    element = cv2.getStructuringElement(cv2.MORPH_RECT, (ksize, ksize))
-    return lambda arr: cv2.morphologyEx(arr, morph_type, element, iterations=iterations)
+    return partial(
+        cv2.morphologyEx,
+        op=morph_type,
+        kernel=_structuring_element(ksize),
+        iterations=iterations,
+    )
 
 
 def open_morph(ksize: int, iterations: int) -> Callable[[np.ndarray], np.ndarray]:
@@ -56,20 +79,20 @@ def black_hat(ksize: int, iterations: int) -> Callable[[np.ndarray], np.ndarray]
 
 
 def blur(ksize: int, *args, **kwargs) -> Callable[[np.ndarray], np.ndarray]:
-    return lambda arr: cv2.blur(arr, ksize=(ksize, ksize))
+    return partial(cv2.blur, ksize=(ksize, ksize))
 
 
 def gaussian_blur(ksize: int, *args, **kwargs) -> Callable[[np.ndarray], np.ndarray]:
     # Kernel size should be odd.
     if not ksize % 2:
         ksize += 1
-    return lambda arr: cv2.GaussianBlur(arr, (ksize, ksize), 0)
+    return partial(cv2.GaussianBlur, ksize=(ksize, ksize), sigmaX=0)
 
 
 def median_blur(ksize: int, *args, **kwargs) -> Callable[[np.ndarray], np.ndarray]:
     if not ksize % 2:
         ksize += 1
-    return lambda arr: cv2.medianBlur(arr, ksize)
+    return partial(cv2.medianBlur, ksize=ksize)
 
 
 ARRAY_PROCESSING_FUNCTIONS_MAP = {
@@ -104,11 +127,48 @@ class SampleLocation:
     edge_bottom: np.ndarray
 
 
+@dataclass(frozen=True)
+class RegionOfInterest:
+    """
+    A rectangular region of an image, in pixels. The upper bounds are exclusive.
+
+    When a tip is found by searching only a region, the top and bottom edges are
+    NONE_VALUE for every column outside of it, rather than the edges of the whole
+    image. Code using the edges across the whole image, e.g. to draw a grid over the
+    sample, must search the whole image instead.
+    """
+
+    x_min: int
+    x_max: int
+    y_min: int
+    y_max: int
+
+    @classmethod
+    def around(
+        cls, x: int, y: int, half_size: int, width: int, height: int
+    ) -> "RegionOfInterest":
+        """
+        Gets the square region with the given half size centred on (x, y), clipped to
+        an image of the given width and height.
+        """
+        return cls(
+            x_min=max(x - half_size, 0),
+            x_max=min(x + half_size + 1, width),
+            y_min=max(y - half_size, 0),
+            y_max=min(y + half_size + 1, height),
+        )
+
+
+# When refining a tip found in a downscaled image, the half size of the region searched
+# at full resolution, in pixels of the downscaled image.
+REFINE_HALF_SIZE: Final[int] = 4
+
+
 class MxSampleDetect:
     def __init__(
         self,
         *,
-        preprocess: Callable[[np.ndarray], np.ndarray] = lambda arr: arr,
+        preprocess: Callable[[np.ndarray], np.ndarray] = _identity,
         canny_upper: int = 100,
         canny_lower: int = 50,
         close_ksize: int = 5,
@@ -140,31 +200,195 @@ class MxSampleDetect:
 
         self.min_tip_height = min_tip_height
 
-    def processArray(self, arr: np.ndarray) -> SampleLocation:
-        # Get a greyscale version of the input.
-        if arr.ndim == 3:
-            gray_arr = cv2.cvtColor(arr, cv2.COLOR_BGR2GRAY)
+    def processArray(
+        self,
+        arr: np.ndarray,
+        roi: RegionOfInterest | None = None,
+        pyramid_levels: int = 0,
+    ) -> SampleLocation:
+        """
+        Finds the sample in an image.
+
+        Args:
+            arr: The image, of shape (H, W), or (H, W, 3) for a colour image
+            roi: If given, only this region of the image is searched at first. The
+                whole image is searched if the tip is not found inside the region or
+                touches its border. If the tip is found inside the region then the
+                edges are only found within it and are NONE_VALUE for every column
+                outside of it.
+            pyramid_levels: If greater than 0, the whole image is searched after halving
+                its size this many times and the tip is then refined at full resolution.
+                The edges are found at the reduced resolution.
+
+        Returns:
+            The location of the sample
+        """
+        if roi is not None:
+            location = self._locate_sample_in_region(arr, roi)
+            if location is not None:
+                return location
+            LOGGER.info(
+                "pin-tip detection: No tip found in region of interest - searching whole image"
+            )
+        if pyramid_levels > 0:
+            return self._locate_sample_downscaled(arr, pyramid_levels)
+        return self._locate_sample(self._find_edges(arr))
+
+    def processArrays(self, arrs: np.ndarray) -> list[SampleLocation]:
+        """
+        Finds the sample in every frame of a stack of images, with the same parameters.
+
+        Args:
+            arrs: A stack of frames of shape (N, H, W), or (N, H, W, 3) for colour frames
+
+        Returns:
+            The location of the sample in each frame, in the same order as the frames
+        """
+        if len(arrs) == 0:
+            return []
+        return self._locate_samples(np.stack([self._find_edges(arr) for arr in arrs]))
+
+    def _locate_sample_in_region(
+        self, arr: np.ndarray, roi: RegionOfInterest
+    ) -> SampleLocation | None:
+        """
+        Finds the sample within a region of an image, giving the location in the
+        coordinates of the whole image. Returns None if no tip is found or the tip is
+        on a border of the region which is not also a border of the image, as the tip
+        may then be outside of the region.
+        """
+        height, width = arr.shape[:2]
+        # Find the edges with a margin around the region, as the close operation
+        # gives false edges at the border of an image
+        margin = self.close_ksize * self.close_iterations
+        padded = RegionOfInterest(
+            x_min=max(roi.x_min - margin, 0),
+            x_max=min(roi.x_max + margin, width),
+            y_min=max(roi.y_min - margin, 0),
+            y_max=min(roi.y_max + margin, height),
+        )
+        edge_arr = self._find_edges(
+            arr[padded.y_min : padded.y_max, padded.x_min : padded.x_max]
+        )
+        # Not finding the tip in the region is expected, e.g. for a new pin, so is
+        # not warned about as the whole image is then searched
+        location = self._locate_samples(
+            edge_arr[
+                np.newaxis,
+                roi.y_min - padded.y_min : roi.y_max - padded.y_min,
+                roi.x_min - padded.x_min : roi.x_max - padded.x_min,
+            ],
+            warn=False,
+        )[0]
+        if location.tip_x is None or location.tip_y is None:
+            return None
+
+        tip_x = location.tip_x
+        if self.scan_direction == ScanDirections.FORWARD:
+            on_x_border = tip_x == 0 and roi.x_min > 0
         else:
-            assert arr.ndim == 2
-            gray_arr = arr
+            on_x_border = tip_x == roi.x_max - roi.x_min - 1 and roi.x_max < width
+        on_y_border = (location.edge_top[tip_x] == 0 and roi.y_min > 0) or (
+            location.edge_bottom[tip_x] == roi.y_max - roi.y_min - 1
+            and roi.y_max < height
+        )
+        if on_x_border or on_y_border:
+            return None
+
+        def to_image_edges(edges: np.ndarray) -> np.ndarray:
+            image_edges = np.full(width, NONE_VALUE, dtype=edges.dtype)
+            image_edges[roi.x_min : roi.x_max] = np.where(
+                edges != NONE_VALUE, edges + roi.y_min, NONE_VALUE
+            )
+            return image_edges
+
+        return SampleLocation(
+            tip_x=tip_x + roi.x_min,
+            tip_y=location.tip_y + roi.y_min,
+            edge_top=to_image_edges(location.edge_top),
+            edge_bottom=to_image_edges(location.edge_bottom),
+        )
+
+    def _locate_sample_downscaled(
+        self, arr: np.ndarray, pyramid_levels: int
+    ) -> SampleLocation:
+        """
+        Finds the sample in a downscaled copy of the image, then refines the tip in a
+        small region around it at full resolution.
+        """
+        scale = 2**pyramid_levels
+        downscaled = arr
+        for _ in range(pyramid_levels):
+            downscaled = cv2.pyrDown(downscaled)
+
+        coarse_detection = MxSampleDetect(
+            preprocess=self.preprocess,
+            canny_upper=self.canny_upper,
+            canny_lower=self.canny_lower,
+            close_ksize=self.close_ksize,
+            close_iterations=self.close_iterations,
+            scan_direction=self.scan_direction,
+            min_tip_height=max(self.min_tip_height // scale, 1),
+        )
+        coarse = coarse_detection._locate_sample(
+            coarse_detection._find_edges(downscaled)
+        )
+
+        height, width = arr.shape[:2]
+
+        def to_image_edges(edges: np.ndarray) -> np.ndarray:
+            return np.repeat(
+                np.where(edges != NONE_VALUE, edges * scale, NONE_VALUE), scale
+            )[:width]
+
+        edge_top = to_image_edges(coarse.edge_top)
+        edge_bottom = to_image_edges(coarse.edge_bottom)
+        if coarse.tip_x is None or coarse.tip_y is None:
+            return SampleLocation(None, None, edge_top, edge_bottom)
+
+        tip_x, tip_y = coarse.tip_x * scale, coarse.tip_y * scale
+        refined = self._locate_sample_in_region(
+            arr,
+            RegionOfInterest.around(
+                tip_x,
+                tip_y,
+                REFINE_HALF_SIZE * scale + self.min_tip_height,
+                width,
+                height,
+            ),
+        )
+        if refined is not None:
+            tip_x, tip_y = refined.tip_x, refined.tip_y
+        return SampleLocation(tip_x, tip_y, edge_top, edge_bottom)
+
+    def _find_edges(self, arr: np.ndarray) -> np.ndarray:
+        gray_arr = self._to_greyscale(arr)
 
         # Preprocess the array. (Use the greyscale one.)
         pp_arr = self.preprocess(gray_arr)
 
-        # Find some edges.
-        edge_arr = cv2.Canny(pp_arr, self.canny_upper, self.canny_lower)
+        return self._close(self._canny(pp_arr))
+
+    @staticmethod
+    def _to_greyscale(arr: np.ndarray) -> np.ndarray:
+        if arr.ndim == 3:
+            return cv2.cvtColor(arr, cv2.COLOR_BGR2GRAY)
+        assert arr.ndim == 2
+        return arr
 
-        closed_arr = close(self.close_ksize, self.close_iterations)(edge_arr)
+    def _canny(self, arr: np.ndarray) -> np.ndarray:
+        return cv2.Canny(arr, self.canny_upper, self.canny_lower)
 
-        # Find the sample.
-        return self._locate_sample(closed_arr)
+    def _close(self, edge_arr: np.ndarray) -> np.ndarray:
+        return close(self.close_ksize, self.close_iterations)(edge_arr)
 
     @staticmethod
     def _first_and_last_nonzero_by_columns(
         arr: np.ndarray,
     ) -> tuple[np.ndarray, np.ndarray]:
         """
-        Finds the indexes of the first & last non-zero values by column in a 2d array.
+        Finds the indexes of the first & last non-zero values by column in a 2d array,
+        or in each frame of a 3d stack of arrays.
 
         Outputs will contain NONE_VALUE if no non-zero values exist in a column.
 
@@ -179,73 +403,101 @@ class MxSampleDetect:
         last_nonzero will be [1, 2, NONE_VALUE, 2]
         """
         nonzero = arr.astype(dtype=bool, copy=False)
-        any_nonzero_in_column = nonzero.any(axis=0)
+        any_nonzero_in_column = nonzero.any(axis=-2)
 
         first_nonzero = np.where(
-            any_nonzero_in_column, nonzero.argmax(axis=0), NONE_VALUE
+            any_nonzero_in_column, nonzero.argmax(axis=-2), NONE_VALUE
         )
 
-        flipped = nonzero.shape[0] - np.flip(nonzero, axis=0).argmax(axis=0) - 1
+        flipped = nonzero.shape[-2] - np.flip(nonzero, axis=-2).argmax(axis=-2) - 1
         last_nonzero = np.where(any_nonzero_in_column, flipped, NONE_VALUE)
 
         return first_nonzero, last_nonzero
 
     def _locate_sample(self, edge_arr: np.ndarray) -> SampleLocation:
-        height, width = edge_arr.shape
+        return self._locate_samples(edge_arr[np.newaxis])[0]
 
-        top, bottom = MxSampleDetect._first_and_last_nonzero_by_columns(edge_arr)
+    def _locate_samples(
+        self, edge_arrs: np.ndarray, warn: bool = True
+    ) -> list[SampleLocation]:
+        n_frames, _, width = edge_arrs.shape
+        frames = np.arange(n_frames)
+        columns = np.arange(width)
+
+        tops, bottoms = MxSampleDetect._first_and_last_nonzero_by_columns(edge_arrs)
 
         # Calculate widths. In general if bottom == top this has width 1.
         # special case for bottom == top == NONE_VALUE (i.e. no edge at all), that has width 0.
-        widths = np.where(top != NONE_VALUE, bottom - top + 1, 0)
+        widths = np.where(tops != NONE_VALUE, bottoms - tops + 1, 0)
 
-        # Generate the indices of columns with widths larger than the specified min tip height.
+        # Find the columns with widths larger than the specified min tip height.
         non_narrow_widths = widths >= self.min_tip_height
-        column_indices_with_non_narrow_widths = np.flatnonzero(non_narrow_widths)
+        sample_found = non_narrow_widths.any(axis=1)
+        no_edges = tops == NONE_VALUE
 
-        if column_indices_with_non_narrow_widths.shape[0] == 0:
-            # No non-narrow locations - sample not in picture?
-            # Or wrong parameters for edge-finding, ...
-            LOGGER.warning(
-                "pin-tip detection: No non-narrow edges found - cannot locate pin tip"
-            )
-            return SampleLocation(
-                tip_x=None, tip_y=None, edge_bottom=bottom, edge_top=top
-            )
-
-        # Choose our starting point - i.e. first column with non-narrow width for positive scan, last one for negative scan.
+        # Choose our starting point - i.e. first column with non-narrow width for
+        # positive scan, last one for negative scan. Then move backwards to where there
+        # were no edges at all and forward one step, which is the tip.
         if self.scan_direction == ScanDirections.FORWARD:
-            start_column = int(column_indices_with_non_narrow_widths[0])
+            start_columns = non_narrow_widths.argmax(axis=1)
+            last_empty_columns = np.maximum.accumulate(
+                np.where(no_edges, columns, -1), axis=1
+            )
+            tip_xs = last_empty_columns[frames, start_columns] + 1
+            tips_at_edge = tip_xs == 0
+            cleared = columns < tip_xs[:, np.newaxis]
         else:
-            start_column = int(column_indices_with_non_narrow_widths[-1])
+            start_columns = width - 1 - non_narrow_widths[:, ::-1].argmax(axis=1)
+            next_empty_columns = np.minimum.accumulate(
+                np.where(no_edges, columns, width)[:, ::-1], axis=1
+            )[:, ::-1]
+            tip_xs = next_empty_columns[frames, start_columns] - 1
+            tips_at_edge = tip_xs == width - 1
+            cleared = columns > tip_xs[:, np.newaxis]
+
+        # Frames without a sample have no meaningful tip, keep them indexable anyway
+        tip_xs = np.clip(tip_xs, 0, width - 1)
+        tip_ys = np.rint(0.5 * (tops[frames, tip_xs] + bottoms[frames, tip_xs]))
 
-        x = start_column
+        # clear edges to the left (right) of the tip.
+        cleared &= sample_found[:, np.newaxis]
+        tops[cleared] = NONE_VALUE
+        bottoms[cleared] = NONE_VALUE
+
+        locations = []
+        for frame in frames:
+            if not sample_found[frame]:
+                # No non-narrow locations - sample not in picture?
+                # Or wrong parameters for edge-finding, ...
+                if warn:
+                    LOGGER.warning(
+                        "pin-tip detection: No non-narrow edges found - cannot locate pin tip"
+                    )
+                locations.append(
+                    SampleLocation(
+                        tip_x=None,
+                        tip_y=None,
+                        edge_bottom=bottoms[frame],
+                        edge_top=tops[frame],
+                    )
+                )
+                continue
 
-        # Move backwards to where there were no edges at all...
-        while top[x] != NONE_VALUE:
-            x += -self.scan_direction.value
-            if x == -1 or x == width:
+            if tips_at_edge[frame] and warn:
                 # (In this case the sample is off the edge of the picture.)
                 LOGGER.warning(
                     "pin-tip detection: Pin tip may be outside image area - assuming at edge."
                 )
-                break
-        x += self.scan_direction.value  # ...and forward one step. x is now at the tip.
-
-        tip_x = x
-        tip_y = int(round(0.5 * (top[x] + bottom[x])))
-
-        # clear edges to the left (right) of the tip.
-        if self.scan_direction.value == 1:
-            top[:x] = NONE_VALUE
-            bottom[:x] = NONE_VALUE
-        else:
-            top[x + 1 :] = NONE_VALUE
-            bottom[x + 1 :] = NONE_VALUE
-
-        LOGGER.info(
-            f"pin-tip detection: Successfully located pin tip at (x={tip_x}, y={tip_y})"
-        )
-        return SampleLocation(
-            tip_x=tip_x, tip_y=tip_y, edge_bottom=bottom, edge_top=top
-        )
+            tip_x, tip_y = int(tip_xs[frame]), int(tip_ys[frame])
+            LOGGER.info(
+                f"pin-tip detection: Successfully located pin tip at (x={tip_x}, y={tip_y})"
+            )
+            locations.append(
+                SampleLocation(
+                    tip_x=tip_x,
+                    tip_y=tip_y,
+                    edge_bottom=bottoms[frame],
+                    edge_top=tops[frame],
+                )
+            )
+        return locations
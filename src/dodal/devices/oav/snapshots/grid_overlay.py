@@ -1,7 +1,15 @@
+from __future__ import annotations
+
 from enum import Enum
 from functools import partial
+from typing import TYPE_CHECKING
+
+from dodal.utils import lazy_import
 
-from PIL import Image, ImageDraw
+if TYPE_CHECKING:
+    from PIL import Image, ImageDraw
+else:
+    ImageDraw = lazy_import("PIL.ImageDraw")
 
 
 class Orientation(Enum):
@@ -1,7 +1,16 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 from ophyd_async.core import Reference, SignalR
-from PIL import Image, ImageDraw
 
 from dodal.devices.areadetector.plugins.MJPG import MJPG
+from dodal.utils import lazy_import
+
+if TYPE_CHECKING:
+    from PIL import Image, ImageDraw
+else:
+    ImageDraw = lazy_import("PIL.ImageDraw")
 
 CROSSHAIR_LENGTH_PX = 20
 CROSSHAIR_OUTLINE_COLOUR = "Black"
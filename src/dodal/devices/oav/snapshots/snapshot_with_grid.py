@@ -1,7 +1,10 @@
+from __future__ import annotations
+
+import asyncio
 from os.path import join as path_join
+from typing import TYPE_CHECKING
 
 from ophyd_async.core import soft_signal_rw
-from PIL.Image import Image
 
 from dodal.devices.areadetector.plugins.MJPG import IMG_FORMAT, MJPG, asyncio_save_image
 from dodal.devices.oav.snapshots.grid_overlay import (
@@ -10,6 +13,9 @@ from dodal.devices.oav.snapshots.grid_overlay import (
 )
 from dodal.log import LOGGER
 
+if TYPE_CHECKING:
+    from PIL.Image import Image
+
 
 class SnapshotWithGrid(MJPG):
     def __init__(self, prefix: str, name: str = "") -> None:
@@ -26,9 +32,6 @@ class SnapshotWithGrid(MJPG):
         super().__init__(prefix, name)
 
     async def post_processing(self, image: Image):
-        # Save an unmodified image with no suffix
-        await self._save_image(image)
-
         top_left_x = await self.top_left_x.get_value()
         top_left_y = await self.top_left_y.get_value()
         box_width = await self.box_width.get_value()
@@ -36,22 +39,42 @@ class SnapshotWithGrid(MJPG):
         num_boxes_y = await self.num_boxes_y.get_value()
 
         assert isinstance(filename_str := await self.filename.get_value(), str)
-        assert isinstance(directory_str := await self.directory.get_value(), str)
+        directory_str = await self._create_directory()
 
+        # Each overlay is drawn on a copy so that all the images can be saved at once
+        outer_overlay = image.copy()
         add_grid_border_overlay_to_image(
-            image, int(top_left_x), int(top_left_y), box_width, num_boxes_x, num_boxes_y
+            outer_overlay,
+            int(top_left_x),
+            int(top_left_y),
+            box_width,
+            num_boxes_x,
+            num_boxes_y,
         )
-
-        path = path_join(directory_str, f"{filename_str}_outer_overlay.{IMG_FORMAT}")
-        await self.last_path_outer.set(path, wait=True)
-        LOGGER.info(f"Saving grid outer edge at {path}")
-        await asyncio_save_image(image, path)
-
+        full_overlay = outer_overlay.copy()
         add_grid_overlay_to_image(
-            image, int(top_left_x), int(top_left_y), box_width, num_boxes_x, num_boxes_y
+            full_overlay,
+            int(top_left_x),
+            int(top_left_y),
+            box_width,
+            num_boxes_x,
+            num_boxes_y,
         )
 
-        path = path_join(directory_str, f"{filename_str}_grid_overlay.{IMG_FORMAT}")
-        await self.last_path_full_overlay.set(path, wait=True)
-        LOGGER.info(f"Saving full grid overlay at {path}")
-        await asyncio_save_image(image, path)
+        outer_path = path_join(
+            directory_str, f"{filename_str}_outer_overlay.{IMG_FORMAT}"
+        )
+        await self.last_path_outer.set(outer_path, wait=True)
+        full_path = path_join(
+            directory_str, f"{filename_str}_grid_overlay.{IMG_FORMAT}"
+        )
+        await self.last_path_full_overlay.set(full_path, wait=True)
+
+        LOGGER.info(f"Saving grid outer edge at {outer_path}")
+        LOGGER.info(f"Saving full grid overlay at {full_path}")
+        await asyncio.gather(
+            # Save an unmodified image with no suffix
+            self._save_image(image),
+            asyncio_save_image(outer_overlay, outer_path),
+            asyncio_save_image(full_overlay, full_path),
+        )
@@ -1,8 +1,6 @@
 import os
 
-import numpy as np
 from bluesky.protocols import Movable
-from numpy import argmin, ndarray
 from ophyd_async.core import (
     AsyncStatus,
     ConfigSignal,
@@ -15,7 +13,7 @@ from ophyd_async.epics.signal import epics_signal_r
 
 from dodal.log import LOGGER
 
-from .util.lookup_tables import energy_distance_table
+from .util.lookup_tables import get_lookup_table_async
 
 
 class AccessError(Exception):
@@ -38,14 +36,6 @@ class UndulatorGapAccess(StrictEnum):
     DISABLED = "DISABLED"
 
 
-def _get_closest_gap_for_energy(
-    dcm_energy_ev: float, energy_to_distance_table: ndarray
-) -> float:
-    table = energy_to_distance_table.transpose()
-    idx = argmin(np.abs(table[0] - dcm_energy_ev))
-    return table[1][idx]
-
-
 class Undulator(StandardReadable, Movable):
     """
     An Undulator-type insertion device, used to control photon emission at a given
@@ -141,15 +131,10 @@ class Undulator(StandardReadable, Movable):
 
     async def _get_gap_to_match_energy(self, energy_kev: float) -> float:
         """
-        get a 2d np.array from lookup table that
-        converts energies to undulator gap distance
+        Use the lookup table that converts energies to undulator gap distance to get the
+        undulator gap associated with this dcm energy
         """
-        energy_to_distance_table: np.ndarray = await energy_distance_table(
+        energy_to_distance_table = await get_lookup_table_async(
             self.id_gap_lookup_table_path
         )
-
-        # Use the lookup table to get the undulator gap associated with this dcm energy
-        return _get_closest_gap_for_energy(
-            energy_kev * 1000,
-            energy_to_distance_table,
-        )
+        return float(energy_to_distance_table.nearest(energy_kev * 1000))
@@ -0,0 +1,104 @@
+import asyncio
+from collections.abc import Callable, Mapping
+from functools import partial
+from typing import Any, Generic
+
+import numpy as np
+import numpy.typing as npt
+from ophyd_async.core import DEFAULT_TIMEOUT, DeviceVector, SignalDatatypeT, SignalR
+
+
+class BitArray(DeviceVector[SignalR[SignalDatatypeT]], Generic[SignalDatatypeT]):
+    """A vector of signals that are each either set or not, such as the in/out states
+    of a bank of filters.
+
+    Once connected every member signal is monitored and whether each is set is kept in
+    a single bool array, in the order of the member indices. Reading the whole array,
+    or waiting for it to match an expected array, then uses that array rather than
+    getting each member from the control system.
+
+    The members can still be used individually, e.g. bit_array[3].
+    """
+
+    def __init__(
+        self,
+        children: Mapping[int, SignalR[SignalDatatypeT]],
+        is_set: Callable[[SignalDatatypeT], bool] = bool,
+        name: str = "",
+    ) -> None:
+        self._is_set = is_set
+        # Member indices, in order, to their positions in the array
+        self._indices = {index: i for i, index in enumerate(sorted(children))}
+        self._bits = np.zeros(len(children), dtype=bool)
+        self._received = np.zeros(len(children), dtype=bool)
+        self._callbacks: dict[int, Callable[[Any], None]] = {}
+        self._changed = asyncio.Event()
+        super().__init__(children, name)
+
+    async def connect(
+        self,
+        mock=False,
+        timeout: float = DEFAULT_TIMEOUT,
+        force_reconnect: bool = False,
+    ) -> None:
+        await super().connect(mock, timeout, force_reconnect)
+        self._monitor()
+
+    def _monitor(self):
+        # A reconnect may have replaced the members' backends so start again
+        for index, callback in self._callbacks.items():
+            self[index].clear_sub(callback)
+        self._received[:] = False
+        self._callbacks = {index: partial(self._update, index) for index in self}
+        for index, callback in self._callbacks.items():
+            self[index].subscribe_value(callback)
+
+    def _update(self, index: int, value: SignalDatatypeT):
+        i = self._indices[index]
+        self._bits[i] = self._is_set(value)
+        self._received[i] = True
+        # Wake everything waiting on a change then wait on a new event for the next one
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def _wait_for_all_received(self):
+        while not self._received.all():
+            await self._changed.wait()
+
+    async def get_value(self, cached: bool = True) -> np.ndarray:
+        """Gets whether each member is set, in the order of the member indices.
+
+        If cached is False every member is read from the control system instead, for
+        when the values must be from after a change whose monitor updates may not have
+        arrived yet.
+        """
+        if not cached:
+            values = await asyncio.gather(
+                *(self[index].get_value(cached=False) for index in self._indices)
+            )
+            return np.array([self._is_set(value) for value in values], dtype=bool)
+        await self._wait_for_all_received()
+        return self._bits.copy()
+
+    async def count_set(self) -> int:
+        """Gets how many members are set"""
+        await self._wait_for_all_received()
+        return int(np.count_nonzero(self._bits))
+
+    async def wait_for_value(
+        self, expected: npt.ArrayLike, timeout: float | None = None
+    ) -> None:
+        """Waits until whether each member is set matches expected, which is in the
+        order of the member indices.
+
+        Raises:
+            TimeoutError: if the members do not match within timeout seconds
+        """
+        expected = np.asarray(expected, dtype=bool)
+
+        async def _wait():
+            await self._wait_for_all_received()
+            while not np.array_equal(self._bits, expected):
+                await self._changed.wait()
+
+        await asyncio.wait_for(_wait(), timeout)
@@ -1,4 +1,6 @@
-from collections.abc import Callable, Sequence
+import threading
+import time
+from collections.abc import Callable, Mapping, Sequence
 from functools import partial
 
 from bluesky.protocols import Movable
@@ -110,6 +112,110 @@ def run_functions_without_blocking(
     return full_status
 
 
+def run_functions_after_dependencies(
+    functions_to_run: Mapping[str, Callable[[], StatusBase]],
+    dependencies: Mapping[str, Sequence[str]],
+    timeout: float = 60.0,
+    associated_obj: OphydDevice | None = None,
+    step_times: dict[str, float] | None = None,
+) -> Status:
+    """Runs a graph of status-returning functions in the background, calling each as
+    soon as the statuses of all the functions it depends on have finished.
+
+    Functions that do not depend on each other run at the same time, unlike with
+    run_functions_without_blocking. If any status fails then no more functions are
+    called and the returned status fails with the same exception.
+
+    Args:
+    functions_to_run (dict[str, function -> StatusBase]): The functions to run, by name
+    dependencies (dict[str, list[str]]): The names of the functions that must finish
+                                            before each function is called, functions
+                                            that are not in here are called immediately
+    associated_obj (Device | None): The device that should be associated with the
+                                        returned status
+    step_times (dict[str, float] | None): If given, the number of seconds from calling
+                                            each function to its status finishing is
+                                            added to this by name
+
+    Returns:
+    Status: A status object which is marked as complete once all of the Status objects
+    returned by the functions have completed.
+    """
+    waiting_on = {name: set(dependencies.get(name, ())) for name in functions_to_run}
+    dependents: dict[str, list[str]] = {name: [] for name in functions_to_run}
+    for name, names_needed in waiting_on.items():
+        for name_needed in names_needed:
+            if name_needed not in functions_to_run:
+                raise ValueError(f"{name} depends on unknown function {name_needed}")
+            dependents[name_needed].append(name)
+    _check_for_cycles(waiting_on)
+
+    full_status = Status(obj=associated_obj, timeout=timeout)
+    lock = threading.Lock()
+    remaining = set(functions_to_run)
+
+    def start(name: str):
+        start_time = time.monotonic()
+        try:
+            status = call_func(functions_to_run[name])
+            if not isinstance(status, StatusBase):
+                raise ValueError(f"{name} does not return a Status")
+        except Exception as e:
+            LOGGER.error(f"Function {name} failed with error {e}")
+            fail(e)
+            return
+        status.add_callback(partial(finished, name, start_time))
+
+    def fail(error):
+        with lock:
+            if full_status.done:
+                return
+            full_status.set_exception(error)
+
+    def finished(name: str, start_time: float, status: StatusBase):
+        duration = time.monotonic() - start_time
+        LOGGER.debug(f"{name} took {duration:.3f}s")
+        if step_times is not None:
+            # Statuses finish on the threads of whatever they were waiting on
+            with lock:
+                step_times[name] = duration
+        if (error := status.exception()) is not None:
+            LOGGER.error(f"Status {status} has failed with error {error}")
+            fail(error)
+            return
+        with lock:
+            if full_status.done:
+                return
+            remaining.discard(name)
+            ready = []
+            for dependent in dependents[name]:
+                waiting_on[dependent].discard(name)
+                if not waiting_on[dependent]:
+                    ready.append(dependent)
+            if not remaining:
+                full_status.set_finished()
+        for dependent in ready:
+            start(dependent)
+
+    if not functions_to_run:
+        full_status.set_finished()
+    for name in [name for name, names_needed in waiting_on.items() if not names_needed]:
+        start(name)
+    return full_status
+
+
+def _check_for_cycles(dependencies: Mapping[str, set[str]]):
+    ordered: set[str] = set()
+    unordered = dict(dependencies)
+    while unordered:
+        can_order = [name for name, needed in unordered.items() if needed <= ordered]
+        if not can_order:
+            raise ValueError(f"Functions {sorted(unordered)} depend on each other")
+        for name in can_order:
+            ordered.add(name)
+            del unordered[name]
+
+
 def call_func(func: Callable[[], StatusBase]) -> StatusBase:
     return func()
 
@@ -1,18 +1,118 @@
 """
 All the public methods in this module return a lookup table of some kind that
 converts the source value s to a target value t for different values of s.
+
+Lookup table files are cached, see get_lookup_table, so that each file is only read
+again if it has been modified.
 """
 
-from collections.abc import Callable, Sequence
+import os
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass
 from io import StringIO
 
 import aiofiles
 import numpy as np
+import numpy.typing as npt
 from numpy import interp, loadtxt
 
 from dodal.log import LOGGER
 
 
+@dataclass(frozen=True)
+class LookupTable:
+    """A lookup table read from a file with a column of source values followed by one
+    or more columns of target values.
+
+    Attributes:
+        rows: The table as it is in the file
+        source: The source values, sorted in ascending order
+        targets: An array per target column, in the same order as source
+        monotonic: True if the source values in the file strictly increase or strictly
+            decrease, so that the table can be interpolated
+    """
+
+    rows: np.ndarray
+    source: np.ndarray
+    targets: np.ndarray
+    monotonic: bool
+
+    @classmethod
+    def from_rows(cls, rows: np.ndarray) -> "LookupTable":
+        rows = np.atleast_2d(rows)
+        order = np.argsort(rows[:, 0], kind="stable")
+        steps = np.diff(rows[:, 0])
+        table = cls(
+            rows=rows,
+            source=np.ascontiguousarray(rows[order, 0]),
+            targets=np.ascontiguousarray(rows[order, 1:].T),
+            monotonic=bool(np.all(steps > 0) or np.all(steps < 0)),
+        )
+        # Tables are shared between users so must not be changed
+        for array in (table.rows, table.source, table.targets):
+            array.setflags(write=False)
+        return table
+
+    def interpolate(self, s, column: int = 0):
+        """Linearly interpolates the target column at s, which may be an array. Values
+        of s outside the table give the target at the closest end of the table."""
+        return interp(s, self.source, self.targets[column])
+
+    def nearest(self, s, column: int = 0):
+        """Gets the target in the column for the source value closest to s, which may
+        be an array. If s is exactly between two source values the lower is used."""
+        if len(self.source) == 1:
+            return np.full_like(s, self.targets[column][0], dtype=np.float64)[()]
+        above = np.clip(np.searchsorted(self.source, s), 1, len(self.source) - 1)
+        below = above - 1
+        closer_below = s - self.source[below] <= self.source[above] - s
+        return self.targets[column][np.where(closer_below, below, above)]
+
+
+# Tables by path, along with the modification time of the file they were read from
+_lookup_tables: dict[str, tuple[int, LookupTable]] = {}
+_lookup_tables_lock = threading.Lock()
+
+
+def _parse_lookup_table(raw_table: str) -> LookupTable:
+    return LookupTable.from_rows(loadtxt(StringIO(raw_table), comments=["#", "Units"]))
+
+
+def _get_cached(path: str) -> tuple[int, LookupTable | None]:
+    modified = os.stat(path).st_mtime_ns
+    with _lookup_tables_lock:
+        cached_modified, table = _lookup_tables.get(path, (None, None))
+    return modified, table if cached_modified == modified else None
+
+
+def _cache(path: str, modified: int, table: LookupTable) -> LookupTable:
+    with _lookup_tables_lock:
+        _lookup_tables[path] = (modified, table)
+    return table
+
+
+def get_lookup_table(path: str) -> LookupTable:
+    """Gets the lookup table in the file, only reading the file if it has not been read
+    before or has been modified since."""
+    modified, table = _get_cached(path)
+    if table is None:
+        LOGGER.info(f"Reading lookup table {path}")
+        with open(path) as stream:
+            table = _cache(path, modified, _parse_lookup_table(stream.read()))
+    return table
+
+
+async def get_lookup_table_async(path: str) -> LookupTable:
+    """As get_lookup_table but reads the file, if needed, without blocking"""
+    modified, table = _get_cached(path)
+    if table is None:
+        LOGGER.info(f"Reading lookup table {path}")
+        async with aiofiles.open(path) as stream:
+            table = _cache(path, modified, _parse_lookup_table(await stream.read()))
+    return table
+
+
 async def energy_distance_table(lookup_table_path: str) -> np.ndarray:
     """
     Returns a numpy formatted lookup table for required positions of an ID gap to
@@ -24,12 +124,19 @@ async def energy_distance_table(lookup_table_path: str) -> np.ndarray:
     Returns:
         ndarray: Lookup table
     """
+    return (await get_lookup_table_async(lookup_table_path)).rows
+
+
+def _get_interpolatable_lookup_table(filename: str) -> LookupTable:
+    LOGGER.info(f"Using lookup table {filename}")
+    table = get_lookup_table(filename)
 
-    # Slight cheat to make the file IO async, numpy doesn't do any real IO now, just
-    # decodes the text
-    async with aiofiles.open(lookup_table_path) as stream:
-        raw_table = await stream.read()
-    return loadtxt(StringIO(raw_table), comments=["#", "Units"])
+    # numpy interp expects x-values to be increasing, which the table sorts them into
+    if not table.monotonic:
+        raise AssertionError(
+            f"Configuration file {filename} lookup table does not monotonically increase or decrease."
+        )
+    return table
 
 
 def linear_interpolation_lut(filename: str) -> Callable[[float], float]:
@@ -37,26 +144,22 @@ def linear_interpolation_lut(filename: str) -> Callable[[float], float]:
     values.
 
     If the value falls outside the lookup table then the closest value will be used."""
-    LOGGER.info(f"Using lookup table {filename}")
-    s_and_t_vals = zip(*loadtxt(filename, comments=["#", "Units"]), strict=False)
+    table = _get_interpolatable_lookup_table(filename)
 
-    s_values: Sequence
-    t_values: Sequence
-    s_values, t_values = s_and_t_vals
+    def s_to_t2(s: float) -> float:
+        return float(table.interpolate(s))
 
-    # numpy interp expects x-values to be increasing
-    if not np.all(np.diff(s_values) > 0):
-        LOGGER.info(
-            f"Configuration file {filename} values are not ascending, trying reverse order..."
-        )
-        s_values = list(reversed(s_values))
-        t_values = list(reversed(t_values))
-        if not np.all(np.diff(s_values) > 0):
-            raise AssertionError(
-                f"Configuration file {filename} lookup table does not monotonically increase or decrease."
-            )
+    return s_to_t2
 
-    def s_to_t2(s: float) -> float:
-        return float(interp(s, s_values, t_values))
+
+def linear_interpolation_lut_array(
+    filename: str,
+) -> Callable[[npt.ArrayLike], np.ndarray]:
+    """As linear_interpolation_lut but the callable converts an array of values at
+    once, returning an array of the same shape."""
+    table = _get_interpolatable_lookup_table(filename)
+
+    def s_to_t2(s: npt.ArrayLike) -> np.ndarray:
+        return np.asarray(table.interpolate(s))
 
     return s_to_t2
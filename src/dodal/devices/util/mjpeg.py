@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from aiohttp import ClientResponse
+
+MJPEG_CONTENT_TYPE = "multipart/x-mixed-replace"
+
+JPEG_START_BYTES = b"\xff\xd8"
+JPEG_STOP_BYTES = b"\xff\xd9"
+HEADERS_END = b"\r\n\r\n"
+
+
+def _get_boundary(content_type_header: str) -> bytes | None:
+    for parameter in content_type_header.split(";")[1:]:
+        name, _, value = parameter.strip().partition("=")
+        if name.lower() == "boundary" and value:
+            return value.strip('"').encode()
+    return None
+
+
+class MJPEGStream:
+    """Parses the JPEG frames out of the body of a multipart/x-mixed-replace (MJPEG)
+    response, as served by the areaDetector ffmpegServer.
+
+    The body is read in chunks into a single buffer that is reused for every frame. The
+    length of each frame is taken from its Content-Length header if there is one,
+    otherwise the frame ends at the next boundary or, if the boundary is not known, at
+    the JPEG end of image marker.
+
+    Frames can be read one at a time with read_frame or by iterating:
+
+    > async for jpeg_bytes in MJPEGStream(response):
+    >     ...
+    """
+
+    def __init__(self, response: ClientResponse, chunk_size: int = 64 * 1024):
+        self._content = response.content
+        boundary = _get_boundary(response.headers.get("Content-Type", ""))
+        self._delimiter = b"--" + boundary if boundary else None
+        self._chunk_size = chunk_size
+        self._buffer = bytearray()
+        # Where the unparsed data starts in the buffer
+        self._start = 0
+
+    def __aiter__(self) -> MJPEGStream:
+        return self
+
+    async def __anext__(self) -> bytes:
+        try:
+            return await self.read_frame()
+        except EOFError as e:
+            raise StopAsyncIteration from e
+
+    async def read_frame(self) -> bytes:
+        """Reads the next JPEG frame from the stream.
+
+        Raises:
+            EOFError: if the stream ends before another complete frame
+        """
+        while (frame := self._next_frame_in_buffer()) is None:
+            # Drop the data that has been parsed before reading more
+            del self._buffer[: self._start]
+            self._start = 0
+            chunk = await self._content.read(self._chunk_size)
+            if not chunk:
+                raise EOFError("MJPEG stream ended")
+            self._buffer += chunk
+        return frame
+
+    def _next_frame_in_buffer(self) -> bytes | None:
+        buffer = self._buffer
+        headers_end = buffer.find(HEADERS_END, self._start)
+        if headers_end == -1:
+            return None
+        body_start = headers_end + len(HEADERS_END)
+
+        content_length = self._get_content_length(self._start, headers_end)
+        if content_length is not None:
+            body_end = body_start + content_length
+            if len(buffer) < body_end:
+                return None
+        elif self._delimiter:
+            body_end = buffer.find(self._delimiter, body_start)
+            if body_end == -1:
+                return None
+            # The line break before the delimiter belongs to the delimiter
+            if buffer.endswith(b"\r\n", body_start, body_end):
+                body_end -= 2
+        else:
+            body_start = buffer.find(JPEG_START_BYTES, body_start)
+            stop = buffer.find(JPEG_STOP_BYTES, body_start)
+            if body_start == -1 or stop == -1:
+                return None
+            body_end = stop + len(JPEG_STOP_BYTES)
+
+        with memoryview(buffer) as view:
+            frame = bytes(view[body_start:body_end])
+        self._start = body_end
+        return frame
+
+    def _get_content_length(self, start: int, end: int) -> int | None:
+        """Gets the Content-Length from the part headers, which come after the
+        delimiter line, in the given part of the buffer"""
+        with memoryview(self._buffer) as view:
+            headers = bytes(view[start:end])
+        for line in headers.split(b"\r\n"):
+            name, _, value = line.partition(b":")
+            if name.strip().lower() == b"content-length":
+                return int(value)
+        return None
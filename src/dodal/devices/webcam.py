@@ -1,14 +1,21 @@
 from collections.abc import ByteString
 from io import BytesIO
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import aiofiles
-from aiohttp import ClientSession
 from bluesky.protocols import Triggerable
 from ophyd_async.core import AsyncStatus, HintedSignal, StandardReadable, soft_signal_rw
-from PIL import Image
 
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
+
+if TYPE_CHECKING:
+    import aiohttp
+    from PIL import Image
+else:
+    aiohttp = lazy_import("aiohttp")
+    Image = lazy_import("PIL.Image")
 
 PLACEHOLDER_IMAGE_SIZE = (1024, 768)
 IMAGE_FORMAT = "png"
@@ -35,7 +42,7 @@ class Webcam(StandardReadable, Triggerable):
             await file.write(image)
 
     async def _get_and_write_image(self, file_path: str):
-        async with ClientSession() as session:
+        async with aiohttp.ClientSession() as session:
             async with session.get(self.url) as response:
                 if not response.ok:
                     LOGGER.warning(
@@ -0,0 +1,126 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# Differences in any field of a crystal larger than this are reported
+DIFFERENCE_TOLERANCE = 1e-5
+# Crystals whose bounding boxes do not overlap are still matched if their centres of
+# mass are this close, in grid boxes
+MAX_MATCH_DISTANCE = 1.0
+
+
+@dataclass
+class FieldDifference:
+    """How much a field differs between the matched crystals of two sets of results"""
+
+    max_difference: float
+    crystals_differing: int
+
+
+@dataclass
+class XrcResultsComparison:
+    """A summary of the differences between two sets of x-ray centring results"""
+
+    first_source: str
+    second_source: str
+    matched: int
+    unmatched_first: int
+    unmatched_second: int
+    field_differences: dict[str, FieldDifference] = field(default_factory=dict)
+
+    @property
+    def identical(self) -> bool:
+        return not (
+            self.unmatched_first or self.unmatched_second or self.field_differences
+        )
+
+    def __str__(self) -> str:
+        summary = (
+            f"Zocalo results from {self.first_source} and {self.second_source} are "
+            f"not identical: {self.matched} crystals matched, "
+            f"{self.unmatched_first} from {self.first_source} and "
+            f"{self.unmatched_second} from {self.second_source} unmatched"
+        )
+        if self.field_differences:
+            differences = ", ".join(
+                f"{name}={difference.max_difference:g} "
+                f"({difference.crystals_differing} crystals)"
+                for name, difference in self.field_differences.items()
+            )
+            summary += f". Largest differences: {differences}"
+        return summary
+
+
+def _bounding_boxes_overlap(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    """Returns a matrix of whether each bounding box in first overlaps each in second"""
+    first_box = first["bounding_box"][:, np.newaxis]
+    second_box = second["bounding_box"][np.newaxis, :]
+    return np.all(
+        (first_box[..., 0, :] < second_box[..., 1, :])
+        & (second_box[..., 0, :] < first_box[..., 1, :]),
+        axis=-1,
+    )
+
+
+def match_crystals(
+    first: np.ndarray, second: np.ndarray, max_distance: float = MAX_MATCH_DISTANCE
+) -> tuple[np.ndarray, np.ndarray]:
+    """Pairs up the crystals found in two structured arrays of x-ray centring results.
+
+    Crystals can be paired if their bounding boxes overlap or their centres of mass are
+    within max_distance. The closest possible pairs are made first and each crystal is
+    in at most one pair.
+
+    Returns:
+        The indices into first and into second of each pair
+    """
+    distances = np.linalg.norm(
+        first["centre_of_mass"][:, np.newaxis] - second["centre_of_mass"][np.newaxis],
+        axis=-1,
+    )
+    can_match = _bounding_boxes_overlap(first, second) | (distances <= max_distance)
+    first_indices, second_indices = np.nonzero(can_match)
+    order = np.argsort(distances[first_indices, second_indices], kind="stable")
+
+    first_matched = np.zeros(len(first), dtype=bool)
+    second_matched = np.zeros(len(second), dtype=bool)
+    pairs = []
+    for i, j in zip(first_indices[order], second_indices[order], strict=True):
+        if not (first_matched[i] or second_matched[j]):
+            first_matched[i] = second_matched[j] = True
+            pairs.append((i, j))
+    matched = np.array(pairs, dtype=np.intp).reshape(-1, 2)
+    return matched[:, 0], matched[:, 1]
+
+
+def compare_xrc_results(
+    first: np.ndarray,
+    first_source: str,
+    second: np.ndarray,
+    second_source: str,
+    tolerance: float = DIFFERENCE_TOLERANCE,
+) -> XrcResultsComparison:
+    """Compares every crystal in two structured arrays of x-ray centring results, see
+    dodal.devices.zocalo.zocalo_results.xrc_results_to_array, matching crystals
+    between them with match_crystals."""
+    first_indices, second_indices = match_crystals(first, second)
+    comparison = XrcResultsComparison(
+        first_source,
+        second_source,
+        matched=len(first_indices),
+        unmatched_first=len(first) - len(first_indices),
+        unmatched_second=len(second) - len(second_indices),
+    )
+    for name in first.dtype.names:
+        differences = np.abs(
+            first[name][first_indices].astype(np.float64) - second[name][second_indices]
+        )
+        # Reduce over every axis but the crystal
+        differing = np.any(
+            differences > tolerance, axis=tuple(range(1, differences.ndim))
+        )
+        if differing.any():
+            comparison.field_differences[name] = FieldDifference(
+                float(differences.max()), int(np.count_nonzero(differing))
+            )
+    return comparison
@@ -2,24 +2,62 @@ import dataclasses
 import getpass
 import os
 import socket
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING
 
-import zocalo.configuration
 from workflows.transport import lookup
+from workflows.transport.common_transport import CommonTransport
 
 from dodal.devices.zocalo.zocalo_constants import ZOCALO_ENV
 from dodal.log import LOGGER
+from dodal.utils import lazy_import
 
+if TYPE_CHECKING:
+    import zocalo.configuration as zocalo_configuration
+else:
+    zocalo_configuration = lazy_import("zocalo.configuration")
 
-def _get_zocalo_connection(environment):
-    zc = zocalo.configuration.from_file()
-    zc.activate_environment(environment)
+
+@cache
+def _get_zocalo_configuration() -> "zocalo_configuration.Configuration":
+    """The zocalo configuration file only needs to be read once per process"""
+    return zocalo_configuration.from_file()
+
+
+def _get_zocalo_connection(environment: str) -> CommonTransport:
+    zc = _get_zocalo_configuration()
+    # Activating sets up the transports for the environment, which only needs doing
+    # again if another environment has been activated since
+    if zc.active_environments[-1:] != (environment,):
+        zc.activate_environment(environment)
 
     transport = lookup("PikaTransport")()
     transport.connect()
     return transport
 
 
+# Connections to zocalo, by environment, which are kept open for the life of the process
+_shared_connections: dict[str, CommonTransport] = {}
+_shared_connections_lock = threading.Lock()
+
+
+def _get_shared_zocalo_connection(environment: str) -> CommonTransport:
+    """Gets the connection to the given zocalo environment which is shared by
+    everything in this process, connecting if there is no connection yet or if it has
+    been lost. The connection must not be disconnected by the caller."""
+    with _shared_connections_lock:
+        transport = _shared_connections.get(environment)
+        if transport is None or not transport.is_connected():
+            if transport is not None:
+                LOGGER.warning(f"Lost connection to zocalo {environment}, reconnecting")
+            transport = _get_zocalo_connection(environment)
+            _shared_connections[environment] = transport
+        return transport
+
+
 @dataclass
 class ZocaloStartInfo:
     """
@@ -55,27 +93,46 @@ class ZocaloTrigger:
     intended to be used in bluesky callback classes. To get results from zocalo back
     into a plan, use the ZocaloResults ophyd device.
 
+    Messages are sent over a connection which is kept open. By default each message
+    has been sent when the method returns and failures to send are raised. If
+    send_in_background is True the methods instead return straight away, the messages
+    are sent in order by a background thread and failures to send are only logged.
+
     see https://github.com/DiamondLightSource/dodal/wiki/How-to-Interact-with-Zocalo"""
 
-    def __init__(self, environment: str = ZOCALO_ENV):
+    def __init__(self, environment: str = ZOCALO_ENV, send_in_background: bool = False):
         self.zocalo_environment: str = environment
+        self.send_in_background = send_in_background
+        # Background messages are sent one at a time, in order
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="zocalo_trigger"
+        )
 
     def _send_to_zocalo(self, parameters: dict):
-        transport = _get_zocalo_connection(self.zocalo_environment)
-
-        try:
-            message = {
-                "recipes": ["mimas"],
-                "parameters": parameters,
-            }
-            user, hostname = _get_zocalo_headers()
-            header = {
-                "zocalo.go.user": user,
-                "zocalo.go.host": hostname,
-            }
+        message = {
+            "recipes": ["mimas"],
+            "parameters": parameters,
+        }
+        user, hostname = _get_zocalo_headers()
+        header = {
+            "zocalo.go.user": user,
+            "zocalo.go.host": hostname,
+        }
+
+        def send():
+            transport = _get_shared_zocalo_connection(self.zocalo_environment)
             transport.send("processing_recipe", message, headers=header)
-        finally:
-            transport.disconnect()
+
+        def log_failure(sent: Future[None]):
+            if exception := sent.exception():
+                LOGGER.error(
+                    f"Failed to send {parameters} to zocalo", exc_info=exception
+                )
+
+        if self.send_in_background:
+            self._executor.submit(send).add_done_callback(log_failure)
+        else:
+            send()
 
     def run_start(
         self,
@@ -99,7 +156,6 @@ class ZocaloTrigger:
         Args:
             data_collection_id (int): The ID of the data collection representing the
                                     gridscan in ISPyB
-
         """
         LOGGER.info(f"Ending Zocalo job with ispyb id {data_collection_id}")
         self._send_to_zocalo(
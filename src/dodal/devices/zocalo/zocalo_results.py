@@ -2,7 +2,6 @@ import asyncio
 from collections.abc import Generator, Sequence
 from enum import Enum
 from inspect import get_annotations
-from queue import Empty, Queue
 from typing import Any, TypedDict
 
 import bluesky.plan_stubs as bps
@@ -11,7 +10,6 @@ import workflows.recipe
 import workflows.transport
 from bluesky.protocols import Triggerable
 from bluesky.utils import Msg
-from deepdiff import DeepDiff
 from numpy.typing import NDArray
 from ophyd_async.core import (
     AsyncStatus,
@@ -21,8 +19,9 @@ from ophyd_async.core import (
 )
 from workflows.transport.common_transport import CommonTransport
 
+from dodal.devices.zocalo.xrc_result_comparison import compare_xrc_results
 from dodal.devices.zocalo.zocalo_constants import ZOCALO_ENV
-from dodal.devices.zocalo.zocalo_interaction import _get_zocalo_connection
+from dodal.devices.zocalo.zocalo_interaction import _get_shared_zocalo_connection
 from dodal.log import LOGGER
 
 
@@ -61,6 +60,34 @@ class XrcResult(TypedDict):
     bounding_box: list[list[int]]
 
 
+# The results for each crystal are held in one structured array, rather than an array
+# per field, so that they can be built and sorted together
+XRC_RESULT_DTYPE = np.dtype(
+    [
+        ("centre_of_mass", np.float64, (3,)),
+        ("max_voxel", np.int64, (3,)),
+        ("max_count", np.int64),
+        ("n_voxels", np.int64),
+        ("total_count", np.int64),
+        ("bounding_box", np.int64, (2, 3)),
+    ]
+)
+
+
+def xrc_results_to_array(results: Sequence[XrcResult]) -> np.ndarray:
+    """Converts XrcResults into a structured array with a record per crystal"""
+    return np.array(
+        [tuple(r[field] for field in XRC_RESULT_DTYPE.names) for r in results],  # type: ignore
+        dtype=XRC_RESULT_DTYPE,
+    )
+
+
+def sort_xrc_results(results: np.ndarray, sort_key: SortKeys) -> np.ndarray:
+    """Sorts a structured array of results from strongest to weakest by the sort key,
+    keeping crystals of equal strength in the order they were found"""
+    return results[np.argsort(-results[sort_key.value], kind="stable")]
+
+
 def bbox_size(result: XrcResult):
     return [
         abs(result["bounding_box"][1][i] - result["bounding_box"][0][i])
@@ -68,16 +95,33 @@ def bbox_size(result: XrcResult):
     ]
 
 
-def get_dict_differences(
-    dict1: dict, dict1_source: str, dict2: dict, dict2_source: str
-) -> str | None:
-    """Returns a string containing dict1 and dict2 if there are differences between them, greater than a
-    1e-5 tolerance. If dictionaries are identical, return None"""
+def _log_differences(
+    first_source: ZocaloSource,
+    first_results: dict,
+    second_source: ZocaloSource,
+    second_results: dict,
+):
+    """Warns if the crystals found by two sources are not the same"""
+    try:
+        comparison = compare_xrc_results(
+            xrc_results_to_array(first_results["results"]),
+            first_source.value,
+            xrc_results_to_array(second_results["results"]),
+            second_source.value,
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        LOGGER.warning(
+            f"Could not compare zocalo results from {first_source.value} and {second_source.value}: {e!r}"
+        )
+        return
+    if not comparison.identical:
+        LOGGER.warning(str(comparison))
 
-    diff = DeepDiff(dict1, dict2, math_epsilon=1e-5, ignore_numeric_type_changes=True)
 
-    if diff:
-        return f"Zocalo results from {dict1_source} and {dict2_source} are not identical.\n Results from {dict1_source}: {dict1}\n Results from {dict2_source}: {dict2}"
+def _collection_ids(results: dict) -> tuple:
+    """The data collection and data collection group ids that results are for"""
+    recipe_parameters = results["recipe_parameters"]
+    return recipe_parameters.get("dcid"), recipe_parameters.get("dcgid")
 
 
 def source_from_results(results):
@@ -128,8 +172,13 @@ class ZocaloResults(StandardReadable, Triggerable):
         self.channel = channel
         self.timeout_s = timeout_s
         self._prefix = prefix
-        self._raw_results_received: Queue = Queue()
+        self._raw_results_received = self._new_results_queues()
+        self._loop: asyncio.AbstractEventLoop | None = None
         self.transport: CommonTransport | None = None
+        self._subscription: int | None = None
+        self._gpu_comparison: asyncio.Task | None = None
+        # The ids of CPU results used before their GPU results arrived
+        self._unmatched_cpu_ids: set[tuple] = set()
         self.use_cpu_and_gpu = use_cpu_and_gpu
 
         self.centre_of_mass, self._com_setter = soft_signal_r_and_setter(
@@ -171,20 +220,34 @@ class ZocaloResults(StandardReadable, Triggerable):
         )
         super().__init__(name)
 
-    async def _put_results(self, results: Sequence[XrcResult], recipe_parameters):
-        centres_of_mass = np.array([r["centre_of_mass"] for r in results])
-        self._com_setter(centres_of_mass)
-        self._bounding_box_setter(np.array([r["bounding_box"] for r in results]))
-        self._max_voxel_setter(np.array([r["max_voxel"] for r in results]))
-        self._max_count_setter(np.array([r["max_count"] for r in results]))
-        self._n_voxels_setter(np.array([r["n_voxels"] for r in results]))
-        self._total_count_setter(np.array([r["total_count"] for r in results]))
+    async def _put_results(
+        self, results: np.ndarray | Sequence[XrcResult], recipe_parameters
+    ):
+        if not isinstance(results, np.ndarray):
+            results = xrc_results_to_array(results)
+        self._com_setter(results["centre_of_mass"])
+        self._bounding_box_setter(results["bounding_box"])
+        self._max_voxel_setter(results["max_voxel"])
+        self._max_count_setter(results["max_count"])
+        self._n_voxels_setter(results["n_voxels"])
+        self._total_count_setter(results["total_count"])
         self._ispyb_dcid_setter(recipe_parameters["dcid"])
         self._ispyb_dcgid_setter(recipe_parameters["dcgid"])
 
+    @staticmethod
+    def _new_results_queues() -> dict[ZocaloSource, asyncio.Queue[dict]]:
+        return {source: asyncio.Queue() for source in ZocaloSource}
+
     def _clear_old_results(self):
         LOGGER.info("Clearing queue")
-        self._raw_results_received = Queue()
+        self._raw_results_received = self._new_results_queues()
+        self._unmatched_cpu_ids.clear()
+
+    def _put_raw_results(self, raw_results: dict):
+        """Adds results to the queue for their source, must be called in the event
+        loop that the device was staged in"""
+        source = ZocaloSource(source_from_results(raw_results))
+        self._raw_results_received[source].put_nowait(raw_results)
 
     @AsyncStatus.wrap
     async def stage(self):
@@ -194,6 +257,8 @@ class ZocaloResults(StandardReadable, Triggerable):
         before triggering processing for the experiment"""
 
         LOGGER.info("Subscribing to results queue")
+        await self._cancel_gpu_comparison()
+        self._loop = asyncio.get_running_loop()
         try:
             self._subscribe_to_results()
         except Exception as e:
@@ -205,10 +270,13 @@ class ZocaloResults(StandardReadable, Triggerable):
 
     @AsyncStatus.wrap
     async def unstage(self):
-        LOGGER.info("Disconnecting from Zocalo")
-        if self.transport:
-            self.transport.disconnect()
+        LOGGER.info("Unsubscribing from Zocalo")
+        await self._cancel_gpu_comparison()
+        # The connection is shared so is left open for others to use
+        if self.transport and self._subscription is not None:
+            self.transport.unsubscribe(self._subscription)
         self.transport = None
+        self._subscription = None
 
     @AsyncStatus.wrap
     async def trigger(self):
@@ -225,76 +293,31 @@ class ZocaloResults(StandardReadable, Triggerable):
             )
             raise NoZocaloSubscription(msg)
 
+        # A comparison still waiting from the last trigger must not take these results
+        await self._cancel_gpu_comparison()
         try:
             LOGGER.info(
-                f"waiting for results in queue - currently {self._raw_results_received.qsize()} items"
+                "waiting for results in queue - currently "
+                f"{sum(q.qsize() for q in self._raw_results_received.values())} items"
             )
-
-            raw_results = self._raw_results_received.get(timeout=self.timeout_s)
-            source_of_first_results = source_from_results(raw_results)
-
-            # Wait for results from CPU and GPU, warn and continue if only GPU times out. Error if CPU times out
             if self.use_cpu_and_gpu:
-                if source_of_first_results == ZocaloSource.CPU:
-                    LOGGER.warning("Received zocalo results from CPU before GPU")
-                raw_results_two_sources = [raw_results]
-                try:
-                    raw_results_two_sources.append(
-                        self._raw_results_received.get(timeout=self.timeout_s / 2)
-                    )
-                    source_of_second_results = source_from_results(
-                        raw_results_two_sources[1]
-                    )
-                    first_results = raw_results_two_sources[0]["results"]
-                    second_results = raw_results_two_sources[1]["results"]
-
-                    if first_results and second_results:
-                        # Compare results from both sources and warn if they aren't the same
-                        differences_str = get_dict_differences(
-                            first_results[0],
-                            source_of_first_results,
-                            second_results[0],
-                            source_of_second_results,
-                        )
-                        if differences_str:
-                            LOGGER.warning(differences_str)
-
-                    # Always use CPU results
-                    raw_results = (
-                        raw_results_two_sources[0]
-                        if source_of_first_results == ZocaloSource.CPU
-                        else raw_results_two_sources[1]
-                    )
-
-                except Empty as err:
-                    source_of_missing_results = (
-                        ZocaloSource.CPU.value
-                        if source_of_first_results == ZocaloSource.GPU.value
-                        else ZocaloSource.GPU.value
-                    )
-                    if source_of_missing_results == ZocaloSource.GPU.value:
-                        LOGGER.warning(
-                            f"Zocalo results from {source_of_missing_results} timed out. Using results from {source_of_first_results}"
-                        )
-                    else:
-                        LOGGER.error(
-                            f"Zocalo results from {source_of_missing_results} timed out and GPU results not yet reliable"
-                        )
-                        raise err
+                raw_results = await self._get_cpu_results_compared_with_gpu()
+            else:
+                raw_results = await asyncio.wait_for(
+                    self._raw_results_received[ZocaloSource.CPU].get(), self.timeout_s
+                )
 
             LOGGER.info(
                 f"Zocalo results from {ZocaloSource.CPU.value} processing: found {len(raw_results['results'])} crystals."
             )
             # Sort from strongest to weakest in case of multiple crystals
             await self._put_results(
-                sorted(
-                    raw_results["results"],
-                    key=lambda d: d[self.sort_key.value],
-                    reverse=True,
+                sort_xrc_results(
+                    xrc_results_to_array(raw_results["results"]), self.sort_key
                 ),
                 raw_results["recipe_parameters"],
             )
-        except Empty as timeout_exception:
+        except asyncio.TimeoutError as timeout_exception:
             LOGGER.warning("Timed out waiting for zocalo results!")
             raise NoResultsFromZocalo(
                 "Timed out waiting for Zocalo results"
@@ -302,8 +325,89 @@ class ZocaloResults(StandardReadable, Triggerable):
         finally:
             self._kickoff_run = False
 
+    async def _get_cpu_results_compared_with_gpu(self) -> dict:
+        """Waits for results from the CPU and GPU at the same time and returns the CPU
+        results as soon as they arrive, errors if the CPU times out. If the GPU results
+        are first the CPU has a further timeout_s / 2 to arrive. If the CPU results are
+        first they are compared with the GPU results in the background, so that they
+        can be used without waiting for the GPU.
+
+        Returns:
+            The results from the CPU
+        """
+        cpu = asyncio.ensure_future(self._raw_results_received[ZocaloSource.CPU].get())
+        gpu = asyncio.ensure_future(self._get_gpu_results())
+        try:
+            first, _ = await asyncio.wait(
+                [cpu, gpu], timeout=self.timeout_s, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not first:
+                raise asyncio.TimeoutError()
+            if not gpu.done():
+                LOGGER.warning("Received zocalo results from CPU before GPU")
+                cpu_ids = _collection_ids(cpu.result())
+                # Until they are compared, GPU results for this collection are late
+                # for any later trigger
+                self._unmatched_cpu_ids.add(cpu_ids)
+                self._gpu_comparison = asyncio.create_task(
+                    self._compare_with_gpu_results(cpu.result(), cpu_ids)
+                )
+                return cpu.result()
+            # The GPU results came first, so the CPU results may still be on their way
+            await asyncio.wait([cpu], timeout=self.timeout_s / 2)
+            if not cpu.done():
+                LOGGER.error(
+                    f"Zocalo results from {ZocaloSource.CPU.value} timed out and GPU results not yet reliable"
+                )
+                raise asyncio.TimeoutError()
+            _log_differences(
+                ZocaloSource.GPU, gpu.result(), ZocaloSource.CPU, cpu.result()
+            )
+            return cpu.result()
+        finally:
+            cpu.cancel()
+            gpu.cancel()
+            await asyncio.gather(cpu, gpu, return_exceptions=True)
+
+    async def _get_gpu_results(self, cpu_ids: tuple | None = None) -> dict:
+        """Gets the next GPU results, discarding any that arrived too late to be
+        compared in an earlier trigger. If the ids of the CPU results are given only
+        the GPU results for the same collection are returned"""
+        while True:
+            gpu_results = await self._raw_results_received[ZocaloSource.GPU].get()
+            ids = _collection_ids(gpu_results)
+            is_late = ids in self._unmatched_cpu_ids
+            self._unmatched_cpu_ids.discard(ids)
+            if ids == cpu_ids or (cpu_ids is None and not is_late):
+                return gpu_results
+            LOGGER.info(
+                f"Discarding late zocalo results from {ZocaloSource.GPU.value} for {ids}"
+            )
+
+    async def _compare_with_gpu_results(self, cpu_results: dict, cpu_ids: tuple):
+        try:
+            gpu_results = await asyncio.wait_for(
+                self._get_gpu_results(cpu_ids), self.timeout_s / 2
+            )
+        except asyncio.TimeoutError:
+            LOGGER.warning(
+                f"Zocalo results from {ZocaloSource.GPU.value} timed out. Using results from {ZocaloSource.CPU.value}"
+            )
+            return
+        _log_differences(ZocaloSource.CPU, cpu_results, ZocaloSource.GPU, gpu_results)
+
+    async def _cancel_gpu_comparison(self):
+        """Stops any comparison still waiting for GPU results, so that it never outlives
+        the trigger it was started by or the device being staged"""
+        comparison, self._gpu_comparison = self._gpu_comparison, None
+        if comparison:
+            comparison.cancel()
+            await asyncio.gather(comparison, return_exceptions=True)
+
     def _subscribe_to_results(self):
-        self.transport = _get_zocalo_connection(self.zocalo_environment)
+        self.transport = transport = _get_shared_zocalo_connection(
+            self.zocalo_environment
+        )
 
         def _receive_result(
             rw: workflows.recipe.RecipeWrapper, header: dict, message: dict
@@ -311,30 +415,29 @@ class ZocaloResults(StandardReadable, Triggerable):
             LOGGER.info(f"Received {message}")
             recipe_parameters = rw.recipe_step["parameters"]  # type: ignore # this rw is initialised with a message so recipe step is not None
             LOGGER.info(f"Recipe step parameters: {recipe_parameters}")
-            self.transport.ack(header)  # type: ignore # we create transport here
+            transport.ack(header)
 
             results = message.get("results", [])
 
-            if self.use_cpu_and_gpu:
-                self._raw_results_received.put(
-                    {"results": results, "recipe_parameters": recipe_parameters}
+            # Only add to queue if results are from CPU, unless comparing with GPU
+            if self.use_cpu_and_gpu or not recipe_parameters.get("gpu"):
+                assert self._loop, "Results received before device was staged"
+                # This is called from the transport's thread, so hand the results
+                # over to the event loop rather than touching the queues here
+                self._loop.call_soon_threadsafe(
+                    self._put_raw_results,
+                    {"results": results, "recipe_parameters": recipe_parameters},
                 )
-            else:
-                # Only add to queue if results are from CPU
-                if not recipe_parameters.get("gpu"):
-                    self._raw_results_received.put(
-                        {"results": results, "recipe_parameters": recipe_parameters}
-                    )
-
-        subscription = workflows.recipe.wrap_subscribe(
-            self.transport,
+
+        self._subscription = workflows.recipe.wrap_subscribe(
+            transport,
             self.channel,
             _receive_result,
             acknowledgement=True,
             allow_non_recipe_messages=False,
         )
         LOGGER.info(
-            f"Made zocalo queue subscription: {subscription} - stored transport connection {self.transport}."
+            f"Made zocalo queue subscription: {self._subscription} - stored transport connection {self.transport}."
         )
 
 
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
+import copy
 import logging
+import os
 from collections import deque
 from logging import Logger, StreamHandler
-from logging.handlers import TimedRotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
 from os import environ
 from pathlib import Path
-from typing import TypedDict
+from queue import Full, Queue
+from typing import Any, NamedTuple, TypedDict
 
 import colorlog
 from bluesky.log import logger as bluesky_logger
@@ -19,9 +22,11 @@ ophyd_async_logger = logging.getLogger("ophyd_async")
 LOGGER.setLevel(logging.DEBUG)
 
 ERROR_LOG_BUFFER_LINES = 20000
+ERROR_LOG_BUFFER_BYTES = 50 * 1024 * 1024
 INFO_LOG_DAYS = 30
 DEBUG_LOG_FILES_TO_KEEP = 7
 DEFAULT_GRAYLOG_PORT = 12231
+LOG_QUEUE_SIZE = 10000
 
 # Temporarily duplicated https://github.com/bluesky/ophyd-async/issues/550
 DEFAULT_FORMAT = (
@@ -53,37 +58,149 @@ DEFAULT_FORMATTER = ColoredFormatterWithDeviceName(
 )
 
 
+# Attributes every LogRecord has, anything else on a record was added as an extra
+_STANDARD_RECORD_ATTRIBUTES = frozenset(
+    logging.makeLogRecord({}).__dict__.keys() | {"message", "asctime"}
+)
+_EXCEPTION_FORMATTER = logging.Formatter()
+# Roughly the memory taken by a _CompactRecord besides its message and extras
+_COMPACT_RECORD_OVERHEAD_BYTES = 250
+
+
+class _CompactRecord(NamedTuple):
+    """The parts of a LogRecord needed to format it, with the message merged with its
+    arguments and any exception already formatted."""
+
+    name: str
+    levelno: int
+    pathname: str
+    lineno: int
+    funcName: str | None
+    msg: str
+    created: float
+    msecs: float
+    thread: int | None
+    threadName: str | None
+    process: int | None
+    exc_text: str | None
+    stack_info: str | None
+    extras: dict[str, Any] | None
+
+    @classmethod
+    def from_record(cls, record: logging.LogRecord) -> _CompactRecord:
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = _EXCEPTION_FORMATTER.formatException(record.exc_info)
+        extras = {
+            key: value
+            for key, value in record.__dict__.items()
+            if key not in _STANDARD_RECORD_ATTRIBUTES
+        }
+        return cls(
+            record.name,
+            record.levelno,
+            record.pathname,
+            record.lineno,
+            record.funcName,
+            record.getMessage(),
+            record.created,
+            record.msecs,
+            record.thread,
+            record.threadName,
+            record.process,
+            exc_text,
+            record.stack_info,
+            extras or None,
+        )
+
+    def to_record(self) -> logging.LogRecord:
+        record = logging.makeLogRecord(self.extras or {})
+        record.__dict__.update(
+            name=self.name,
+            levelno=self.levelno,
+            levelname=logging.getLevelName(self.levelno),
+            pathname=self.pathname,
+            filename=os.path.basename(self.pathname),
+            module=os.path.splitext(os.path.basename(self.pathname))[0],
+            lineno=self.lineno,
+            funcName=self.funcName,
+            msg=self.msg,
+            created=self.created,
+            msecs=self.msecs,
+            thread=self.thread,
+            threadName=self.threadName,
+            process=self.process,
+            exc_text=self.exc_text,
+            stack_info=self.stack_info,
+        )
+        return record
+
+    @property
+    def size_bytes(self) -> int:
+        """An estimate of the memory taken by the record"""
+        return (
+            _COMPACT_RECORD_OVERHEAD_BYTES
+            + len(self.msg)
+            + len(self.exc_text or "")
+            + len(self.stack_info or "")
+        )
+
+
 class CircularMemoryHandler(logging.Handler):
     """Loosely based on the MemoryHandler, which keeps a buffer and writes it when full
     or when there is a record of specific level. This instead keeps a circular buffer
     that always contains the last {capacity} number of messages, this is only flushed
     when a log of specific {flushLevel} comes in. On flush this buffer is then passed to
-    the {target} handler.
+    the {target} handler and emptied, so that each message is only written once.
+
+    To keep the buffer small, messages are stored merged with their arguments and
+    without the rest of the LogRecord, which is only recreated if the message is
+    flushed. If {max_bytes} is given the oldest messages are also dropped to keep the
+    buffer to roughly that size.
 
     The CircularMemoryHandler becomes the owner of the target handler which will be closed
     on close of this handler.
     """
 
-    def __init__(self, capacity, flushLevel=logging.ERROR, target=None):
+    def __init__(
+        self,
+        capacity,
+        flushLevel=logging.ERROR,
+        target=None,
+        max_bytes: int | None = None,
+    ):
         logging.Handler.__init__(self)
-        self.buffer: deque[logging.LogRecord] = deque(maxlen=capacity)
+        self.buffer: deque[_CompactRecord] = deque()
+        self.capacity = capacity
+        self.max_bytes = max_bytes
+        self.buffer_bytes = 0
         self.flushLevel = flushLevel
         self.target = target
 
     def emit(self, record):
-        self.buffer.append(record)
+        compact_record = _CompactRecord.from_record(record)
+        self.buffer.append(compact_record)
+        self.buffer_bytes += compact_record.size_bytes
+        while len(self.buffer) > self.capacity or (
+            self.max_bytes is not None
+            and self.buffer_bytes > self.max_bytes
+            and len(self.buffer) > 1
+        ):
+            self.buffer_bytes -= self.buffer.popleft().size_bytes
         if record.levelno >= self.flushLevel:
             self.flush()
 
     def flush(self):
         """
-        Pass the contents of the buffer forward to the target.
+        Pass the contents of the buffer forward to the target and empty it.
         """
         self.acquire()
         try:
             if self.target:
-                for record in self.buffer:
-                    self.target.handle(record)
+                for compact_record in self.buffer:
+                    self.target.handle(compact_record.to_record())
+                self.buffer.clear()
+                self.buffer_bytes = 0
         finally:
             self.release()
 
@@ -91,6 +208,7 @@ class CircularMemoryHandler(logging.Handler):
         self.acquire()
         try:
             self.buffer.clear()
+            self.buffer_bytes = 0
             if self.target:
                 self.target.acquire()
                 try:
@@ -103,6 +221,86 @@ class CircularMemoryHandler(logging.Handler):
             self.release()
 
 
+class _BlockingSentinelQueueListener(QueueListener):
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def enqueue_sentinel(self):
+        # The queue may be full when stopping, wait for the listener to make space
+        self.queue.put(self._sentinel)  # type: ignore
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Passes records to the {handlers} on a background thread, through a queue of
+    at most {queue_size} records, so that logging never waits for slow handlers such as
+    graylog or files. If the queue is full records are dropped rather than waiting, the
+    number dropped is kept in {dropped} and logged once the queue has space again.
+
+    The DroppingQueueHandler becomes the owner of the handlers which, once all the
+    queued records have been handled, will be closed on close of this handler.
+    """
+
+    def __init__(self, handlers: list[logging.Handler], queue_size: int):
+        super().__init__(Queue(maxsize=queue_size))
+        self.handlers = handlers
+        self.dropped = 0
+        self._dropped_since_logged = 0
+        self.listener = _BlockingSentinelQueueListener(
+            self.queue, *handlers, respect_handler_level=True
+        )
+        self.listener.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike the QueueHandler, leave the formatting to the handlers. The message is
+        # merged now as the arguments may have changed by the time it is handled.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if self._dropped_since_logged:
+                self.queue.put_nowait(self._dropped_record(record))
+                self._dropped_since_logged = 0
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+            self._dropped_since_logged += 1
+
+    def _dropped_record(self, record: logging.LogRecord) -> logging.LogRecord:
+        dropped = copy.copy(record)
+        dropped.levelno, dropped.levelname = logging.WARNING, "WARNING"
+        dropped.msg = (
+            f"Dropped {self._dropped_since_logged} log messages as the log queue was "
+            "full"
+        )
+        dropped.exc_info = dropped.exc_text = dropped.stack_info = None
+        return dropped
+
+    def flush(self):
+        """
+        Wait for the queued records to be handled then flush the handlers.
+        """
+        if self.listener.running:
+            self.queue.join()  # type: ignore
+        for handler in self.handlers:
+            handler.flush()
+
+    def close(self):
+        self.acquire()
+        try:
+            if self.listener.running:
+                self.listener.stop()
+            for handler in self.handlers:
+                handler.close()
+            self.handlers = []
+            logging.Handler.close(self)
+        finally:
+            self.release()
+
+
 class BeamlineFilter(logging.Filter):
     beamline: str | None = environ.get("BEAMLINE")
 
@@ -125,13 +323,17 @@ def set_beamline(beamline_name: str):
     beamline_filter.beamline = beamline_name
 
 
-class DodalLogHandlers(TypedDict):
+class _DefaultDodalLogHandlers(TypedDict):
     stream_handler: StreamHandler
     graylog_handler: GELFTCPHandler
     info_file_handler: TimedRotatingFileHandler
     debug_memory_handler: CircularMemoryHandler
 
 
+class DodalLogHandlers(_DefaultDodalLogHandlers, total=False):
+    queue_handler: DroppingQueueHandler
+
+
 def _add_handler(logger: logging.Logger, handler: logging.Handler):
     print(f"adding handler {handler} to logger {logger}, at level: {handler.level}")
     handler.setFormatter(DEFAULT_FORMATTER)
@@ -152,7 +354,7 @@ def set_up_graylog_handler(logger: Logger, host: str, port: int):
 def set_up_INFO_file_handler(logger, path: Path, filename: str):
     """Set up a file handler for the logger, at INFO level, which will keep 30 days
     of logs, rotating once per day. Creates the directory if necessary."""
-    print(f"Logging to INFO file handler {path/filename}")
+    print(f"Logging to INFO file handler {path / filename}")
     path.mkdir(parents=True, exist_ok=True)
     file_handler = TimedRotatingFileHandler(
         filename=path / filename, when="MIDNIGHT", backupCount=INFO_LOG_DAYS
@@ -163,13 +365,17 @@ def set_up_INFO_file_handler(logger, path: Path, filename: str):
 
 
 def set_up_DEBUG_memory_handler(
-    logger: Logger, path: Path, filename: str, capacity: int
+    logger: Logger,
+    path: Path,
+    filename: str,
+    capacity: int,
+    max_bytes: int | None = ERROR_LOG_BUFFER_BYTES,
 ):
-    """Set up a Memory handler which holds 200k lines, and writes them to an hourly
-    log file when it sees a message of severity ERROR. Creates the directory if
-    necessary"""
+    """Set up a Memory handler which holds capacity lines, using roughly at most
+    max_bytes of memory, and writes them to an hourly log file when it sees a message of
+    severity ERROR. Creates the directory if necessary"""
     debug_path = path / "debug"
-    print(f"Logging to DEBUG handler {debug_path/filename}")
+    print(f"Logging to DEBUG handler {debug_path / filename}")
     debug_path.mkdir(parents=True, exist_ok=True)
     file_handler = TimedRotatingFileHandler(
         filename=debug_path / filename, when="H", backupCount=DEBUG_LOG_FILES_TO_KEEP
@@ -180,6 +386,7 @@ def set_up_DEBUG_memory_handler(
         capacity=capacity,
         flushLevel=logging.ERROR,
         target=file_handler,
+        max_bytes=max_bytes,
     )
     memory_handler.setLevel(logging.DEBUG)
     memory_handler.addFilter(beamline_filter)
@@ -187,6 +394,18 @@ def set_up_DEBUG_memory_handler(
     return memory_handler
 
 
+def set_up_queue_handler(
+    logger: Logger, handlers: list[logging.Handler], queue_size: int
+):
+    """Move the handlers from the logger onto a background thread, fed by a
+    DroppingQueueHandler on the logger with a queue of queue_size records."""
+    for handler in handlers:
+        logger.removeHandler(handler)
+    queue_handler = DroppingQueueHandler(handlers, queue_size)
+    _add_handler(logger, queue_handler)
+    return queue_handler
+
+
 def set_up_stream_handler(logger: Logger):
     stream_handler = StreamHandler()
     stream_handler.setLevel(logging.INFO)
@@ -201,6 +420,8 @@ def set_up_all_logging_handlers(
     dev_mode: bool,
     error_log_buffer_lines: int,
     graylog_port: int | None = None,
+    use_queue: bool = False,
+    queue_size: int = LOG_QUEUE_SIZE,
 ) -> DodalLogHandlers:
     """Set up the default logging environment.
     Args:
@@ -213,6 +434,11 @@ def set_up_all_logging_handlers(
                                 buffer and write to file when encountering an error message.
         graylog_port:           The port to send graylog messages to, if None uses the
                                 default dodal port
+        use_queue:              If true, the handlers are run on a background thread so
+                                that logging does not wait for graylog or file writes,
+                                see DroppingQueueHandler. Defaults to False.
+        queue_size:             The number of records that can be waiting for the
+                                background thread before further records are dropped.
     Returns:
         A DodaLogHandlers TypedDict with the created handlers.
     """
@@ -227,6 +453,17 @@ def set_up_all_logging_handlers(
             logger, logging_path, filename, error_log_buffer_lines
         ),
     }
+    if use_queue:
+        handlers["queue_handler"] = set_up_queue_handler(
+            logger,
+            [
+                handlers["stream_handler"],
+                handlers["graylog_handler"],
+                handlers["info_file_handler"],
+                handlers["debug_memory_handler"],
+            ],
+            queue_size,
+        )
 
     return handlers
 
@@ -237,7 +474,9 @@ def integrate_bluesky_and_ophyd_logging(parent_logger: logging.Logger):
         logger.setLevel(logging.DEBUG)
 
 
-def do_default_logging_setup(dev_mode=False, graylog_port: int | None = None):
+def do_default_logging_setup(
+    dev_mode=False, graylog_port: int | None = None, use_queue: bool = False
+):
     set_up_all_logging_handlers(
         LOGGER,
         get_logging_file_path(),
@@ -245,6 +484,7 @@ def do_default_logging_setup(dev_mode=False, graylog_port: int | None = None):
         dev_mode,
         ERROR_LOG_BUFFER_LINES,
         graylog_port,
+        use_queue,
     )
     integrate_bluesky_and_ophyd_logging(LOGGER)
 
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+
+import bluesky.plan_stubs as bps
+import numpy as np
+import numpy.typing as npt
+from bluesky.utils import MsgGenerator
+
+from dodal.common.crystal_metadata import ENERGY_WAVELENGTH_CONVERSION_CONSTANT
+from dodal.devices.detector.det_dist_to_beam_converter import (
+    Axis,
+    DetectorDistanceToBeamXYConverter,
+)
+from dodal.devices.undulator_dcm import UndulatorDCM
+from dodal.devices.util.lookup_tables import (
+    get_lookup_table,
+    linear_interpolation_lut_array,
+)
+
+
+@dataclass(frozen=True)
+class EnergyScanSetpoints:
+    """The positions to move to at each point of an energy scan, one array element
+    per point"""
+
+    energies_kev: np.ndarray
+    undulator_gaps_mm: np.ndarray
+    bragg_angles_deg: np.ndarray
+    dcm_pitches_mrad: np.ndarray
+    dcm_rolls_mrad: np.ndarray
+    beam_x_mm: np.ndarray | None = None
+    beam_y_mm: np.ndarray | None = None
+
+
+def energies_to_bragg_angles(
+    energies_kev: npt.ArrayLike, d_spacing_angstrom: float
+) -> np.ndarray:
+    """Converts beam energies to the Bragg angles of a crystal with the given d-spacing,
+    using Bragg's law with n=1"""
+    wavelengths_angstrom = ENERGY_WAVELENGTH_CONVERSION_CONSTANT / np.asarray(
+        energies_kev, dtype=float
+    )
+    return np.degrees(np.arcsin(wavelengths_angstrom / (2 * d_spacing_angstrom)))
+
+
+def calculate_energy_scan_setpoints(
+    undulator_dcm: UndulatorDCM,
+    energies_kev: npt.ArrayLike,
+    beam_xy_converter: DetectorDistanceToBeamXYConverter | None = None,
+    detector_distances_mm: npt.ArrayLike | None = None,
+) -> MsgGenerator[EnergyScanSetpoints]:
+    """Calculates the undulator gap, DCM pitch and roll and, if a beam converter and
+    detector distances are given, the beam centre for every point of an energy scan
+    before the scan starts, rather than looking each up as the scan moves.
+
+    The Bragg angles use the d-spacing readback of the DCM crystal, which is in
+    angstrom.
+
+    Args:
+        undulator_dcm: The undulator and DCM, whose lookup tables are used
+        energies_kev: The energy of each point of the scan
+        beam_xy_converter: Converts detector distances to the beam centre
+        detector_distances_mm: The detector distance for each point of the scan, or
+            one distance for the whole scan
+
+    Returns:
+        The setpoints for every point of the scan, in the order of energies_kev
+    """
+    energies_kev = np.asarray(energies_kev, dtype=float)
+    d_spacing_angstrom = yield from bps.rd(undulator_dcm.dcm.crystal_metadata_d_spacing)
+    bragg_angles_deg = energies_to_bragg_angles(energies_kev, d_spacing_angstrom)
+    gap_table = get_lookup_table(undulator_dcm.undulator.id_gap_lookup_table_path)
+    pitch_lut = linear_interpolation_lut_array(undulator_dcm.pitch_energy_table_path)
+    roll_lut = linear_interpolation_lut_array(undulator_dcm.roll_energy_table_path)
+
+    beam_x_mm = beam_y_mm = None
+    if beam_xy_converter is not None and detector_distances_mm is not None:
+        distances_mm = np.broadcast_to(detector_distances_mm, energies_kev.shape)
+        beam_x_mm = beam_xy_converter.get_beam_xy_from_det_dists(
+            distances_mm, Axis.X_AXIS
+        )
+        beam_y_mm = beam_xy_converter.get_beam_xy_from_det_dists(
+            distances_mm, Axis.Y_AXIS
+        )
+
+    return EnergyScanSetpoints(
+        energies_kev=energies_kev,
+        undulator_gaps_mm=np.asarray(gap_table.nearest(energies_kev * 1000)),
+        bragg_angles_deg=bragg_angles_deg,
+        dcm_pitches_mrad=pitch_lut(bragg_angles_deg),
+        dcm_rolls_mrad=roll_lut(bragg_angles_deg),
+        beam_x_mm=beam_x_mm,
+        beam_y_mm=beam_y_mm,
+    )
@@ -1,10 +1,15 @@
 import importlib
+import importlib.util
 import inspect
 import os
 import re
 import socket
 import string
+import sys
+import threading
+import time
 from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from functools import wraps
 from importlib import import_module
@@ -16,6 +21,7 @@ from typing import (
     Protocol,
     TypeGuard,
     TypeVar,
+    cast,
     runtime_checkable,
 )
 
@@ -133,9 +139,11 @@ def make_device(
         module = import_module(module)
 
     device_collector = {}
-    factories = collect_factories(module)
+    index = get_factory_index(module)
+    factories = _select_factories(index)
+    dependencies = _select_dependencies(index, factories)
     device_collector[device_name] = _make_one_device(
-        module, device_name, device_collector, factories, **kwargs
+        module, device_name, device_collector, factories, dependencies, **kwargs
     )
     return device_collector
 
@@ -160,9 +168,10 @@ def make_all_devices(
     """
     if isinstance(module, str) or module is None:
         module = import_module(module or __name__)
-    factories = collect_factories(module, include_skipped)
-    devices: tuple[dict[str, AnyDevice], dict[str, Exception]] = invoke_factories(
-        factories, **kwargs
+    index = get_factory_index(module)
+    factories = _select_factories(index, include_skipped)
+    devices: tuple[dict[str, AnyDevice], dict[str, Exception]] = _invoke_factories(
+        factories, _select_dependencies(index, factories), **kwargs
     )
 
     return devices
@@ -174,7 +183,9 @@ def invoke_factories(
 ) -> tuple[dict[str, AnyDevice], dict[str, Exception]]:
     """Call device factory functions in the correct order to resolve dependencies.
     Inspect function signatures to work out dependencies and execute functions in
-    correct order.
+    correct order. Factories are run in a thread pool as soon as all of their
+    dependencies have been made, so independent devices are created (and connected,
+    if the factories do so) concurrently.
 
     If one device takes another as an argument (by name, similar to pytest fixtures)
     this will detect a dependency and create and cache the non-dependant device first.
@@ -185,32 +196,96 @@ def invoke_factories(
     Returns:
         Tuple[Dict[str, AnyDevice], Dict[str, Exception]]: Tuple of two dictionaries.
         One mapping device name to device, one mapping device name to exception for
-        any failed devices
+        any failed devices, including those whose dependencies failed
     """
 
-    devices: dict[str, AnyDevice] = {}
-    exceptions: dict[str, Exception] = {}
-
-    # Compute tree of dependencies,
     dependencies = {
         factory_name: set(extract_dependencies(factories, factory_name))
         for factory_name in factories.keys()
     }
-    while (len(devices) + len(exceptions)) < len(factories):
-        leaves = [
-            device
-            for device, device_dependencies in dependencies.items()
-            if (device not in devices and device not in exceptions)
-            and len(device_dependencies - set(devices.keys())) == 0
-        ]
-        dependent_name = leaves.pop()
-        params = {name: devices[name] for name in dependencies[dependent_name]}
+    return _invoke_factories(factories, dependencies, **kwargs)
+
+
+def _invoke_factories(
+    factories: Mapping[str, AnyDeviceFactory],
+    dependencies: Mapping[str, Iterable[str]],
+    /,
+    **kwargs,
+) -> tuple[dict[str, AnyDevice], dict[str, Exception]]:
+    devices: dict[str, AnyDevice] = {}
+    exceptions: dict[str, Exception] = {}
+
+    # Compute the reverse mapping of the dependency tree so that finishing a device
+    # only needs to look at the factories which depend on it
+    dependents: dict[str, set[str]] = {
+        factory_name: set() for factory_name in factories
+    }
+    for factory_name, factory_dependencies in dependencies.items():
+        for dependency_name in factory_dependencies:
+            dependents[dependency_name].add(factory_name)
+    unmade_dependencies = {
+        factory_name: len(set(factory_dependencies))
+        for factory_name, factory_dependencies in dependencies.items()
+    }
+
+    def run_factory(factory_name: str) -> AnyDevice:
+        params = {name: devices[name] for name in dependencies[factory_name]}
+        start = time.monotonic()
         try:
-            devices[dependent_name] = factories[dependent_name](**params, **kwargs)
-        except Exception as e:
-            exceptions[dependent_name] = e
+            return factories[factory_name](**params, **kwargs)
+        finally:
+            dodal.log.LOGGER.debug(
+                f"Device factory {factory_name} took {time.monotonic() - start:.3f}s"
+            )
+
+    def fail_dependents(factory_name: str) -> None:
+        for dependent_name in dependents[factory_name]:
+            if dependent_name not in exceptions:
+                exceptions[dependent_name] = RuntimeError(
+                    f"Unable to construct device {dependent_name} as its dependency "
+                    f"{factory_name} failed"
+                )
+                fail_dependents(dependent_name)
+
+    # Every factory whose dependencies have all been made is submitted straight away,
+    # so independent devices (and their connections) are made concurrently
+    with ThreadPoolExecutor(thread_name_prefix="dodal_device_factory") as executor:
+        pending: dict[Future[AnyDevice], str] = {
+            executor.submit(run_factory, factory_name): factory_name
+            for factory_name, count in unmade_dependencies.items()
+            if count == 0
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                factory_name = pending.pop(future)
+                try:
+                    devices[factory_name] = future.result()
+                except Exception as e:
+                    exceptions[factory_name] = e
+                    fail_dependents(factory_name)
+                    continue
+                for dependent_name in dependents[factory_name]:
+                    unmade_dependencies[dependent_name] -= 1
+                    if (
+                        unmade_dependencies[dependent_name] == 0
+                        and dependent_name not in exceptions
+                    ):
+                        pending[executor.submit(run_factory, dependent_name)] = (
+                            dependent_name
+                        )
+
+    for factory_name in factories.keys() - devices.keys() - exceptions.keys():
+        exceptions[factory_name] = ValueError(
+            f"Unable to construct device {factory_name} as it has a circular dependency"
+        )
 
-    all_devices = {device.name: device for device in devices.values()}
+    # Keep the order of the factories rather than the order they happened to finish in
+    all_devices = {
+        devices[factory_name].name: devices[factory_name]
+        for factory_name in factories.keys()
+        if factory_name in devices
+    }
 
     return (all_devices, exceptions)
 
@@ -255,16 +330,121 @@ def collect_factories(
         dict[str, AnyDeviceFactory]: Mapping of factory name -> factory.
     """
 
-    factories: dict[str, AnyDeviceFactory] = {}
+    return _select_factories(get_factory_index(module), include_skipped)
+
+
+@dataclass(frozen=True)
+class DeviceFactoryInfo:
+    """Everything dodal needs to know about a device factory to call it, worked out
+    once from its signature."""
+
+    name: str
+    factory: AnyDeviceFactory
+    return_type: type[AnyDevice]
+    is_v2: bool
+    skip: bool
+    #: Names of all factories in the module that this factory requires as arguments
+    dependencies: tuple[str, ...]
+
+
+_FACTORY_INDEXES: dict[
+    str, tuple[tuple, dict[str, AnyDeviceFactory], dict[str, DeviceFactoryInfo]]
+] = {}
+
+
+def get_factory_index(module: ModuleType) -> dict[str, DeviceFactoryInfo]:
+    """Get information on every device factory in a module, including skipped ones.
+    Inspecting the factory signatures is expensive so the result is cached and only
+    recomputed if the module is replaced, modified on disk or its factories change
+    (e.g. it is reloaded).
+
+    Args:
+        module: The module to inspect
+
+    Returns:
+        dict[str, DeviceFactoryInfo]: Mapping of factory name -> factory information
+    """
+    stamp = (id(module), _module_mtime(module), len(module.__dict__))
+    cached = _FACTORY_INDEXES.get(module.__name__)
+    if (
+        cached is not None
+        and cached[0] == stamp
+        and all(
+            module.__dict__.get(attribute) is factory
+            for attribute, factory in cached[1].items()
+        )
+    ):
+        return cached[2]
+
+    attributes: dict[str, AnyDeviceFactory] = {}
+    signatures: dict[str, tuple[inspect.Signature, AnyDeviceFactory, bool]] = {}
+    for attribute, var in module.__dict__.items():
+        if not callable(var):
+            continue
+        try:
+            factory_signature = signature(var)
+        except (ValueError, TypeError):
+            continue
+        return_type = factory_signature.return_annotation
+        if is_v2_device_type(return_type):
+            signatures[var.__name__] = (
+                factory_signature,
+                cast(V2DeviceFactory, var),
+                True,
+            )
+        elif is_v1_device_type(return_type):
+            signatures[var.__name__] = (
+                factory_signature,
+                cast(V1DeviceFactory, var),
+                False,
+            )
+        else:
+            continue
+        attributes[attribute] = signatures[var.__name__][1]
+
+    index = {
+        name: DeviceFactoryInfo(
+            name=name,
+            factory=factory,
+            return_type=factory_signature.return_annotation,
+            is_v2=is_v2,
+            skip=_is_device_skipped(factory),
+            dependencies=tuple(
+                param_name
+                for param_name, param in factory_signature.parameters.items()
+                if param.default is inspect.Parameter.empty and param_name in signatures
+            ),
+        )
+        for name, (factory_signature, factory, is_v2) in signatures.items()
+    }
+    _FACTORY_INDEXES[module.__name__] = (stamp, attributes, index)
+    return index
+
+
+def _module_mtime(module: ModuleType) -> float | None:
+    try:
+        return os.stat(module.__file__).st_mtime if module.__file__ else None
+    except (AttributeError, OSError):
+        return None
+
+
+def _select_factories(
+    index: Mapping[str, DeviceFactoryInfo], include_skipped: bool = False
+) -> dict[str, AnyDeviceFactory]:
+    return {
+        name: info.factory
+        for name, info in index.items()
+        if include_skipped or not info.skip
+    }
+
 
-    for var in module.__dict__.values():
-        if (
-            callable(var)
-            and is_any_device_factory(var)
-            and (include_skipped or not _is_device_skipped(var))
-        ):
-            factories[var.__name__] = var
-    return factories
+def _select_dependencies(
+    index: Mapping[str, DeviceFactoryInfo], factories: Mapping[str, AnyDeviceFactory]
+) -> dict[str, tuple[str, ...]]:
+    return {
+        name: tuple(dep for dep in index[name].dependencies if dep in factories)
+        for name in factories
+    }
 
 
 def _is_device_skipped(func: AnyDeviceFactory) -> bool:
@@ -301,6 +481,55 @@ def is_v1_device_type(obj: type[Any]) -> bool:
     return is_class and follows_protocols and not is_v2_device_type(obj)
 
 
+_lazy_import_lock = threading.Lock()
+
+
+class _LazyModule(ModuleType):
+    """Stands in for a module until one of its attributes is first used, then imports
+    it and forwards every attribute lookup to it"""
+
+    def __getattr__(self, attr: str) -> Any:
+        module = self.__dict__.get("_module")
+        if module is None:
+            # Devices may first use the module from worker threads. The import itself
+            # is thread safe, this only keeps the module stored once
+            with _lazy_import_lock:
+                module = self.__dict__.get("_module") or import_module(self.__name__)
+                self.__dict__["_module"] = module
+        return getattr(module, attr)
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Import a module without executing it until one of its attributes is first used.
+    This is for heavy third party dependencies of device modules (e.g. OpenCV, aiohttp)
+    so that importing a beamline module only pays for them if a device needing them is
+    actually made and used.
+
+    The module is imported normally on first use, rather than with
+    importlib.util.LazyLoader, as LazyLoader modules are not safe to first use from
+    more than one thread before Python 3.12.
+
+    Type checkers cannot follow this, so use it as:
+
+        if TYPE_CHECKING:
+            import cv2
+        else:
+            cv2 = lazy_import("cv2")
+
+    Args:
+        name: The full name of the module to import
+
+    Returns:
+        ModuleType: The module, which will be loaded on first attribute access
+    """
+    if (module := sys.modules.get(name)) is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+    return _LazyModule(name)
+
+
 def get_beamline_based_on_environment_variable() -> ModuleType:
     """
     Gets the dodal module for the current beamline, as specified by the
@@ -371,18 +600,25 @@ def _make_one_device(
     device_name: str,
     devices: dict[str, AnyDevice],
     factories: dict[str, AnyDeviceFactory],
+    all_dependencies: Mapping[str, Iterable[str]],
+    /,
     **kwargs,
 ) -> AnyDevice:
     factory = factories.get(device_name)
     if not factory:
         raise ValueError(f"Unable to find factory for {device_name}")
 
-    dependencies = list(extract_dependencies(factories, device_name))
+    dependencies = list(all_dependencies[device_name])
     for dependency_name in dependencies:
         if dependency_name not in devices:
             try:
                 devices[dependency_name] = _make_one_device(
-                    module, dependency_name, devices, factories, **kwargs
+                    module,
+                    dependency_name,
+                    devices,
+                    factories,
+                    all_dependencies,
+                    **kwargs,
                 )
             except Exception as e:
                 raise RuntimeError(
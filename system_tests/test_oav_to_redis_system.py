@@ -1,5 +1,5 @@
 import asyncio
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from aiohttp.client_exceptions import ClientConnectorError
@@ -11,19 +11,21 @@ from dodal.devices.oav.oav_to_redis_forwarder import OAVToRedisForwarder, Source
 def _oav_to_redis_forwarder(mock):
     with DeviceCollector(mock=mock):
         oav_forwarder = OAVToRedisForwarder("BL04I-DI-OAV-01:", "", "")
-    oav_forwarder.redis_client.hset = AsyncMock()
-    oav_forwarder.redis_client.expire = AsyncMock()
+    mock_pipeline = MagicMock()
+    mock_pipeline.__aenter__.return_value = mock_pipeline
+    mock_pipeline.execute = AsyncMock()
+    oav_forwarder.redis_client.pipeline = MagicMock(return_value=mock_pipeline)
     return oav_forwarder
 
 
 @pytest.fixture
-@patch("dodal.devices.oav.oav_to_redis_forwarder.StrictRedis")
+@patch("redis.asyncio.StrictRedis")
 def oav_to_redis_forwarder(_, RE):
     return _oav_to_redis_forwarder(False)
 
 
 @pytest.fixture
-@patch("dodal.devices.oav.oav_to_redis_forwarder.StrictRedis")
+@patch("redis.asyncio.StrictRedis")
 def mock_oav_to_redis_forwarder(_, RE):
     return _oav_to_redis_forwarder(True)
 
@@ -63,4 +65,4 @@ async def test_given_valid_stream_when_kickoff_then_multiple_images_written_to_r
     await oav_to_redis_forwarder.kickoff()
     await asyncio.sleep(0.5)
     await oav_to_redis_forwarder.complete()
-    assert oav_to_redis_forwarder.redis_client.hset.call_count > 1  # type:ignore
+    assert await oav_to_redis_forwarder.frames_written.get_value() > 1
@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+from dodal.beamlines import all_beamline_modules
+
+# Third party modules which are slow to import and are only needed once a device using
+# them is made or triggered, see dodal.utils.lazy_import
+DEFERRED_MODULES = [
+    "aiohttp",
+    "cv2",
+    "PIL.Image",
+    "PIL.ImageDraw",
+    "redis",
+    "zocalo.configuration",
+]
+
+
+def _get_import_times(*modules: str) -> dict[str, int]:
+    """Imports the given modules in a fresh interpreter using python -X importtime and
+    returns the cumulative time in microseconds taken to import each module that was
+    loaded as a result."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "; ".join(f"import {module}" for module in modules),
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = (part.strip() for part in line.split("|"))
+        if cumulative.isdigit():
+            import_times[name] = int(cumulative)
+    return import_times
+
+
+def test_importing_beamlines_does_not_import_deferred_modules():
+    beamline_modules = [
+        f"dodal.beamlines.{module}" for module in all_beamline_modules()
+    ]
+    import_times = _get_import_times(*beamline_modules)
+
+    assert all(module in import_times for module in beamline_modules)
+    imported_deferred_modules = {
+        module: import_times[module]
+        for module in DEFERRED_MODULES
+        if module in import_times
+    }
+    assert not imported_deferred_modules, (
+        f"Deferred modules imported with times (us): {imported_deferred_modules}"
+    )
@@ -1,4 +1,7 @@
+import os
+import shutil
 from os import environ
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
@@ -6,9 +9,25 @@ import pytest
 from dodal.common.beamlines.beamline_parameters import (
     GDABeamlineParameters,
     get_beamline_parameters,
+    refresh_beamline_parameters,
 )
 
 
+@pytest.fixture(autouse=True)
+def no_cached_beamline_parameters():
+    with patch.dict(
+        "dodal.common.beamlines.beamline_parameters._beamline_parameters", clear=True
+    ):
+        yield
+
+
+@pytest.fixture
+def beamline_parameters_file(tmp_path: Path) -> str:
+    path = tmp_path / "beamlineParameters"
+    shutil.copy("tests/test_data/test_beamline_parameters.txt", path)
+    return str(path)
+
+
 def test_beamline_parameters():
     params = GDABeamlineParameters.from_file(
         "tests/test_data/test_beamline_parameters.txt"
@@ -103,3 +122,64 @@ def test_get_beamline_parameters_raises_error_when_beamline_not_found(
     get_beamline_name.return_value = "invalid_beamline"
     with pytest.raises(KeyError):
         get_beamline_parameters()
+
+
+def test_parsing_lines_ignores_comments_and_lines_without_a_single_equals():
+    params = GDABeamlineParameters.from_lines(
+        "test",
+        [
+            "# a_comment = 1",
+            "BeamLine BL03I",
+            "a = 1 = 2",
+            " with_space = 2 # and a comment",
+            "a_list = [1, Yes]",
+            "miniap_x_ROBOT_LOAD = 2.0",
+        ],
+    )
+    assert params.params == {
+        "with_space": 2,
+        "a_list": [1, True],
+        "miniap_x_ROBOT_LOAD": 2.0,
+    }
+
+
+@patch(
+    "dodal.common.beamlines.beamline_parameters.GDABeamlineParameters.from_file",
+    wraps=GDABeamlineParameters.from_file,
+)
+def test_get_beamline_parameters_only_reads_unchanged_file_once(
+    mock_from_file, beamline_parameters_file: str
+):
+    first = get_beamline_parameters(beamline_parameters_file)
+    second = get_beamline_parameters(beamline_parameters_file)
+
+    assert first is second
+    mock_from_file.assert_called_once_with(beamline_parameters_file)
+
+
+def test_get_beamline_parameters_reads_file_again_when_changed(
+    beamline_parameters_file: str,
+):
+    assert get_beamline_parameters(beamline_parameters_file)["BackStopZyag"] == 19.1
+
+    with open(beamline_parameters_file, "a") as f:
+        f.write("BackStopZyag = 20.5\n")
+
+    assert get_beamline_parameters(beamline_parameters_file)["BackStopZyag"] == 20.5
+
+
+def test_refresh_beamline_parameters_reads_file_even_if_unchanged(
+    beamline_parameters_file: str,
+):
+    first = get_beamline_parameters(beamline_parameters_file)
+    stat = os.stat(beamline_parameters_file)
+    # Same size and modification time, so the change can't be detected
+    contents = Path(beamline_parameters_file).read_text()
+    Path(beamline_parameters_file).write_text(contents.replace("19.1", "20.5"))
+    os.utime(beamline_parameters_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert get_beamline_parameters(beamline_parameters_file) is first
+    refreshed = refresh_beamline_parameters(beamline_parameters_file)
+
+    assert refreshed["BackStopZyag"] == 20.5
+    assert get_beamline_parameters(beamline_parameters_file) is refreshed
@@ -133,3 +133,36 @@ def test_wait_for_v2_device_connection_passes_through_timeout(kwargs, expected_t
         mock=ANY,
         timeout=expected_timeout,
     )
+
+
+def test_connect_devices_connects_v1_and_v2_devices(RE):
+    v1_device = OphydV1Device(name="v1")
+    v1_device.wait_for_connection = MagicMock()
+    v2_device = OphydV2Device(name="v2")
+    v2_device.connect = AsyncMock()
+
+    exceptions, timings = beamline_utils.connect_devices(
+        {"v1": v1_device, "v2": v2_device}, timeout=10.0, mock=True
+    )
+
+    assert exceptions == {}
+    assert timings.keys() == {"v1", "v2"}
+    v1_device.wait_for_connection.assert_called_once_with(timeout=10.0)
+    v2_device.connect.assert_awaited_once_with(mock=True, timeout=10.0)
+
+
+def test_connect_devices_reports_each_failed_device(RE):
+    v1_error, v2_error = TimeoutError("v1"), TimeoutError("v2")
+    v1_device = OphydV1Device(name="v1")
+    v1_device.wait_for_connection = MagicMock(side_effect=v1_error)
+    v2_device = OphydV2Device(name="v2")
+    v2_device.connect = AsyncMock(side_effect=v2_error)
+    working_device = OphydV2Device(name="working")
+    working_device.connect = AsyncMock()
+
+    exceptions, timings = beamline_utils.connect_devices(
+        {"v1": v1_device, "v2": v2_device, "working": working_device}
+    )
+
+    assert exceptions == {"v1": v1_error, "v2": v2_error}
+    assert timings.keys() == {"v1", "v2", "working"}
@@ -8,7 +8,7 @@ def create_valid_response(mock_request):
     mock_response.json = AsyncMock(return_value='{"collectionNumber": 1}')
 
 
-@patch("dodal.common.visit.ClientSession.request")
+@patch("dodal.common.visit.aiohttp.ClientSession.request")
 async def test_when_create_new_collection_called_on_remote_directory_service_client_then_url_posted_to(
     mock_request: MagicMock,
 ):
@@ -20,7 +20,7 @@ async def test_when_create_new_collection_called_on_remote_directory_service_cli
     mock_request.assert_called_with("POST", f"{test_url}/numtracker")
 
 
-@patch("dodal.common.visit.ClientSession.request")
+@patch("dodal.common.visit.aiohttp.ClientSession.request")
 async def test_when_get_current_collection_called_on_remote_directory_service_client_then_url_got_from(
     mock_request: MagicMock,
 ):
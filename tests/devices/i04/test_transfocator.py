@@ -1,66 +1,159 @@
-from unittest.mock import MagicMock, patch
+import asyncio
+from unittest.mock import patch
 
 import pytest
-from ophyd.sim import make_fake_device
-from ophyd.status import SubscriptionStatus
+from ophyd_async.core import (
+    DeviceCollector,
+    callback_on_mock_put,
+    get_mock_put,
+    set_mock_value,
+)
 
 from dodal.devices.i04.transfocator import Transfocator
 
 
 @pytest.fixture
-def fake_transfocator():
-    FakeTransfocator = make_fake_device(Transfocator)
-    transfocator: Transfocator = FakeTransfocator(name="test_transfocator")
-    yield transfocator
+async def fake_transfocator() -> Transfocator:
+    async with DeviceCollector(mock=True):
+        transfocator = Transfocator("", name="test_transfocator")
+    return transfocator
 
 
 def given_predicted_lenses_is_half_of_beamsize(transfocator: Transfocator):
     def lens_number_is_half_beamsize(value, *args, **kwargs):
-        transfocator.predicted_vertical_num_lenses.sim_put(int(value / 2))  # type: ignore
+        set_mock_value(transfocator.predicted_vertical_num_lenses, int(value / 2))
 
-    transfocator.beamsize_set_microns.subscribe(lens_number_is_half_beamsize)
+    callback_on_mock_put(
+        transfocator.beamsize_set_microns, lens_number_is_half_beamsize
+    )
+
+
+def given_start_rbv_goes_high_then_low_when_started(transfocator: Transfocator):
+    async def go_low():
+        await asyncio.sleep(0.01)
+        set_mock_value(transfocator.start_rbv, 0)
 
+    def start(*args, **kwargs):
+        set_mock_value(transfocator.start_rbv, 1)
+        asyncio.create_task(go_low())
 
-def test_given_beamsize_already_set_then_when_transfocator_set_then_returns_immediately(
+    callback_on_mock_put(transfocator.start, start)
+
+
+async def test_given_beamsize_already_set_then_when_transfocator_set_then_returns_immediately(
     fake_transfocator: Transfocator,
 ):
-    fake_transfocator.beamsize_set_microns.sim_put(100)  # type: ignore
-    set_status = fake_transfocator.set(100)
-    set_status.wait(0.01)
-    assert set_status.done and set_status.success
+    set_mock_value(fake_transfocator.beamsize_set_microns, 100)
+    await asyncio.wait_for(fake_transfocator.set(100), timeout=0.01)
+
+    get_mock_put(fake_transfocator.beamsize_set_microns).assert_not_called()
+    get_mock_put(fake_transfocator.start).assert_not_called()
 
 
-@patch("dodal.devices.i04.transfocator.sleep")
-def test_when_beamsize_set_then_set_correctly_on_device_and_waited_on(
-    mock_sleep,
+async def test_when_beamsize_set_then_set_correctly_on_device_and_waited_on(
     fake_transfocator: Transfocator,
 ):
     given_predicted_lenses_is_half_of_beamsize(fake_transfocator)
+    given_start_rbv_goes_high_then_low_when_started(fake_transfocator)
 
-    transfocator_statuses = SubscriptionStatus(
-        fake_transfocator.predicted_vertical_num_lenses,
-        lambda *, old_value, value, **kwargs: value == 157,
-    )
-    transfocator_statuses &= SubscriptionStatus(
-        fake_transfocator.number_filters_sp,
-        lambda *, old_value, value, **kwargs: value == 157,
-    )
-    transfocator_statuses &= SubscriptionStatus(
-        fake_transfocator.start,
-        lambda *, old_value, value, **kwargs: value == 1,
-    )
+    await asyncio.wait_for(fake_transfocator.set(315), timeout=1)
+
+    assert await fake_transfocator.predicted_vertical_num_lenses.get_value() == 157
+    assert await fake_transfocator.number_filters_sp.get_value() == 157
+    get_mock_put(fake_transfocator.start).assert_called_once()
+    assert await fake_transfocator.start_rbv.get_value() == 0
+
+
+async def test_given_prediction_unchanged_when_beamsize_set_then_lenses_not_moved(
+    fake_transfocator: Transfocator,
+):
+    def same_prediction(*args, **kwargs):
+        set_mock_value(fake_transfocator.predicted_vertical_num_lenses, 0)
+
+    callback_on_mock_put(fake_transfocator.beamsize_set_microns, same_prediction)
+
+    await asyncio.wait_for(fake_transfocator.set(315), timeout=1)
+
+    get_mock_put(fake_transfocator.number_filters_sp).assert_not_called()
+    get_mock_put(fake_transfocator.start).assert_not_called()
+
+
+async def no_monitors(*args):
+    await asyncio.Event().wait()
+
+
+async def test_given_no_start_rbv_monitors_when_beamsize_set_then_polling_sees_it(
+    fake_transfocator: Transfocator,
+):
+    given_predicted_lenses_is_half_of_beamsize(fake_transfocator)
+
+    with (
+        patch.object(
+            fake_transfocator.start_rbv, "get_value", side_effect=[1, 0]
+        ) as get_start_rbv,
+        patch("dodal.devices.i04.transfocator.wait_for_value", no_monitors),
+    ):
+        await asyncio.wait_for(fake_transfocator.set(315), timeout=1)
+
+    assert get_start_rbv.await_count == 2
+
+
+async def test_given_no_start_rbv_monitors_when_start_rbv_briefly_high_then_polling_sees_it(
+    fake_transfocator: Transfocator,
+):
+    given_predicted_lenses_is_half_of_beamsize(fake_transfocator)
+    sleep = asyncio.sleep
+    polling_periods: list[float] = []
 
-    set_status = fake_transfocator.set(315)
+    async def record_polling_period(period: float, *args):
+        polling_periods.append(period)
+        await sleep(0)
 
-    transfocator_statuses.wait(0.1)
-    assert not set_status.done
+    # START_RBV is only seen high by one poll, long after polling started
+    with (
+        patch.object(
+            fake_transfocator.start_rbv, "get_value", side_effect=[0] * 20 + [1, 0]
+        ) as get_start_rbv,
+        patch("dodal.devices.i04.transfocator.wait_for_value", no_monitors),
+        patch("dodal.devices.i04.transfocator.asyncio.sleep", record_polling_period),
+    ):
+        await asyncio.wait_for(fake_transfocator.set(315), timeout=1)
 
-    fake_transfocator.start_rbv.get = MagicMock(side_effect=[1, 0])
+    assert get_start_rbv.await_count == 22
+    # The polling period does not back off while waiting for START_RBV to go high
+    assert polling_periods == [Transfocator._POLLING_PERIOD] * 20
 
-    set_status.wait(0.1)
-    assert set_status.done and set_status.success
 
-    try:
-        transfocator_statuses.wait(0.1)
-    except BaseException:
-        pass
+async def test_given_start_rbv_never_goes_high_then_set_times_out(
+    fake_transfocator: Transfocator,
+):
+    given_predicted_lenses_is_half_of_beamsize(fake_transfocator)
+    fake_transfocator.TIMEOUT = 0.05
+
+    with pytest.raises(TimeoutError):
+        await fake_transfocator.set(315)
+
+
+async def test_given_each_step_slow_then_whole_set_times_out(
+    fake_transfocator: Transfocator,
+):
+    given_predicted_lenses_is_half_of_beamsize(fake_transfocator)
+
+    async def start_rbv_high_then_low_after_30ms():
+        await asyncio.sleep(0.03)
+        set_mock_value(fake_transfocator.start_rbv, 1)
+        await asyncio.sleep(0.03)
+        set_mock_value(fake_transfocator.start_rbv, 0)
+
+    start_rbv_changes: list[asyncio.Task] = []
+    callback_on_mock_put(
+        fake_transfocator.start,
+        lambda *args, **kwargs: start_rbv_changes.append(
+            asyncio.create_task(start_rbv_high_then_low_after_30ms())
+        ),
+    )
+    fake_transfocator.TIMEOUT = 0.05
+
+    with pytest.raises(TimeoutError):
+        await fake_transfocator.set(315)
+    await asyncio.gather(*start_rbv_changes)
@@ -1,9 +1,13 @@
+import asyncio
+import os
 import pickle
+import shutil
 from collections import defaultdict
 from pathlib import Path
 from unittest import mock
 from unittest.mock import Mock
 
+import bluesky.plan_stubs as bps
 import numpy as np
 import pytest
 from bluesky.plans import scan
@@ -18,6 +22,7 @@ from ophyd_async.core import (
 )
 
 from dodal.devices.apple2_undulator import (
+    EnergyPolynomials,
     UndulatorGap,
     UndulatorGateStatus,
     UndulatorJawPhase,
@@ -25,11 +30,13 @@ from dodal.devices.apple2_undulator import (
 )
 from dodal.devices.i10.i10_apple2 import (
     DEFAULT_JAW_PHASE_POLY_PARAMS,
+    EnergyFlyInfo,
     I10Apple2,
     I10Apple2PGM,
     I10Apple2Pol,
     LinearArbitraryAngle,
     convert_csv_to_lookup,
+    load_lookup_table,
 )
 from dodal.devices.i10.i10_setting_data import I10Grating
 from dodal.devices.pgm import PGM
@@ -38,6 +45,12 @@ ID_GAP_LOOKUP_TABLE = "tests/devices/i10/lookupTables/IDEnergy2GapCalibrations.c
 ID_PHASE_LOOKUP_TABLE = "tests/devices/i10/lookupTables/IDEnergy2PhaseCalibrations.csv"
 
 
+@pytest.fixture(autouse=True)
+def no_cached_lookup_tables():
+    with mock.patch.dict("dodal.devices.i10.i10_apple2._lookup_tables", clear=True):
+        yield
+
+
 @pytest.fixture
 async def mock_id_gap(prefix: str = "BLXX-EA-DET-007:") -> UndulatorGap:
     async with DeviceCollector(mock=True):
@@ -210,19 +223,28 @@ async def test_fail_I10Apple2_set_outside_energy_limits(
 
 async def test_fail_I10Apple2_set_lookup_gap_pol(mock_id: I10Apple2):
     # make gap in energy
-    mock_id.lookup_tables["Gap"]["lh"]["Energies"] = {
-        "1": {
-            "Low": 255.3,
-            "High": 500,
-            "Poly": poly1d([4.33435e-08, -7.52562e-05, 6.41791e-02, 3.88755e00]),
-        }
-    }
-    mock_id.lookup_tables["Gap"]["lh"]["Energies"] = {
-        "2": {
-            "Low": 600,
-            "High": 1000,
-            "Poly": poly1d([4.33435e-08, -7.52562e-05, 6.41791e-02, 3.88755e00]),
-        }
+    mock_id.energy_polynomials["Gap"] = {
+        "lh": EnergyPolynomials.from_lookup_table_entries(
+            {
+                "Energies": {
+                    "1": {
+                        "Low": 255.3,
+                        "High": 500,
+                        "Poly": poly1d(
+                            [4.33435e-08, -7.52562e-05, 6.41791e-02, 3.88755e00]
+                        ),
+                    },
+                    "2": {
+                        "Low": 600,
+                        "High": 1000,
+                        "Poly": poly1d(
+                            [4.33435e-08, -7.52562e-05, 6.41791e-02, 3.88755e00]
+                        ),
+                    },
+                },
+                "Limit": {"Minimum": 255.3, "Maximum": 1000},
+            }
+        )
     }
     with pytest.raises(ValueError) as e:
         await mock_id.set(555)
@@ -233,6 +255,82 @@ async def test_fail_I10Apple2_set_lookup_gap_pol(mock_id: I10Apple2):
     )
 
 
+@pytest.mark.parametrize(
+    "energy_ranges",
+    [
+        [],
+        [(500, 500)],
+        [(255.3, 600), (500, 1000)],
+        [(500, 1000), (255.3, 600)],
+    ],
+)
+def test_energy_polynomials_reject_empty_or_overlapping_energy_ranges(
+    energy_ranges: list[tuple[float, float]],
+):
+    with pytest.raises(ValueError):
+        EnergyPolynomials.from_lookup_table_entries(
+            {
+                "Energies": {
+                    str(i): {"Low": low, "High": high, "Poly": poly1d([1, 0])}
+                    for i, (low, high) in enumerate(energy_ranges)
+                },
+                "Limit": {"Minimum": 255.3, "Maximum": 1000},
+            }
+        )
+
+
+@pytest.mark.parametrize("pol", ["lh", "lh3", "lv", "pc", "nc", "la"])
+def test_I10Apple2_gaps_phases_for_array_of_energies_match_lookup_table_polys(
+    mock_id: I10Apple2, pol: str
+):
+    mock_id.pol = pol
+    gap_table = mock_id.lookup_tables["Gap"][pol]
+    energies = np.linspace(
+        gap_table["Limit"]["Minimum"], gap_table["Limit"]["Maximum"], 50
+    )[:-1]
+
+    gaps, phases = mock_id.get_id_gaps_phases(energies)
+
+    def expected(table: str, energy: float) -> float:
+        for energy_range in mock_id.lookup_tables[table][pol]["Energies"].values():
+            if energy_range["Low"] <= energy < energy_range["High"]:
+                return energy_range["Poly"](energy)
+        raise AssertionError(f"{energy} not in lookup table")
+
+    assert gaps.tolist() == pytest.approx([expected("Gap", e) for e in energies])
+    assert phases.tolist() == pytest.approx([expected("Phase", e) for e in energies])
+
+
+def test_I10Apple2_energy_polynomials_cannot_be_changed(mock_id: I10Apple2):
+    with pytest.raises(ValueError):
+        mock_id.energy_polynomials["Gap"]["lh"].coefficients[0, 0] = 1
+
+
+def test_I10Apple2_lookup_tables_loaded_once_and_shared(mock_id: I10Apple2):
+    with mock.patch(
+        "dodal.devices.i10.i10_apple2.convert_csv_to_lookup"
+    ) as mock_convert:
+        mock_id.update_lookuptable()
+        lookup_table, energy_polynomials = load_lookup_table(
+            Path(ID_GAP_LOOKUP_TABLE), source=("Source", "idu")
+        )
+    mock_convert.assert_not_called()
+    assert lookup_table is mock_id.lookup_tables["Gap"]
+    assert energy_polynomials is mock_id.energy_polynomials["Gap"]
+
+
+def test_I10Apple2_lookup_table_loaded_again_when_modified(tmp_path: Path):
+    path = tmp_path / "gap.csv"
+    shutil.copy(ID_GAP_LOOKUP_TABLE, path)
+    _, before = load_lookup_table(path, source=("Source", "idu"))
+
+    os.utime(path, ns=(0, 0))
+    _, after = load_lookup_table(path, source=("Source", "idu"))
+
+    assert after is not before
+    assert load_lookup_table(path, source=("Source", "idu"))[1] is after
+
+
 async def test_fail_I10Apple2_set_undefined_pol(mock_id: I10Apple2):
     set_mock_value(mock_id.gap.user_readback, 101)
     with pytest.raises(RuntimeError) as e:
@@ -493,3 +591,136 @@ def test_convert_csv_to_lookup_failed():
             file=ID_GAP_LOOKUP_TABLE,
             source=("Source", "idw"),
         )
+
+
+@pytest.fixture
+def mock_id_pgm_ready_to_fly(mock_id_pgm: I10Apple2PGM) -> I10Apple2PGM:
+    energy = mock_id_pgm.pgm_ref().energy
+    set_mock_value(energy.max_velocity, 1000)
+    set_mock_value(energy.acceleration_time, 0.1)
+    set_mock_value(energy.low_limit_travel, 0)
+    set_mock_value(energy.high_limit_travel, 3000)
+    set_mock_value(mock_id_pgm.id_ref().gap.min_velocity, 0.01)
+    set_mock_value(mock_id_pgm.id_ref().gap.max_velocity, 10)
+    mock_id_pgm.id_ref().pol = "lh"
+    return mock_id_pgm
+
+
+FLY_INFO = EnergyFlyInfo(
+    start_energy=600, end_energy=700, time_for_move=0.1, id_points=5, sample_period=0.01
+)
+
+
+async def test_I10Apple2_pgm_prepare_calculates_trajectory_and_moves_to_start(
+    mock_id_pgm_ready_to_fly: I10Apple2PGM,
+):
+    mock_id_pgm = mock_id_pgm_ready_to_fly
+    await mock_id_pgm.energy_offset.set(20)
+
+    await mock_id_pgm.prepare(FLY_INFO)
+
+    trajectory = mock_id_pgm._trajectory
+    assert trajectory is not None
+    assert trajectory.pgm_energies.tolist() == [600, 625, 650, 675, 700]
+    assert trajectory.id_energies.tolist() == [620, 645, 670, 695, 720]
+    gaps, phases = mock_id_pgm.id_ref().get_id_gaps_phases(trajectory.id_energies)
+    assert trajectory.gaps.tolist() == gaps.tolist()
+    assert trajectory.phases.tolist() == phases.tolist()
+    assert trajectory.time_per_point == pytest.approx(0.025)
+    assert float(
+        get_mock_put(mock_id_pgm.id_ref().gap.user_setpoint).call_args[0][0]
+    ) == pytest.approx(gaps[0])
+    # Run up of 0.1s at 1000 eV/s
+    get_mock_put(mock_id_pgm.pgm_ref().energy.user_setpoint).assert_called_once_with(
+        550, wait=True
+    )
+
+
+async def test_I10Apple2_pgm_prepare_outside_lookup_table_fails_without_moving(
+    mock_id_pgm_ready_to_fly: I10Apple2PGM,
+):
+    with pytest.raises(ValueError):
+        await mock_id_pgm_ready_to_fly.prepare(
+            EnergyFlyInfo(start_energy=600, end_energy=5000, time_for_move=1)
+        )
+    get_mock_put(
+        mock_id_pgm_ready_to_fly.id_ref().gap.user_setpoint
+    ).assert_not_called()
+    get_mock_put(
+        mock_id_pgm_ready_to_fly.pgm_ref().energy.user_setpoint
+    ).assert_not_called()
+
+
+async def test_I10Apple2_pgm_kickoff_without_prepare_fails(
+    mock_id_pgm_ready_to_fly: I10Apple2PGM,
+):
+    with pytest.raises(AssertionError):
+        await mock_id_pgm_ready_to_fly.kickoff()
+
+
+async def test_I10Apple2_pgm_fly_RE(
+    mock_id_pgm_ready_to_fly: I10Apple2PGM, RE: RunEngine
+):
+    mock_id_pgm = mock_id_pgm_ready_to_fly
+    gap = mock_id_pgm.id_ref().gap
+    set_mock_value(gap.velocity, 2)
+    docs = defaultdict(list)
+
+    def capture_emitted(name, doc):
+        docs[name].append(doc)
+
+    def fly():
+        yield from bps.open_run()
+        yield from bps.prepare(mock_id_pgm, FLY_INFO, wait=True)
+        yield from bps.kickoff(mock_id_pgm, wait=True)
+        yield from bps.declare_stream(mock_id_pgm, name="primary", collect=True)
+        yield from bps.complete(mock_id_pgm, wait=True)
+        yield from bps.collect(mock_id_pgm)
+        yield from bps.close_run()
+
+    RE(fly(), capture_emitted)
+
+    trajectory = mock_id_pgm._trajectory
+    assert trajectory is not None
+    gap_setpoints = [
+        float(call.args[0]) for call in get_mock_put(gap.user_setpoint).call_args_list
+    ]
+    assert gap_setpoints == pytest.approx(trajectory.gaps.tolist())
+    get_mock_put(mock_id_pgm.pgm_ref().energy.user_setpoint).assert_called_with(
+        750, wait=True
+    )
+    # Gap velocity is changed to follow the PGM and put back afterwards
+    assert await gap.velocity.get_value() == 2
+    assert len(get_mock_put(gap.velocity).call_args_list) == FLY_INFO.id_points
+    assert_emitted(docs, start=1, descriptor=1, event_page=1, stop=1)
+    data = docs["event_page"][0]["data"]
+    assert set(data) == {
+        mock_id_pgm.pgm_ref().energy.user_readback.name,
+        gap.user_readback.name,
+    }
+    assert len(data[gap.user_readback.name]) > 1
+
+
+async def test_I10Apple2_pgm_fly_complete_waits_for_sampling_to_stop(
+    mock_id_pgm_ready_to_fly: I10Apple2PGM,
+):
+    mock_id_pgm = mock_id_pgm_ready_to_fly
+    sampling_stopped = asyncio.Event()
+    sample_readbacks = mock_id_pgm._sample_readbacks
+
+    async def sample_until_cancelled():
+        try:
+            await sample_readbacks()
+        finally:
+            # Stopping takes a little while
+            await asyncio.sleep(0.01)
+            sampling_stopped.set()
+
+    with mock.patch.object(
+        mock_id_pgm, "_sample_readbacks", new=sample_until_cancelled
+    ):
+        await mock_id_pgm.prepare(FLY_INFO)
+        await mock_id_pgm.kickoff()
+        await mock_id_pgm.complete()
+
+    assert sampling_stopped.is_set()
@@ -2,6 +2,7 @@ import asyncio
 from unittest.mock import call, patch
 
 import bluesky.plan_stubs as bps
+import numpy as np
 import pytest
 from bluesky.run_engine import RunEngine
 from ophyd_async.core import callback_on_mock_put, get_mock_put, set_mock_value
@@ -9,8 +10,12 @@ from ophyd_async.core import callback_on_mock_put, get_mock_put, set_mock_value
 from dodal.devices.i24.pmac import (
     HOME_STR,
     PMAC,
+    PMAC_STRING_MAX_LENGTH,
     EncReset,
     LaserSettings,
+    compile_pmac_commands,
+    p_variable_command,
+    run_program_command,
 )
 from dodal.devices.util.test_utils import patch_motor
 
@@ -102,3 +107,113 @@ async def test_abort_program(mock_sleep, fake_pmac: PMAC, RE):
             call("P2401=0", wait=True),
         ]
     )
+
+
+def test_compile_pmac_commands_packs_commands_in_order_into_fewest_strings():
+    commands = [
+        p_variable_command(1100, 1),
+        p_variable_command(1101, 0.5),
+        EncReset.ENC5,
+        EncReset.ENC6,
+        LaserSettings.LASER_1_OFF,
+    ]
+
+    pmac_strings = compile_pmac_commands(commands)
+
+    assert pmac_strings == [
+        "P1100=1 P1101=0.5 m508=100 m509=150",
+        "m608=100 m609=150 M712=0 M711=1",
+    ]
+    assert all(len(s) <= PMAC_STRING_MAX_LENGTH for s in pmac_strings)
+
+
+def test_compile_pmac_commands_packs_addressing_commands_like_any_other():
+    commands = [HOME_STR, "P2401=0", run_program_command(11), "M712=1"]
+
+    assert compile_pmac_commands(commands) == [
+        HOME_STR + " P2401=0 &2b11r",
+        "M712=1",
+    ]
+
+
+@pytest.mark.parametrize(
+    "value, expected_command",
+    [
+        (1234567, "P100=1234567"),
+        (12345678901234, "P100=12345678901234"),
+        (-3, "P100=-3"),
+        (np.int64(7), "P100=7"),
+        (1234567.0, "P100=1234567"),
+        (1234567.25, "P100=1234567.25"),
+        (0.5, "P100=0.5"),
+        (0.1, "P100=0.1"),
+        (1e-7, "P100=0.0000001"),
+        (-0.000123456789, "P100=-0.000123456789"),
+        (1e16, "P100=10000000000000000"),
+    ],
+)
+def test_p_variable_command_gives_value_exactly(value: float, expected_command: str):
+    assert p_variable_command(100, value) == expected_command
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf")])
+def test_p_variable_command_rejects_values_that_are_not_finite(value: float):
+    with pytest.raises(ValueError):
+        p_variable_command(100, value)
+
+
+@pytest.mark.parametrize("commands", [[], [" "], ["P1=1", "P" + "1" * 40 + "=1"]])
+def test_compile_pmac_commands_rejects_commands_that_cannot_be_sent(
+    commands: list[str],
+):
+    with pytest.raises(ValueError):
+        compile_pmac_commands(commands)
+
+
+def test_compile_pmac_commands_rejects_a_single_string():
+    with pytest.raises(ValueError):
+        compile_pmac_commands("P100=1")
+
+
+async def test_batch_sends_all_commands_in_fewest_puts(fake_pmac: PMAC, RE):
+    RE(
+        bps.abs_set(
+            fake_pmac.batch,
+            [EncReset.ENC5, EncReset.ENC6, EncReset.ENC7, EncReset.ENC8],
+            wait=True,
+        )
+    )
+
+    get_mock_put(fake_pmac.pmac_string).assert_has_calls(
+        [
+            call("m508=100 m509=150 m608=100 m609=150", wait=True),
+            call("m708=100 m709=150 m808=100 m809=150", wait=True),
+        ]
+    )
+    assert get_mock_put(fake_pmac.pmac_string).call_count == 2
+
+
+async def test_given_invalid_command_then_batch_sends_nothing(fake_pmac: PMAC):
+    with pytest.raises(ValueError):
+        await fake_pmac.batch.set(["P1=1", "P" + "1" * 40 + "=1"])
+
+    get_mock_put(fake_pmac.pmac_string).assert_not_called()
+
+
+async def test_given_single_string_then_batch_sends_nothing(fake_pmac: PMAC):
+    with pytest.raises(ValueError):
+        await fake_pmac.batch.set("P100=1")  # type: ignore
+
+    get_mock_put(fake_pmac.pmac_string).assert_not_called()
+
+
+async def test_given_program_finishes_quickly_then_kickoff_still_sees_it_run(
+    fake_pmac: PMAC,
+):
+    def run_and_finish(*args, **kwargs):
+        set_mock_value(fake_pmac.scanstatus, 1)
+        set_mock_value(fake_pmac.scanstatus, 0)
+
+    callback_on_mock_put(fake_pmac.pmac_string, run_and_finish)
+
+    await asyncio.wait_for(fake_pmac.run_program.kickoff(), timeout=1)
@@ -1,11 +1,17 @@
 import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import numpy as np
 from ophyd_async.core import set_mock_value
 
 from dodal.devices.oav.pin_image_recognition import MxSampleDetect, PinTipDetection
-from dodal.devices.oav.pin_image_recognition.utils import SampleLocation
+from dodal.devices.oav.pin_image_recognition.utils import (
+    NONE_VALUE,
+    RegionOfInterest,
+    SampleLocation,
+)
 
 EVENT_LOOP = asyncio.new_event_loop()
 
@@ -16,6 +22,11 @@ TRIGGERED_TOP_EDGE_READING = DEVICE_NAME + "-triggered_top_edge"
 TRIGGERED_BOTTOM_EDGE_READING = DEVICE_NAME + "-triggered_bottom_edge"
 
 
+async def _wait_for_call_count(mock: MagicMock, count: int):
+    while mock.call_count < count:
+        await asyncio.sleep(0.001)
+
+
 async def _get_pin_tip_detection_device() -> PinTipDetection:
     device = PinTipDetection("-DI-OAV-01", name=DEVICE_NAME)
     await device.connect(mock=True)
@@ -140,6 +151,7 @@ async def test_given_find_tip_fails_twice_when_triggered_then_tip_invalid_and_tr
 ):
     async def get_array_data(_):
         yield np.array([1, 2, 3])
+        await _wait_for_call_count(mock_process_array, 1)
         yield np.array([1, 2])
         await asyncio.sleep(100)
 
@@ -167,6 +179,7 @@ async def test_given_tip_invalid_then_loop_keeps_retrying_until_valid(
 ):
     async def get_array_data(_):
         yield np.array([1, 2, 3])
+        await _wait_for_call_count(mock_process_array, 1)
         yield np.array([1, 2])
         await asyncio.sleep(100)
 
@@ -192,7 +205,252 @@ async def test_given_tip_invalid_then_loop_keeps_retrying_until_valid(
                 FakeLocation(None, None, fake_top_edge, fake_bottom_edge),
                 FakeLocation(1, 1, fake_top_edge, fake_bottom_edge),
             ],
-        ),
+        ) as mock_process_array,
     ):
         await device.trigger()
         mock_logger.assert_called_once()
+
+
+@patch("dodal.devices.oav.pin_image_recognition.observe_value")
+async def test_given_multiple_frames_when_triggered_then_parameters_read_once(
+    mock_image_read: MagicMock,
+):
+    async def get_array_data(_):
+        yield np.array([1, 2, 3])
+        await _wait_for_call_count(mock_process_array, 1)
+        yield np.array([1, 2])
+        await _wait_for_call_count(mock_process_array, 2)
+        yield np.array([1])
+        await asyncio.sleep(100)
+
+    mock_image_read.side_effect = get_array_data
+    device = await _get_pin_tip_detection_device()
+    test_sample_location = SampleLocation(100, 200, np.array([]), np.array([]))
+
+    with (
+        patch.object(MxSampleDetect, "__init__", return_value=None) as mock_init,
+        patch.object(
+            MxSampleDetect,
+            "processArray",
+            side_effect=[
+                SampleLocation(None, None, np.array([]), np.array([])),
+                SampleLocation(None, None, np.array([]), np.array([])),
+                test_sample_location,
+            ],
+        ) as mock_process_array,
+    ):
+        await device.trigger()
+
+    mock_init.assert_called_once()
+    assert mock_process_array.call_count == 3
+
+
+async def test_given_frames_then_tip_and_edge_data_found_for_each_frame():
+    device = await _get_pin_tip_detection_device()
+    frames = np.zeros((2, 3, 4), dtype=np.uint8)
+    test_sample_locations = [
+        SampleLocation(1, 2, np.array([]), np.array([])),
+        SampleLocation(3, 4, np.array([]), np.array([])),
+    ]
+
+    with (
+        patch.object(MxSampleDetect, "__init__", return_value=None) as mock_init,
+        patch.object(
+            MxSampleDetect, "processArrays", return_value=test_sample_locations
+        ) as mock_process_arrays,
+    ):
+        locations = await device.get_tip_and_edge_data_for_frames(frames)
+
+    mock_init.assert_called_once()
+    assert mock_process_arrays.call_args[0][0] is frames
+    assert locations == test_sample_locations
+
+
+@patch("dodal.devices.oav.pin_image_recognition.observe_value")
+async def test_given_frames_arrive_while_processing_then_only_newest_processed(
+    mock_image_read: MagicMock,
+):
+    processing = threading.Event()
+    finish_processing = threading.Event()
+
+    def process_array(array, *args):
+        processing.set()
+        assert finish_processing.wait(timeout=5)
+        if len(array) == 3:
+            return SampleLocation(None, None, np.array([]), np.array([]))
+        return SampleLocation(100, 200, np.array([]), np.array([]))
+
+    async def get_array_data(_):
+        yield np.array([1, 2, 3])
+        while not processing.is_set():
+            await asyncio.sleep(0.001)
+        yield np.array([1, 2])
+        yield np.array([1])
+        finish_processing.set()
+        await asyncio.sleep(100)
+
+    mock_image_read.side_effect = get_array_data
+    device = await _get_pin_tip_detection_device()
+
+    with (
+        patch.object(MxSampleDetect, "__init__", return_value=None),
+        patch.object(
+            MxSampleDetect, "processArray", side_effect=process_array
+        ) as mock_process_array,
+    ):
+        await device.trigger()
+
+    processed = [call.args[0] for call in mock_process_array.call_args_list]
+    assert len(processed) == 2
+    np.testing.assert_array_equal(processed[0], np.array([1, 2, 3]))
+    np.testing.assert_array_equal(processed[1], np.array([1]))
+
+
+async def test_given_executor_then_tip_found_using_executor():
+    thread_names = []
+
+    def process_array(*args):
+        thread_names.append(threading.current_thread().name)
+        return SampleLocation(100, 200, np.array([]), np.array([]))
+
+    with ThreadPoolExecutor(thread_name_prefix="pin_tip_test") as executor:
+        device = PinTipDetection("-DI-OAV-01", name=DEVICE_NAME, executor=executor)
+        await device.connect(mock=True)
+        set_mock_value(device.array_data, np.array([1, 2, 3]))
+
+        with (
+            patch.object(MxSampleDetect, "__init__", return_value=None),
+            patch.object(MxSampleDetect, "processArray", side_effect=process_array),
+        ):
+            await device.trigger()
+
+    assert len(thread_names) == 1
+    assert thread_names[0].startswith("pin_tip_test")
+    reading = await device.read()
+    assert all(reading[TRIGGERED_TIP_READING]["value"] == (100, 200))
+
+
+async def test_given_max_tip_distance_then_region_around_last_tip_searched():
+    device = await _get_pin_tip_detection_device()
+    set_mock_value(device.array_data, np.zeros((480, 640), dtype=np.uint8))
+    await device.max_tip_distance.set(100)
+    await device.pyramid_levels.set(2)
+
+    with (
+        patch.object(MxSampleDetect, "__init__", return_value=None),
+        patch.object(
+            MxSampleDetect,
+            "processArray",
+            side_effect=[
+                SampleLocation(600, 200, np.array([]), np.array([])),
+                SampleLocation(300, 250, np.array([]), np.array([])),
+            ],
+        ) as mock_process_array,
+    ):
+        await device.trigger()
+        await device.trigger()
+
+    first_call, second_call = mock_process_array.call_args_list
+    assert first_call.args[1:] == (None, 2)
+    assert second_call.args[1:] == (RegionOfInterest(500, 640, 100, 301), 2)
+    reading = await device.read()
+    assert all(reading[TRIGGERED_TIP_READING]["value"] == (300, 250))
+
+
+async def test_given_max_tip_distance_then_edges_only_found_around_last_tip():
+    device = await _get_pin_tip_detection_device()
+    # A pin coming in from the right with its tip around (200, 240)
+    image = np.full((480, 640), 200, dtype=np.uint8)
+    image[200:281, 300:] = 30
+    for x in range(200, 300):
+        half_height = (x - 200) * 40 // 100
+        image[240 - half_height : 241 + half_height, x] = 30
+    set_mock_value(device.array_data, image)
+    await device.scan_direction.set(0)
+    await device.max_tip_distance.set(100)
+
+    await device.trigger()
+    whole_frame = await device.read()
+    await device.trigger()
+    in_region = await device.read()
+
+    assert all(
+        in_region[TRIGGERED_TIP_READING]["value"]
+        == whole_frame[TRIGGERED_TIP_READING]["value"]
+    )
+    # The region searched is within 100 pixels of the tip, which is found at x=199
+    # The edges are published unsigned, so are read back as signed to find NONE_VALUE
+    whole_frame_top_edge = whole_frame[TRIGGERED_TOP_EDGE_READING]["value"].astype(
+        np.int32
+    )
+    region_top_edge = in_region[TRIGGERED_TOP_EDGE_READING]["value"].astype(np.int32)
+    assert (whole_frame_top_edge[300:] != NONE_VALUE).all()
+    assert (region_top_edge[300:] == NONE_VALUE).all()
+    np.testing.assert_array_equal(region_top_edge[:300], whole_frame_top_edge[:300])
+
+
+async def test_given_no_max_tip_distance_then_whole_frame_searched():
+    device = await _get_pin_tip_detection_device()
+    set_mock_value(device.array_data, np.zeros((480, 640), dtype=np.uint8))
+
+    with (
+        patch.object(MxSampleDetect, "__init__", return_value=None),
+        patch.object(
+            MxSampleDetect,
+            "processArray",
+            return_value=SampleLocation(600, 200, np.array([]), np.array([])),
+        ) as mock_process_array,
+    ):
+        await device.trigger()
+        await device.trigger()
+
+    assert all(call.args[1:] == (None, 0) for call in mock_process_array.call_args_list)
+
+
+async def test_given_last_tip_when_unstaged_or_staged_then_whole_frame_searched():
+    device = await _get_pin_tip_detection_device()
+    set_mock_value(device.array_data, np.zeros((480, 640), dtype=np.uint8))
+    await device.max_tip_distance.set(100)
+
+    with (
+        patch.object(MxSampleDetect, "__init__", return_value=None),
+        patch.object(
+            MxSampleDetect,
+            "processArray",
+            return_value=SampleLocation(600, 200, np.array([]), np.array([])),
+        ) as mock_process_array,
+    ):
+        await device.trigger()
+        await device.unstage()
+        await device.trigger()
+        await device.stage()
+        await device.trigger()
+
+    assert all(call.args[1] is None for call in mock_process_array.call_args_list)
+
+
+async def test_given_no_tip_found_when_triggered_then_next_trigger_searches_whole_frame():
+    device = await _get_pin_tip_detection_device()
+    set_mock_value(device.array_data, np.zeros((480, 640), dtype=np.uint8))
+    await device.max_tip_distance.set(100)
+    await device.validity_timeout.set(0.01)
+
+    with (
+        patch.object(MxSampleDetect, "__init__", return_value=None),
+        patch.object(
+            MxSampleDetect,
+            "processArray",
+            side_effect=[
+                SampleLocation(600, 200, np.array([]), np.array([])),
+                SampleLocation(None, None, np.array([]), np.array([])),
+                SampleLocation(300, 250, np.array([]), np.array([])),
+            ],
+        ) as mock_process_array,
+    ):
+        await device.trigger()
+        await device.trigger()
+        await device.trigger()
+
+    first_call, second_call, third_call = mock_process_array.call_args_list
+    assert second_call.args[1] == RegionOfInterest(500, 640, 100, 301)
+    assert third_call.args[1] is None
@@ -0,0 +1,171 @@
+"""Benchmarks for each stage of pin tip detection.
+
+These run once as normal tests in the test suite. To measure timings run e.g.
+
+    pytest tests/devices/unit_tests/oav/image_recognition/test_pin_tip_detect_benchmarks.py --benchmark-enable --no-cov
+
+Results are grouped by stage. Use --benchmark-autosave and --benchmark-compare to
+compare against an earlier run.
+"""
+
+from collections.abc import Callable
+from functools import partial
+
+import cv2
+import numpy as np
+import pytest
+from pytest_benchmark.fixture import BenchmarkFixture
+
+from dodal.devices.oav.pin_image_recognition.utils import (
+    ARRAY_PROCESSING_FUNCTIONS_MAP,
+    MxSampleDetect,
+    RegionOfInterest,
+)
+
+TEST_IMAGES = "tests/test_data/test_images/"
+# The only recorded OAV frame in the test data (oav_snapshot_expected.png is the same
+# frame with an overlay drawn on it). The tip was measured by hand as the leftmost
+# point of the loop, where it is darker than its surroundings
+RECORDED_FRAME = "oav_snapshot_test.png"
+RECORDED_TIP = (486, 374)
+# The detected tip is the middle of the edges in the first column with any, which in the
+# recorded frame is a short edge at the bottom of the loop, well within its radius
+RECORDED_TIP_TOLERANCE = 15
+
+
+def _synthetic_frame(width: int, height: int) -> np.ndarray:
+    """A noisy colour frame of a pin coming in from the right with its tip a third of
+    the way across the frame."""
+    rng = np.random.default_rng(0)
+    frame = np.full((height, width), 180, dtype=np.uint8)
+    tip_x, centre_y, half_height = width // 3, height // 2, height // 12
+    cv2.fillPoly(
+        frame,
+        [
+            np.array(
+                [
+                    [tip_x, centre_y],
+                    [tip_x + 4 * half_height, centre_y - half_height],
+                    [width, centre_y - half_height],
+                    [width, centre_y + half_height],
+                    [tip_x + 4 * half_height, centre_y + half_height],
+                ],
+                dtype=np.int32,
+            )
+        ],
+        (40,),
+    )
+    noisy = frame + rng.normal(0, 4, frame.shape)
+    return cv2.cvtColor(np.clip(noisy, 0, 255).astype(np.uint8), cv2.COLOR_GRAY2BGR)
+
+
+def _recorded_frame(file_name: str) -> np.ndarray:
+    frame = cv2.imread(TEST_IMAGES + file_name)
+    assert frame is not None
+    return frame
+
+
+# Frames to benchmark with, where the tip is in them and how close it must be found
+FRAMES: dict[str, tuple[Callable[[], np.ndarray], tuple[int, int], int]] = {
+    RECORDED_FRAME: (
+        partial(_recorded_frame, RECORDED_FRAME),
+        RECORDED_TIP,
+        RECORDED_TIP_TOLERANCE,
+    ),
+    "synthetic_1024": (lambda: _synthetic_frame(1024, 768), (340, 383), 2),
+    "synthetic_2048": (lambda: _synthetic_frame(2048, 1536), (681, 768), 2),
+}
+
+
+@pytest.fixture(scope="module", params=FRAMES.keys())
+def frame_and_tip(
+    request: pytest.FixtureRequest,
+) -> tuple[np.ndarray, tuple[int, int], int]:
+    make_frame, tip, tolerance = FRAMES[request.param]
+    return make_frame(), tip, tolerance
+
+
+@pytest.fixture(scope="module")
+def frame(frame_and_tip: tuple[np.ndarray, tuple[int, int], int]) -> np.ndarray:
+    return frame_and_tip[0]
+
+
+@pytest.fixture(scope="module")
+def grey_frame(frame: np.ndarray) -> np.ndarray:
+    return MxSampleDetect._to_greyscale(frame)
+
+
+@pytest.fixture(scope="module")
+def canny_frame(grey_frame: np.ndarray) -> np.ndarray:
+    return MxSampleDetect()._canny(grey_frame)
+
+
+@pytest.fixture(scope="module")
+def edge_frame(canny_frame: np.ndarray) -> np.ndarray:
+    return MxSampleDetect()._close(canny_frame)
+
+
+@pytest.mark.benchmark(group="pin-tip-greyscale")
+def test_benchmark_greyscale(benchmark: BenchmarkFixture, frame: np.ndarray):
+    grey = benchmark(MxSampleDetect._to_greyscale, frame)
+    assert grey.shape == frame.shape[:2]
+
+
+@pytest.mark.benchmark(group="pin-tip-preprocess")
+@pytest.mark.parametrize("ksize", [3, 7])
+@pytest.mark.parametrize("preprocess_key", ARRAY_PROCESSING_FUNCTIONS_MAP.keys())
+def test_benchmark_preprocess(
+    benchmark: BenchmarkFixture, grey_frame: np.ndarray, preprocess_key: int, ksize
+):
+    preprocess = ARRAY_PROCESSING_FUNCTIONS_MAP[preprocess_key](
+        ksize=ksize, iterations=5
+    )
+    processed = benchmark(preprocess, grey_frame)
+    assert processed.shape == grey_frame.shape
+
+
+@pytest.mark.benchmark(group="pin-tip-canny")
+def test_benchmark_canny(benchmark: BenchmarkFixture, grey_frame: np.ndarray):
+    edges = benchmark(MxSampleDetect()._canny, grey_frame)
+    assert edges.any()
+
+
+@pytest.mark.benchmark(group="pin-tip-close")
+@pytest.mark.parametrize("close_ksize", [3, 5, 9])
+def test_benchmark_close(
+    benchmark: BenchmarkFixture, canny_frame: np.ndarray, close_ksize: int
+):
+    closed = benchmark(MxSampleDetect(close_ksize=close_ksize)._close, canny_frame)
+    assert closed.shape == canny_frame.shape
+
+
+@pytest.mark.benchmark(group="pin-tip-locate")
+def test_benchmark_locate(benchmark: BenchmarkFixture, edge_frame: np.ndarray):
+    location = benchmark(MxSampleDetect()._locate_sample, edge_frame)
+    assert location.tip_x is not None
+
+
+@pytest.mark.benchmark(group="pin-tip-process-array")
+@pytest.mark.parametrize(
+    "search", ["whole_frame", "region_of_interest", "pyramid_levels_2"]
+)
+def test_benchmark_process_array(
+    benchmark: BenchmarkFixture,
+    frame_and_tip: tuple[np.ndarray, tuple[int, int], int],
+    search: str,
+):
+    frame, (tip_x, tip_y), tolerance = frame_and_tip
+    height, width = frame.shape[:2]
+    kwargs = {
+        "whole_frame": {},
+        "region_of_interest": {
+            "roi": RegionOfInterest.around(tip_x, tip_y, width // 8, width, height)
+        },
+        "pyramid_levels_2": {"pyramid_levels": 2},
+    }[search]
+
+    location = benchmark(MxSampleDetect().processArray, frame, **kwargs)
+
+    assert location.tip_x is not None and location.tip_y is not None
+    assert abs(location.tip_x - tip_x) <= tolerance
+    assert abs(location.tip_y - tip_y) <= tolerance
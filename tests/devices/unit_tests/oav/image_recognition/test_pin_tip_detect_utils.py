@@ -1,9 +1,14 @@
+import pickle
+from unittest.mock import patch
+
 import numpy as np
 import pytest
 
 from dodal.devices.oav.pin_image_recognition.utils import (
+    ARRAY_PROCESSING_FUNCTIONS_MAP,
     NONE_VALUE,
     MxSampleDetect,
+    RegionOfInterest,
     ScanDirections,
 )
 
@@ -186,3 +191,157 @@ def test_first_and_last_nonzero_by_columns():
 
     np.testing.assert_array_equal(first, np.array([1, 1, NONE_VALUE, 0]))
     np.testing.assert_array_equal(last, np.array([1, 2, NONE_VALUE, 2]))
+
+
+@pytest.mark.parametrize("direction", [ScanDirections.FORWARD, ScanDirections.REVERSE])
+def test_locate_samples_gives_same_result_as_locating_each_sample(
+    direction: ScanDirections,
+):
+    rng = np.random.default_rng(0)
+    test_arrs = (rng.random((10, 20, 30)) > 0.8).astype(np.uint8)
+    test_arrs[3] = 0
+
+    detect = MxSampleDetect(min_tip_height=2, scan_direction=direction)
+    locations = detect._locate_samples(test_arrs)
+
+    assert len(locations) == len(test_arrs)
+    for location, test_arr in zip(locations, test_arrs, strict=True):
+        expected = detect._locate_sample(test_arr.copy())
+        assert location.tip_x == expected.tip_x
+        assert location.tip_y == expected.tip_y
+        np.testing.assert_array_equal(location.edge_top, expected.edge_top)
+        np.testing.assert_array_equal(location.edge_bottom, expected.edge_bottom)
+
+
+def test_process_arrays_gives_same_result_as_processing_each_array():
+    rng = np.random.default_rng(0)
+    test_arrs = rng.integers(0, 256, size=(4, 48, 64, 3), dtype=np.uint8)
+
+    detect = MxSampleDetect(min_tip_height=2)
+    locations = detect.processArrays(test_arrs)
+
+    assert len(locations) == len(test_arrs)
+    for location, test_arr in zip(locations, test_arrs, strict=True):
+        expected = detect.processArray(test_arr)
+        assert location.tip_x == expected.tip_x
+        assert location.tip_y == expected.tip_y
+        np.testing.assert_array_equal(location.edge_top, expected.edge_top)
+        np.testing.assert_array_equal(location.edge_bottom, expected.edge_bottom)
+
+
+def test_process_arrays_given_no_arrays_then_no_locations():
+    assert MxSampleDetect().processArrays(np.empty((0, 10, 10), dtype=np.uint8)) == []
+
+
+@pytest.mark.parametrize("preprocess_key", ARRAY_PROCESSING_FUNCTIONS_MAP.keys())
+def test_sample_detect_can_be_pickled(preprocess_key: int):
+    test_arr = np.random.default_rng(0).integers(0, 256, (48, 64), dtype=np.uint8)
+    detect = MxSampleDetect(
+        preprocess=ARRAY_PROCESSING_FUNCTIONS_MAP[preprocess_key](
+            ksize=3, iterations=2
+        ),
+        min_tip_height=2,
+    )
+
+    unpickled = pickle.loads(pickle.dumps(detect))
+
+    location = unpickled.processArray(test_arr)
+    expected = detect.processArray(test_arr)
+    assert location.tip_x == expected.tip_x
+    assert location.tip_y == expected.tip_y
+    np.testing.assert_array_equal(location.edge_top, expected.edge_top)
+
+
+def _pin_image(
+    direction: ScanDirections, width: int = 640, height: int = 480
+) -> np.ndarray:
+    """An image of a pin with its tip at (200, 240) for a forward scan, or mirrored
+    for a reverse scan."""
+    image = np.full((height, width), 200, dtype=np.uint8)
+    image[200:281, 300:] = 30
+    for x in range(200, 300):
+        half_height = (x - 200) * 40 // 100
+        image[240 - half_height : 241 + half_height, x] = 30
+    return image if direction == ScanDirections.FORWARD else image[:, ::-1].copy()
+
+
+def test_region_of_interest_around_is_clipped_to_image():
+    assert RegionOfInterest.around(10, 470, 50, 640, 480) == RegionOfInterest(
+        0, 61, 420, 480
+    )
+    assert RegionOfInterest.around(300, 200, 50, 640, 480) == RegionOfInterest(
+        250, 351, 150, 251
+    )
+
+
+@pytest.mark.parametrize("direction", [ScanDirections.FORWARD, ScanDirections.REVERSE])
+def test_process_array_in_region_finds_same_tip_as_whole_image_and_edges_only_in_region(
+    direction: ScanDirections,
+):
+    image = _pin_image(direction)
+    detect = MxSampleDetect(scan_direction=direction)
+    expected = detect.processArray(image)
+
+    roi = RegionOfInterest.around(expected.tip_x + 20, 230, 60, 640, 480)  # type: ignore
+    location = detect.processArray(image, roi)
+
+    assert (location.tip_x, location.tip_y) == (expected.tip_x, expected.tip_y)
+    in_region = np.zeros(640, dtype=bool)
+    in_region[roi.x_min : roi.x_max] = True
+    np.testing.assert_array_equal(location.edge_top[~in_region], NONE_VALUE)
+    np.testing.assert_array_equal(
+        location.edge_top[in_region & (expected.edge_top != NONE_VALUE)],
+        expected.edge_top[in_region & (expected.edge_top != NONE_VALUE)],
+    )
+
+
+@pytest.mark.parametrize(
+    "roi",
+    [
+        RegionOfInterest(400, 600, 100, 400),
+        RegionOfInterest(150, 350, 0, 220),
+        RegionOfInterest(0, 100, 0, 100),
+    ],
+)
+def test_given_tip_not_in_region_then_process_array_searches_whole_image(
+    roi: RegionOfInterest,
+):
+    image = _pin_image(ScanDirections.FORWARD)
+    detect = MxSampleDetect()
+    expected = detect.processArray(image)
+
+    with patch("dodal.devices.oav.pin_image_recognition.utils.LOGGER") as mock_logger:
+        location = detect.processArray(image, roi)
+
+    mock_logger.warning.assert_not_called()
+
+    assert (location.tip_x, location.tip_y) == (expected.tip_x, expected.tip_y)
+    np.testing.assert_array_equal(location.edge_top, expected.edge_top)
+
+
+@pytest.mark.parametrize("pyramid_levels", [1, 2, 3])
+@pytest.mark.parametrize("direction", [ScanDirections.FORWARD, ScanDirections.REVERSE])
+def test_process_array_downscaled_finds_same_tip_as_whole_image(
+    pyramid_levels: int, direction: ScanDirections
+):
+    image = _pin_image(direction)
+    detect = MxSampleDetect(scan_direction=direction)
+    expected = detect.processArray(image)
+
+    location = detect.processArray(image, pyramid_levels=pyramid_levels)
+
+    assert (location.tip_x, location.tip_y) == (expected.tip_x, expected.tip_y)
+    assert len(location.edge_top) == len(expected.edge_top)
+    scale = 2**pyramid_levels
+    found = (location.edge_top != NONE_VALUE) & (expected.edge_top != NONE_VALUE)
+    assert np.all(np.abs(location.edge_top[found] - expected.edge_top[found]) <= scale)
+
+
+def test_given_no_sample_when_process_array_downscaled_then_no_tip():
+    image = np.full((480, 640), 200, dtype=np.uint8)
+
+    location = MxSampleDetect().processArray(image, pyramid_levels=2)
+
+    assert location.tip_x is None
+    assert location.tip_y is None
+    assert len(location.edge_top) == 640
@@ -1,4 +1,4 @@
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from ophyd_async.core import set_mock_value
@@ -108,7 +108,7 @@ async def test_oav_returns_rescaled_beam_position_and_microns_per_pixel_correctl
 
 
 @patch(
-    "dodal.devices.areadetector.plugins.MJPG.ClientSession.get",
+    "dodal.devices.areadetector.plugins.MJPG.aiohttp.ClientSession.get",
     autospec=True,
 )
 @patch("dodal.devices.areadetector.plugins.MJPG.Image")
@@ -127,3 +127,28 @@ async def test_when_snapshot_triggered_post_processing_called_correctly(
     await oav.snapshot.trigger()
 
     mock_proc.assert_awaited_once()
+
+
+@patch(
+    "dodal.devices.areadetector.plugins.MJPG.aiohttp.ClientSession.get",
+    autospec=True,
+)
+@patch("dodal.devices.areadetector.plugins.MJPG.Image")
+async def test_given_mjpeg_stream_when_snapshot_triggered_then_first_frame_used(
+    patch_image, mock_get, oav: OAV
+):
+    jpeg = b"\xff\xd8TEST\xff\xd9"
+    mock_get.return_value.__aenter__.return_value = (mock_response := MagicMock())
+    mock_response.content_type = "multipart/x-mixed-replace"
+    mock_response.headers = {
+        "Content-Type": "multipart/x-mixed-replace; boundary=frame"
+    }
+    mock_response.content.read = AsyncMock(
+        return_value=b"--frame\r\nContent-Length: %d\r\n\r\n%s\r\n" % (len(jpeg), jpeg)
+    )
+    oav.snapshot.post_processing = AsyncMock()
+
+    await oav.snapshot.trigger()
+
+    assert patch_image.open.call_args[0][0].getvalue() == jpeg
+    mock_response.read.assert_not_called()
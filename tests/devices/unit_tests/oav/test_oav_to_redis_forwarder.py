@@ -1,5 +1,6 @@
 import asyncio
 from datetime import timedelta
+from typing import cast
 from unittest.mock import ANY, AsyncMock, MagicMock, patch
 
 import pytest
@@ -8,15 +9,20 @@ from ophyd_async.core import DeviceCollector, set_mock_value
 from dodal.devices.oav.oav_to_redis_forwarder import (
     OAVToRedisForwarder,
     Source,
-    get_next_jpeg,
+    _Frame,
 )
+from dodal.devices.util.mjpeg import MJPEGStream
 
 
 @pytest.fixture
-@patch("dodal.devices.oav.oav_to_redis_forwarder.StrictRedis", new=AsyncMock)
+@patch("redis.asyncio.StrictRedis", new=AsyncMock)
 async def oav_forwarder(RE):
     with DeviceCollector(mock=True):
         oav_forwarder = OAVToRedisForwarder("prefix", "host", "password")
+    mock_pipeline = MagicMock()
+    mock_pipeline.__aenter__.return_value = mock_pipeline
+    mock_pipeline.execute = AsyncMock()
+    oav_forwarder.redis_client.pipeline = MagicMock(return_value=mock_pipeline)
     set_mock_value(
         oav_forwarder.sources[Source.FULL_SCREEN.value].url,
         "test-full-screen-stream-url",
@@ -30,15 +36,20 @@ def get_mock_response(jpeg_bytes: bytes | None = None):
     if not jpeg_bytes:
         jpeg_bytes = b"\xff\xd8\x67\xce\xff\xd9"
     mock_response = MagicMock()
-    mock_response.content.readline = AsyncMock(return_value=jpeg_bytes[:3])
-    mock_response.content.readuntil = AsyncMock(return_value=jpeg_bytes[3:])
+    mock_response.headers = {
+        "Content-Type": "multipart/x-mixed-replace; boundary=frame"
+    }
+    mock_response.content.read = AsyncMock(
+        return_value=b"--frame\r\nContent-Type: image/jpeg\r\n\r\n" + jpeg_bytes
+    )
     return mock_response
 
 
 @pytest.fixture
 def oav_forwarder_with_valid_response(oav_forwarder: OAVToRedisForwarder):
     client_session_patch = patch(
-        "dodal.devices.oav.oav_to_redis_forwarder.ClientSession.get", autospec=True
+        "dodal.devices.oav.oav_to_redis_forwarder.aiohttp.ClientSession.get",
+        autospec=True,
     )
     mock_get = client_session_patch.start()
     mock_get.return_value.__aenter__.return_value = (
@@ -49,14 +60,16 @@ def oav_forwarder_with_valid_response(oav_forwarder: OAVToRedisForwarder):
     client_session_patch.stop()
 
 
-@patch("dodal.devices.oav.oav_to_redis_forwarder.ClientSession.get", autospec=True)
+@patch(
+    "dodal.devices.oav.oav_to_redis_forwarder.aiohttp.ClientSession.get", autospec=True
+)
 async def test_given_response_is_not_mjpeg_when_oav_forwarder_kicked_off_then_exception_raised(
     mock_get, oav_forwarder
 ):
     mock_get.return_value.__aenter__.return_value = (mock_response := AsyncMock())
     mock_response.content_type = "bad_content_type"
 
-    oav_forwarder._get_frame_and_put_to_redis = AsyncMock()
+    oav_forwarder._get_frame_and_queue = AsyncMock()
 
     with pytest.raises(ValueError):
         await oav_forwarder.kickoff()
@@ -66,15 +79,15 @@ async def test_when_oav_forwarder_kicked_off_then_connection_open_and_data_strea
     oav_forwarder_with_valid_response,
 ):
     oav_forwarder, mock_response, _ = oav_forwarder_with_valid_response
-    oav_forwarder._get_frame_and_put_to_redis = AsyncMock()
+    oav_forwarder._get_frame_and_queue = AsyncMock()
 
     await oav_forwarder.kickoff()
     await asyncio.sleep(0.01)
 
-    call_args = oav_forwarder._get_frame_and_put_to_redis.call_args
+    call_args = oav_forwarder._get_frame_and_queue.call_args
 
     assert call_args[0][0].startswith("fullscreen-0")
-    assert call_args[0][1] == mock_response
+    assert call_args[0][1]._content == mock_response.content
 
     await oav_forwarder.complete()
 
@@ -99,12 +112,18 @@ async def test_when_oav_forwarder_kicked_off_then_completed_forwarding_is_stoppe
     assert oav_forwarder.forwarding_task.done()
 
 
-async def test_given_byte_stream_when_get_next_jpeg_called_then_jpeg_bytes_returned():
-    expected_bytes = b"\xff\xd8\x67\xce\xff\xd9"
-    mock_response = get_mock_response(expected_bytes)
-    bytes = await get_next_jpeg(mock_response)
-    assert bytes == expected_bytes
-    mock_response.content.readuntil.assert_awaited_once_with(b"\xff\xd9")
+def _get_redis_pipeline(oav_forwarder: OAVToRedisForwarder) -> MagicMock:
+    return cast(MagicMock, oav_forwarder.redis_client.pipeline).return_value
+
+
+async def _get_frame_and_put_to_redis(
+    oav_forwarder: OAVToRedisForwarder, jpeg_bytes: bytes | None = None
+):
+    frames = asyncio.Queue()
+    await oav_forwarder._get_frame_and_queue(
+        "test_uuid", MJPEGStream(get_mock_response(jpeg_bytes)), frames
+    )
+    await oav_forwarder._put_frames_to_redis([frames.get_nowait()])
 
 
 async def test_when_get_frame_and_put_to_redis_called_then_data_put_in_redis_under_sample_id(
@@ -112,20 +131,19 @@ async def test_when_get_frame_and_put_to_redis_called_then_data_put_in_redis_und
 ):
     SAMPLE_ID = 100
     await oav_forwarder.sample_id.set(SAMPLE_ID)
-    await oav_forwarder._get_frame_and_put_to_redis(ANY, get_mock_response())
-    redis_call = oav_forwarder.redis_client.hset.call_args[0]
-    assert redis_call[0] == "murko:100:raw"
+    await _get_frame_and_put_to_redis(oav_forwarder)
+    redis_call = _get_redis_pipeline(oav_forwarder).hset.call_args
+    assert redis_call[0][0] == "murko:100:raw"
+    _get_redis_pipeline(oav_forwarder).execute.assert_awaited_once()
 
 
 async def test_when_get_frame_and_put_to_redis_called_then_data_is_jpeg_bytes(
     oav_forwarder,
 ):
     expected_bytes = b"\xff\xd8\x67\xce\xff\xd9"
-    await oav_forwarder._get_frame_and_put_to_redis(
-        ANY, get_mock_response(expected_bytes)
-    )
-    redis_call = oav_forwarder.redis_client.hset.call_args[0]
-    assert redis_call[2] == expected_bytes
+    await _get_frame_and_put_to_redis(oav_forwarder, expected_bytes)
+    redis_call = _get_redis_pipeline(oav_forwarder).hset.call_args
+    assert redis_call[1]["mapping"] == {"test_uuid": expected_bytes}
 
 
 async def test_when_get_frame_and_put_to_redis_called_then_data_put_in_redis_with_expiry_time(
@@ -133,12 +151,115 @@ async def test_when_get_frame_and_put_to_redis_called_then_data_put_in_redis_wit
 ):
     SAMPLE_ID = 100
     await oav_forwarder.sample_id.set(SAMPLE_ID)
-    await oav_forwarder._get_frame_and_put_to_redis(ANY, get_mock_response())
-    redis_expire_call = oav_forwarder.redis_client.expire.call_args[0]
+    await _get_frame_and_put_to_redis(oav_forwarder)
+    redis_expire_call = _get_redis_pipeline(oav_forwarder).expire.call_args[0]
     assert redis_expire_call[0] == "murko:100:raw"
     assert redis_expire_call[1] == timedelta(days=oav_forwarder.DATA_EXPIRY_DAYS)
 
 
+async def test_when_frames_put_to_redis_then_written_in_one_pipeline_with_expiry_set_once(
+    oav_forwarder,
+):
+    await oav_forwarder._put_frames_to_redis(
+        [
+            _Frame("murko:1:raw", "uuid_1", b"1"),
+            _Frame("murko:1:raw", "uuid_2", b"2"),
+            _Frame("murko:2:raw", "uuid_3", b"3"),
+        ]
+    )
+    await oav_forwarder._put_frames_to_redis([_Frame("murko:1:raw", "uuid_4", b"4")])
+
+    pipeline = _get_redis_pipeline(oav_forwarder)
+    assert pipeline.execute.await_count == 2
+    assert [call.args[0] for call in pipeline.expire.call_args_list] == [
+        "murko:1:raw",
+        "murko:2:raw",
+    ]
+    assert [
+        (call.args[0], call.kwargs["mapping"]) for call in pipeline.hset.call_args_list
+    ] == [
+        ("murko:1:raw", {"uuid_1": b"1", "uuid_2": b"2"}),
+        ("murko:2:raw", {"uuid_3": b"3"}),
+        ("murko:1:raw", {"uuid_4": b"4"}),
+    ]
+    assert await oav_forwarder.frames_written.get_value() == 4
+
+
+async def test_when_frame_queued_then_uuid_only_updated_once_written_to_redis(
+    oav_forwarder,
+):
+    frames = asyncio.Queue()
+    stream = MJPEGStream(get_mock_response())
+    pipeline = _get_redis_pipeline(oav_forwarder)
+    uuids_when_executed = []
+
+    async def record_uuid():
+        uuids_when_executed.append(await oav_forwarder.uuid.get_value())
+
+    pipeline.execute.side_effect = record_uuid
+    await oav_forwarder._get_frame_and_queue("uuid_1", stream, frames)
+    await oav_forwarder._get_frame_and_queue("uuid_2", stream, frames)
+
+    assert await oav_forwarder.uuid.get_value() == ""
+
+    frames.put_nowait(None)
+    await oav_forwarder._write_frames_to_redis(frames)
+
+    assert uuids_when_executed == [""]
+    assert await oav_forwarder.uuid.get_value() == "uuid_2"
+
+
+async def test_given_redis_write_fails_then_uuid_not_updated(oav_forwarder):
+    _get_redis_pipeline(oav_forwarder).execute.side_effect = ConnectionError()
+
+    with pytest.raises(ConnectionError):
+        await oav_forwarder._put_frames_to_redis([_Frame("murko:1:raw", "uuid_1", b"")])
+
+    assert await oav_forwarder.uuid.get_value() == ""
+
+
+async def test_given_queue_full_when_frame_read_then_frame_dropped(oav_forwarder):
+    frames = asyncio.Queue(maxsize=1)
+    stream = MJPEGStream(get_mock_response())
+    await oav_forwarder._get_frame_and_queue("uuid_1", stream, frames)
+    await oav_forwarder._get_frame_and_queue("uuid_2", stream, frames)
+
+    assert frames.qsize() == 1
+    assert frames.get_nowait().redis_uuid == "uuid_1"
+    assert await oav_forwarder.frames_read.get_value() == 2
+    assert await oav_forwarder.frames_dropped.get_value() == 1
+
+
+async def test_when_frames_queued_during_write_then_written_together(oav_forwarder):
+    frames = asyncio.Queue()
+    for i in range(3):
+        frames.put_nowait(_Frame("murko:1:raw", f"uuid_{i}", b""))
+    frames.put_nowait(None)
+
+    await oav_forwarder._write_frames_to_redis(frames)
+
+    pipeline = _get_redis_pipeline(oav_forwarder)
+    pipeline.execute.assert_awaited_once()
+    assert pipeline.hset.call_args.kwargs["mapping"].keys() == {
+        "uuid_0",
+        "uuid_1",
+        "uuid_2",
+    }
+
+
+async def test_given_redis_write_fails_when_forwarding_then_error_raised_on_complete(
+    oav_forwarder_with_valid_response,
+):
+    oav_forwarder, _, _ = oav_forwarder_with_valid_response
+    _get_redis_pipeline(oav_forwarder).execute.side_effect = ConnectionError()
+
+    await oav_forwarder.kickoff()
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(ConnectionError):
+        await oav_forwarder.complete()
+
+
 @pytest.mark.parametrize(
     "source, expected_url",
     [
@@ -175,8 +296,8 @@ async def test_when_different_sources_selected_then_different_uuids_used(
     await asyncio.sleep(0.01)
     await oav_forwarder.complete()
 
-    redis_call = oav_forwarder.redis_client.hset.call_args[0]
-    assert redis_call[1].startswith(f"{expected_uuid_prefix}-0")
+    redis_call = _get_redis_pipeline(oav_forwarder).hset.call_args
+    assert next(iter(redis_call[1]["mapping"])).startswith(f"{expected_uuid_prefix}-0")
 
 
 @pytest.mark.parametrize(
@@ -193,10 +314,11 @@ async def test_oav_only_forwards_data_when_the_unique_id_updates(
     set_mock_value(oav_forwarder.selected_source, source.value)
     await oav_forwarder.kickoff()
     await asyncio.sleep(0.01)
-    oav_forwarder.redis_client.hset.assert_called_once()
+    pipeline = _get_redis_pipeline(oav_forwarder)
+    pipeline.hset.assert_called_once()
     set_mock_value(oav_forwarder.counter, 1)
     await asyncio.sleep(0.01)
-    assert oav_forwarder.redis_client.hset.call_count == 2
-    second_call = oav_forwarder.redis_client.hset.call_args_list[1][0]
-    assert second_call[1].startswith(f"{expected_uuid_prefix}-1")
+    assert pipeline.hset.call_count == 2
+    second_call = pipeline.hset.call_args_list[1][1]
+    assert next(iter(second_call["mapping"])).startswith(f"{expected_uuid_prefix}-1")
     await oav_forwarder.complete()
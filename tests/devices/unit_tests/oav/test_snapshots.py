@@ -1,7 +1,10 @@
+import asyncio
 from pathlib import Path
 from unittest.mock import ANY, AsyncMock, MagicMock, call, patch
 
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from ophyd_async.core import (
     DeviceCollector,
     set_mock_value,
@@ -34,6 +37,7 @@ async def snapshot() -> SnapshotWithBeamCentre:
     set_mock_value(snapshot.directory, "/tmp/")
     set_mock_value(snapshot.filename, "test")
     set_mock_value(snapshot.url, "http://test.url")
+    set_mock_value(snapshot.stream_url, "http://test.stream.url")
     return snapshot
 
 
@@ -57,7 +61,8 @@ async def grid_snapshot() -> SnapshotWithGrid:
 @pytest.fixture
 def mock_session_with_valid_response():
     with patch(
-        "dodal.devices.areadetector.plugins.MJPG.ClientSession.get", autospec=True
+        "dodal.devices.areadetector.plugins.MJPG.aiohttp.ClientSession.get",
+        autospec=True,
     ) as mock_get:
         mock_get.return_value.__aenter__.return_value = (mock_response := AsyncMock())
         mock_response.ok = True
@@ -73,6 +78,165 @@ def mock_image_open():
         yield mock_open
 
 
+@pytest.fixture
+def mock_session_with_stream_response():
+    """Mocks a response with an MJPEG stream, which gives the frames put on the
+    returned queue and ends when None is put on it"""
+    frames: asyncio.Queue[bytes | None] = asyncio.Queue()
+
+    async def read(n: int) -> bytes:
+        jpeg = await frames.get()
+        if jpeg is None:
+            return b""
+        return b"--frame\r\nContent-Length: %d\r\n\r\n%s\r\n" % (len(jpeg), jpeg)
+
+    with patch(
+        "dodal.devices.areadetector.plugins.MJPG.aiohttp.ClientSession.get",
+        autospec=True,
+    ) as mock_get:
+        mock_get.return_value.__aenter__.return_value = (mock_response := MagicMock())
+        mock_response.content_type = "multipart/x-mixed-replace"
+        mock_response.headers = {
+            "Content-Type": "multipart/x-mixed-replace; boundary=frame"
+        }
+        mock_response.content.read = AsyncMock(side_effect=read)
+        mock_response.read = AsyncMock(return_value=b"FETCHED")
+        yield mock_get, frames
+
+
+def _opened_data(mock_image_open: MagicMock) -> list[bytes]:
+    return [args[0].getvalue() for args, _ in mock_image_open.call_args_list]
+
+
+async def test_given_staged_when_triggered_then_next_frames_from_open_stream_used(
+    mock_image_open, mock_session_with_stream_response, snapshot
+):
+    mock_get, frames = mock_session_with_stream_response
+    snapshot.post_processing = AsyncMock()
+    await snapshot.stage()
+
+    for jpeg in [b"first", b"second"]:
+        trigger = snapshot.trigger()
+        await asyncio.sleep(0)
+        frames.put_nowait(jpeg)
+        await trigger
+
+    await snapshot.unstage()
+
+    mock_get.assert_called_once()
+    assert _opened_data(mock_image_open) == [b"first", b"second"]
+    assert snapshot._stream_task is None and snapshot._session is None
+
+
+async def test_given_staged_when_triggered_then_frames_from_stream_url_used(
+    mock_image_open, mock_session_with_stream_response, snapshot
+):
+    mock_get, frames = mock_session_with_stream_response
+    snapshot.post_processing = AsyncMock()
+    await snapshot.stage()
+    trigger = snapshot.trigger()
+    await asyncio.sleep(0)
+    frames.put_nowait(b"frame")
+    await trigger
+    await snapshot.unstage()
+
+    mock_get.assert_called_once_with(ANY, "http://test.stream.url")
+
+
+async def test_given_server_streams_mjpeg_when_staged_then_triggers_read_open_stream(
+    mock_image_open, snapshot
+):
+    frames: asyncio.Queue[bytes] = asyncio.Queue()
+    requests: list[str] = []
+
+    async def stream(request: web.Request) -> web.StreamResponse:
+        requests.append(request.path)
+        response = web.StreamResponse(
+            headers={"Content-Type": "multipart/x-mixed-replace; boundary=frame"}
+        )
+        await response.prepare(request)
+        while True:
+            jpeg = await frames.get()
+            await response.write(
+                b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n%s\r\n"
+                % (len(jpeg), jpeg)
+            )
+
+    async def jpeg(request: web.Request) -> web.Response:
+        requests.append(request.path)
+        return web.Response(body=b"single", content_type="image/jpeg")
+
+    app = web.Application()
+    app.router.add_get("/stream", stream)
+    app.router.add_get("/jpeg", jpeg)
+    async with TestServer(app) as server:
+        set_mock_value(snapshot.url, str(server.make_url("/jpeg")))
+        set_mock_value(snapshot.stream_url, str(server.make_url("/stream")))
+        snapshot.post_processing = AsyncMock()
+        await snapshot.stage()
+
+        for frame in [b"\xff\xd8first\xff\xd9", b"\xff\xd8second\xff\xd9"]:
+            trigger = snapshot.trigger()
+            await asyncio.sleep(0.01)
+            frames.put_nowait(frame)
+            await trigger
+
+        await snapshot.unstage()
+        await snapshot.trigger()
+
+    assert requests == ["/stream", "/jpeg"]
+    assert _opened_data(mock_image_open) == [
+        b"\xff\xd8first\xff\xd9",
+        b"\xff\xd8second\xff\xd9",
+        b"single",
+    ]
+
+
+async def test_when_staged_then_child_signals_staged_until_unstaged(
+    mock_session_with_valid_response, snapshot
+):
+    signals = [snapshot.filename, snapshot.directory, snapshot.last_saved_path]
+    await snapshot.stage()
+    assert all(signal._cache is not None for signal in signals)
+
+    await snapshot.unstage()
+    assert all(signal._cache is None for signal in signals)
+
+
+async def test_given_staged_stream_ends_when_triggered_then_frame_fetched_again(
+    mock_image_open, mock_session_with_stream_response, snapshot
+):
+    mock_get, frames = mock_session_with_stream_response
+    snapshot.post_processing = AsyncMock()
+    await snapshot.stage()
+    frames.put_nowait(None)
+    frames.put_nowait(b"reconnected")
+
+    await snapshot.trigger()
+    await snapshot.unstage()
+
+    assert mock_get.call_count == 2
+    assert _opened_data(mock_image_open) == [b"reconnected"]
+
+
+async def test_given_staged_and_not_mjpeg_stream_when_triggered_then_session_reused(
+    mock_image_open, mock_session_with_valid_response, snapshot
+):
+    snapshot.post_processing = AsyncMock()
+    await snapshot.stage()
+
+    await snapshot.trigger()
+    await snapshot.trigger()
+    session = snapshot._session
+    await snapshot.unstage()
+
+    assert [args[0] for args, _ in mock_session_with_valid_response.call_args_list] == [
+        session
+    ] * 3
+    assert snapshot._stream_task is None
+    assert session.closed
+
+
 @patch("dodal.devices.oav.snapshots.snapshot_with_beam_centre.ImageDraw")
 async def test_snapshot_with_beam_centre_triggered_then_crosshair_drawn_and_saved(
     patch_image_draw, mock_image_open, mock_session_with_valid_response, snapshot
@@ -156,17 +320,16 @@ async def test_snapshot_with_grid_triggered_saves_image_and_draws_correct_grid(
 
     await grid_snapshot.trigger()
 
-    mock_save.assert_awaited_once()
-    patch_add_border.assert_called_once_with(
-        mock_image_open.return_value.__enter__.return_value, 100, 100, 50, 15, 10
-    )
-    patch_add_grid.assert_called_once_with(
-        mock_image_open.return_value.__enter__.return_value, 100, 100, 50, 15, 10
-    )
+    image = mock_image_open.return_value.__enter__.return_value
+    outer_overlay = image.copy.return_value
+    full_overlay = outer_overlay.copy.return_value
+    mock_save.assert_awaited_once_with(image)
+    patch_add_border.assert_called_once_with(outer_overlay, 100, 100, 50, 15, 10)
+    patch_add_grid.assert_called_once_with(full_overlay, 100, 100, 50, 15, 10)
     assert mock_save_grid.await_count == 2
     expected_grid_save_calls = [
-        call(ANY, f"/tmp/test_{suffix}.png")
-        for suffix in ["outer_overlay", "grid_overlay"]
+        call(outer_overlay, "/tmp/test_outer_overlay.png"),
+        call(full_overlay, "/tmp/test_grid_overlay.png"),
     ]
     assert mock_save_grid.mock_calls == expected_grid_save_calls
     assert (
@@ -54,3 +54,20 @@ async def test_given_attenuator_fails_to_set_filters_then_set_timeout(
 
     with pytest.raises(asyncio.exceptions.TimeoutError):
         await asyncio.wait_for(fake_attenuator.set(0.65), timeout=0.01)
+
+
+async def test_given_calculated_states_not_monitored_yet_when_set_then_waits_for_new_states(
+    fake_attenuator: Attenuator,
+):
+    calculated = fake_attenuator._calculated_filter_states
+    for i, callback in calculated._callbacks.items():
+        calculated[i].clear_sub(callback)
+
+    def mock_apply_values(*args, **kwargs):
+        for i in range(16):
+            set_mock_value(calculated[i], CALCULATED_VALUE[i])
+
+    callback_on_mock_put(fake_attenuator._change, mock_apply_values)
+
+    with pytest.raises(asyncio.exceptions.TimeoutError):
+        await asyncio.wait_for(fake_attenuator.set(0.65), timeout=0.01)
@@ -1,5 +1,6 @@
 from unittest.mock import Mock, patch
 
+import numpy as np
 import pytest
 
 from dodal.devices.detector.det_dist_to_beam_converter import (
@@ -60,6 +61,20 @@ def test_interpolate_beam_xy_from_det_distance(
     )
 
 
+def test_interpolate_beam_xy_from_array_of_det_distances(
+    fake_converter: DetectorDistanceToBeamXYConverter,
+):
+    distances = [100.0, 150.0, 190.0]
+
+    beam_y = fake_converter.get_beam_xy_from_det_dists(distances, Axis.Y_AXIS)
+
+    assert isinstance(beam_y, np.ndarray)
+    assert beam_y.tolist() == [
+        fake_converter.get_beam_xy_from_det_dist(distance, Axis.Y_AXIS)
+        for distance in distances
+    ]
+
+
 def test_get_beam_in_pixels(fake_converter: DetectorDistanceToBeamXYConverter):
     detector_distance = 100.0
     image_size_pixels = 100
@@ -731,3 +731,77 @@ def test_when_eiger_is_stopped_then_dev_shm_disabled(fake_eiger: EigerDetector):
     fake_eiger.stop()
 
     assert fake_eiger.odin.fan.dev_shm_enable.get() == 0
+
+
+@patch("dodal.devices.eiger.await_value")
+def test_when_armed_then_cam_set_up_after_odin_reset_while_odin_set_up(
+    mock_await, fake_eiger: EigerDetector
+):
+    mock_await.return_value = finished_status()
+    odin_stopped, odin_frame_chunks_set = Status(), Status()
+    fake_eiger.odin.stop = MagicMock(return_value=odin_stopped)
+    fake_eiger.set_odin_number_of_frame_chunks = MagicMock(
+        return_value=odin_frame_chunks_set
+    )
+    for name in [
+        "change_dev_shm",
+        "set_detector_threshold",
+        "set_cam_pvs",
+        "set_mx_settings_pvs",
+        "set_odin_pvs",
+        "_wait_for_odin_status",
+        "_wait_fan_ready",
+    ]:
+        setattr(fake_eiger, name, MagicMock(return_value=finished_status()))
+
+    arming_status = fake_eiger.do_arming_chain()
+
+    fake_eiger.set_detector_threshold.assert_not_called()
+    fake_eiger.set_cam_pvs.assert_not_called()
+    fake_eiger.set_odin_number_of_frame_chunks.assert_not_called()
+
+    odin_stopped.set_finished()
+
+    fake_eiger.set_detector_threshold.assert_called_once()
+    fake_eiger.set_cam_pvs.assert_called_once()
+    fake_eiger.set_mx_settings_pvs.assert_called_once()
+    fake_eiger.set_odin_number_of_frame_chunks.assert_called_once()
+    fake_eiger.set_odin_pvs.assert_not_called()
+    fake_eiger._wait_for_odin_status.assert_not_called()
+    assert fake_eiger.cam.acquire.get() == 0
+
+    odin_frame_chunks_set.set_finished()
+    arming_status.wait(1)
+
+    fake_eiger.set_odin_pvs.assert_called_once()
+    assert fake_eiger.cam.acquire.get() == 1
+    assert "acquire" in fake_eiger.arming_step_times
+
+
+@patch("dodal.devices.eiger.await_value")
+def test_given_roi_mode_when_armed_then_roi_mode_enabled_before_odin_reset(
+    mock_await, fake_eiger: EigerDetector
+):
+    mock_await.return_value = finished_status()
+    assert fake_eiger.detector_params
+    fake_eiger.detector_params.use_roi_mode = True
+    roi_mode_enabled = Status()
+    fake_eiger.enable_roi_mode = MagicMock(return_value=roi_mode_enabled)
+    fake_eiger.odin.stop = MagicMock(return_value=finished_status())
+
+    arming_status = fake_eiger.do_arming_chain()
+
+    fake_eiger.enable_roi_mode.assert_called_once()
+    fake_eiger.odin.stop.assert_not_called()
+
+    roi_mode_enabled.set_exception(UnknownStatusFailure("Test Exception"))
+    with pytest.raises(UnknownStatusFailure):
+        arming_status.wait(1)
+    fake_eiger.odin.stop.assert_not_called()
+
+
+def test_eiger_instances_do_not_share_step_times():
+    eigers = [EigerDetector(name=f"eiger_{i}") for i in range(2)]
+
+    assert eigers[0].arming_step_times == {}
+    assert eigers[0].arming_step_times is not eigers[1].arming_step_times
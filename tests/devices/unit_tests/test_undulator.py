@@ -1,6 +1,5 @@
 from unittest.mock import ANY
 
-import numpy as np
 import pytest
 from ophyd_async.core import (
     DeviceCollector,
@@ -13,7 +12,6 @@ from dodal.devices.undulator import (
     AccessError,
     Undulator,
     UndulatorGapAccess,
-    _get_closest_gap_for_energy,
 )
 
 ID_GAP_LOOKUP_TABLE_PATH: str = (
@@ -114,16 +112,6 @@ async def test_length_not_propagated_if_not_supplied():
     assert "undulator-length" not in (await undulator.read_configuration())
 
 
-@pytest.mark.parametrize(
-    "energy, expected_output", [(5730, 5.4606), (7200, 6.045), (9000, 6.404)]
-)
-def test_correct_closest_distance_to_energy_from_table(energy, expected_output):
-    energy_to_distance_table = np.array([[5700, 5.4606], [7000, 6.045], [9700, 6.404]])
-    assert (
-        _get_closest_gap_for_energy(energy, energy_to_distance_table) == expected_output
-    )
-
-
 async def test_when_gap_access_is_disabled_set_energy_then_error_is_raised(
     undulator,
 ):
@@ -25,6 +25,13 @@ ID_GAP_LOOKUP_TABLE_PATH: str = (
 )
 
 
+@pytest.fixture(autouse=True)
+def no_cached_lookup_tables():
+    # Some tests patch the reading of the lookup tables
+    with patch.dict("dodal.devices.util.lookup_tables._lookup_tables", clear=True):
+        yield
+
+
 @pytest.fixture(autouse=True)
 def flush_event_loop_on_finish(event_loop):
     # wait for the test function to complete
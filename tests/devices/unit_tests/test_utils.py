@@ -7,7 +7,11 @@ from ophyd.status import Status
 from ophyd.utils.errors import StatusTimeoutError, WaitTimeoutError
 from ophyd_async.core import AsyncStatus, get_mock_put, set_mock_value
 
-from dodal.devices.util.epics_util import SetWhenEnabled, run_functions_without_blocking
+from dodal.devices.util.epics_util import (
+    SetWhenEnabled,
+    run_functions_after_dependencies,
+    run_functions_without_blocking,
+)
 from dodal.log import LOGGER, GELFTCPHandler, logging, set_up_all_logging_handlers
 
 
@@ -163,3 +167,68 @@ def test_if_one_status_pending_then_later_functions_not_called():
     with pytest.raises(StatusException):
         returned_status.wait(0.1)
     tester.assert_not_called()
+
+
+def test_given_independent_functions_then_all_called_before_any_finish():
+    statuses = {name: Status() for name in "abc"}
+    returned_status = run_functions_after_dependencies(
+        {name: lambda name=name: statuses[name] for name in statuses}, {}
+    )
+
+    for status in statuses.values():
+        assert not returned_status.done
+        status.set_finished()
+    returned_status.wait(0.1)
+
+
+def test_functions_only_called_once_all_dependencies_finished():
+    first, second = Status(), Status()
+    dependent = MagicMock(return_value=NullStatus())
+    step_times = {}
+    returned_status = run_functions_after_dependencies(
+        {"first": lambda: first, "second": lambda: second, "dependent": dependent},
+        {"dependent": ["first", "second"]},
+        step_times=step_times,
+    )
+
+    first.set_finished()
+    dependent.assert_not_called()
+    second.set_finished()
+    returned_status.wait(0.1)
+
+    dependent.assert_called_once()
+    assert set(step_times) == {"first", "second", "dependent"}
+
+
+def test_if_a_function_fails_then_its_dependents_not_called():
+    pending_status = Status()
+    tester = MagicMock(return_value=NullStatus())
+    returned_status = run_functions_after_dependencies(
+        {"bad": get_bad_status, "pending": lambda: pending_status, "tester": tester},
+        {"tester": ["bad", "pending"]},
+    )
+    with pytest.raises(StatusException):
+        returned_status.wait(0.1)
+
+    pending_status.set_finished()
+    tester.assert_not_called()
+
+
+def test_given_function_not_returning_status_then_run_after_dependencies_fails():
+    returned_status = run_functions_after_dependencies({"bad": lambda: 5}, {})  # type: ignore
+
+    with pytest.raises(ValueError, match="does not return a Status"):
+        returned_status.wait(0.1)
+
+
+@pytest.mark.parametrize(
+    "dependencies",
+    [{"a": ["b"], "b": ["a"]}, {"a": ["a"]}, {"a": ["unknown"]}],
+)
+def test_given_impossible_dependencies_then_run_after_dependencies_raises(
+    dependencies: dict[str, list[str]],
+):
+    tester = MagicMock(return_value=NullStatus())
+    with pytest.raises(ValueError):
+        run_functions_after_dependencies({"a": tester, "b": tester}, dependencies)
+    tester.assert_not_called()
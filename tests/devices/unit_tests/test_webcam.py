@@ -29,7 +29,7 @@ async def test_given_last_saved_path_when_device_read_then_returns_path(webcam:
     ],
 )
 @patch("dodal.devices.webcam.aiofiles", autospec=True)
-@patch("dodal.devices.webcam.ClientSession.get", autospec=True)
+@patch("dodal.devices.webcam.aiohttp.ClientSession.get", autospec=True)
 async def test_given_filename_and_directory_when_trigger_and_read_then_returns_expected_path(
     mock_get: MagicMock,
     mock_aiofiles,
@@ -47,7 +47,7 @@ async def test_given_filename_and_directory_when_trigger_and_read_then_returns_e
 
 
 @patch("dodal.devices.webcam.aiofiles", autospec=True)
-@patch("dodal.devices.webcam.ClientSession.get", autospec=True)
+@patch("dodal.devices.webcam.aiohttp.ClientSession.get", autospec=True)
 async def test_given_data_returned_from_url_when_trigger_then_data_written(
     mock_get: MagicMock, mock_aiofiles, webcam: Webcam
 ):
@@ -62,7 +62,7 @@ async def test_given_data_returned_from_url_when_trigger_then_data_written(
     mock_file.write.assert_called_once_with(test_web_data)
 
 
-@patch("dodal.devices.webcam.ClientSession.get", autospec=True)
+@patch("dodal.devices.webcam.aiohttp.ClientSession.get", autospec=True)
 async def test_given_response_has_bad_status_but_response_read_still_returns_then_still_write_data(
     mock_get: MagicMock, webcam: Webcam
 ):
@@ -80,7 +80,7 @@ async def test_given_response_has_bad_status_but_response_read_still_returns_the
 
 
 @patch("dodal.devices.webcam.create_placeholder_image", autospec=True)
-@patch("dodal.devices.webcam.ClientSession.get", autospec=True)
+@patch("dodal.devices.webcam.aiohttp.ClientSession.get", autospec=True)
 async def test_given_response_read_fails_then_placeholder_image_written(
     mock_get: MagicMock, mock_placeholder_image: MagicMock, webcam: Webcam
 ):
@@ -0,0 +1,115 @@
+import pytest
+
+from dodal.devices.zocalo.xrc_result_comparison import (
+    FieldDifference,
+    compare_xrc_results,
+    match_crystals,
+)
+from dodal.devices.zocalo.zocalo_results import XrcResult, xrc_results_to_array
+
+
+def _crystal(
+    centre: list[float], box: list[list[int]], max_count: int = 100
+) -> XrcResult:
+    return {
+        "centre_of_mass": centre,
+        "max_voxel": [int(c) for c in centre],
+        "max_count": max_count,
+        "n_voxels": 10,
+        "total_count": 1000,
+        "bounding_box": box,
+    }
+
+
+CRYSTALS = [
+    _crystal([1.5, 1.5, 1.5], [[0, 0, 0], [3, 3, 3]]),
+    _crystal([10.5, 5.5, 2.5], [[9, 4, 1], [12, 7, 4]]),
+    _crystal([20.5, 10.5, 5.5], [[20, 10, 5], [21, 11, 6]]),
+]
+
+
+def test_given_same_crystals_in_different_order_then_all_matched_and_identical():
+    first = xrc_results_to_array(CRYSTALS)
+    second = xrc_results_to_array(CRYSTALS[::-1])
+
+    first_indices, second_indices = match_crystals(first, second)
+    comparison = compare_xrc_results(first, "CPU", second, "GPU")
+
+    assert first_indices.tolist() == [0, 1, 2]
+    assert second_indices.tolist() == [2, 1, 0]
+    assert comparison.identical
+    assert comparison.matched == 3
+
+
+def test_given_crystals_far_apart_and_not_overlapping_then_not_matched():
+    first = xrc_results_to_array(CRYSTALS[:1])
+    second = xrc_results_to_array(CRYSTALS[2:])
+
+    comparison = compare_xrc_results(first, "CPU", second, "GPU")
+
+    assert comparison.matched == 0
+    assert comparison.unmatched_first == 1 and comparison.unmatched_second == 1
+    assert not comparison.identical
+
+
+def test_given_crystals_close_but_not_overlapping_then_matched():
+    first = xrc_results_to_array([_crystal([2.5, 2.5, 2.5], [[2, 2, 2], [3, 3, 3]])])
+    second = xrc_results_to_array([_crystal([3.2, 2.5, 2.5], [[3, 2, 2], [4, 3, 3]])])
+
+    comparison = compare_xrc_results(first, "CPU", second, "GPU")
+
+    assert comparison.matched == 1
+    assert comparison.field_differences["centre_of_mass"].max_difference == (
+        pytest.approx(0.7)
+    )
+
+
+def test_given_one_crystal_overlaps_two_then_closest_matched():
+    first = xrc_results_to_array([_crystal([5, 5, 5], [[0, 0, 0], [10, 10, 10]])])
+    second = xrc_results_to_array(
+        [
+            _crystal([2, 2, 2], [[1, 1, 1], [3, 3, 3]]),
+            _crystal([5.5, 5, 5], [[4, 4, 4], [6, 6, 6]]),
+        ]
+    )
+
+    first_indices, second_indices = match_crystals(first, second)
+
+    assert first_indices.tolist() == [0]
+    assert second_indices.tolist() == [1]
+
+
+def test_differences_reported_for_every_matched_crystal_and_field():
+    changed = [
+        _crystal([1.5, 1.5, 1.5], [[0, 0, 0], [3, 3, 3]], max_count=90),
+        _crystal([10.5, 5.5, 2.5], [[9, 4, 1], [12, 7, 4]], max_count=105),
+        CRYSTALS[2],
+    ]
+
+    comparison = compare_xrc_results(
+        xrc_results_to_array(CRYSTALS), "CPU", xrc_results_to_array(changed), "GPU"
+    )
+
+    assert comparison.field_differences == {"max_count": FieldDifference(10, 2)}
+    assert str(comparison) == (
+        "Zocalo results from CPU and GPU are not identical: 3 crystals matched, 0 from "
+        "CPU and 0 from GPU unmatched. Largest differences: max_count=10 (2 crystals)"
+    )
+
+
+@pytest.mark.parametrize("first_count, second_count", [(0, 0), (0, 2), (2, 0)])
+def test_given_no_crystals_from_a_source_then_others_unmatched(
+    first_count: int, second_count: int
+):
+    comparison = compare_xrc_results(
+        xrc_results_to_array(CRYSTALS[:first_count]),
+        "CPU",
+        xrc_results_to_array(CRYSTALS[:second_count]),
+        "GPU",
+    )
+
+    assert comparison.matched == 0
+    assert comparison.unmatched_first == first_count
+    assert comparison.unmatched_second == second_count
+    assert comparison.identical == (first_count == second_count == 0)
+    assert comparison.field_differences == {}
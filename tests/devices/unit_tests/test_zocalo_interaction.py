@@ -1,15 +1,19 @@
 import getpass
 import socket
-from collections.abc import Callable
+import threading
+from collections.abc import Callable, Iterator
 from functools import partial
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, PropertyMock, patch
 
-from pytest import mark, raises
+from pytest import fixture, mark, raises
 
 from dodal.devices.zocalo import (
     ZocaloTrigger,
 )
-from dodal.devices.zocalo.zocalo_interaction import ZocaloStartInfo
+from dodal.devices.zocalo.zocalo_interaction import (
+    ZocaloStartInfo,
+    _get_zocalo_configuration,
+)
 
 SIM_ZOCALO_ENV = "dev_bluesky"
 
@@ -29,6 +33,50 @@ EXPECTED_RUN_END_MESSAGE = {
 }
 
 
+@fixture(autouse=True)
+def no_shared_connections():
+    _get_zocalo_configuration.cache_clear()
+    with patch.dict(
+        "dodal.devices.zocalo.zocalo_interaction._shared_connections", clear=True
+    ):
+        yield
+    _get_zocalo_configuration.cache_clear()
+
+
+@fixture
+def mock_configuration() -> Iterator[MagicMock]:
+    """Mocks the zocalo configuration, keeping track of the activated environments"""
+    with patch("zocalo.configuration.from_file", autospec=True) as mock_from_file:
+        configuration = mock_from_file.return_value
+        activated: list[str] = []
+        configuration.activate_environment.side_effect = activated.append
+        type(configuration).active_environments = PropertyMock(
+            side_effect=lambda: tuple(activated)
+        )
+        yield configuration
+
+
+@fixture
+def mock_transports(mock_configuration: MagicMock) -> Iterator[list[MagicMock]]:
+    """Gives the mock transports in the order they are created"""
+    transports: list[MagicMock] = []
+
+    def create_transport() -> MagicMock:
+        transports.append(MagicMock())
+        return transports[-1]
+
+    with patch(
+        "dodal.devices.zocalo.zocalo_interaction.lookup", autospec=True
+    ) as mock_transport_lookup:
+        mock_transport_lookup.return_value.side_effect = create_transport
+        yield transports
+
+
+def _wait_until_sent(trigger: ZocaloTrigger):
+    # Background messages are sent in order by a single thread
+    trigger._executor.submit(lambda: None).result(timeout=1)
+
+
 @patch("zocalo.configuration.from_file", autospec=True)
 @patch("dodal.devices.zocalo.zocalo_interaction.lookup", autospec=True)
 def _test_zocalo(
@@ -56,7 +104,7 @@ def _test_zocalo(
     mock_transport.send.assert_called_once_with(
         "processing_recipe", expected_message, headers=expected_headers
     )
-    mock_transport.disconnect.assert_called_once()
+    mock_transport.disconnect.assert_not_called()
 
 
 def normally(function_to_run, mock_transport):
@@ -111,3 +159,92 @@ def test__run_start_and_end(function_wrapper: Callable, expected_message: dict):
     function_to_run = partial(zc.run_end, EXPECTED_DCID)
     function_to_run = partial(function_wrapper, function_to_run)
     _test_zocalo(function_to_run, expected_message)
+
+
+def test_when_messages_sent_then_configuration_read_and_connection_made_once(
+    mock_configuration: MagicMock, mock_transports: list[MagicMock]
+):
+    trigger = ZocaloTrigger(environment=SIM_ZOCALO_ENV)
+
+    trigger.run_start(ZocaloStartInfo(EXPECTED_DCID, EXPECTED_FILENAME, 0, 100, 0))
+    trigger.run_end(EXPECTED_DCID)
+    ZocaloTrigger(environment=SIM_ZOCALO_ENV).run_end(EXPECTED_DCID)
+
+    mock_configuration.activate_environment.assert_called_once_with(SIM_ZOCALO_ENV)
+    assert len(mock_transports) == 1
+    mock_transports[0].connect.assert_called_once()
+    assert [
+        c.args[1]["parameters"]["event"] for c in mock_transports[0].send.mock_calls
+    ] == ["start", "end", "end"]
+
+
+def test_given_connection_lost_when_message_sent_then_reconnects_without_reactivating(
+    mock_configuration: MagicMock, mock_transports: list[MagicMock]
+):
+    trigger = ZocaloTrigger(environment=SIM_ZOCALO_ENV)
+    trigger.run_end(EXPECTED_DCID)
+    mock_transports[0].is_connected.return_value = False
+
+    trigger.run_end(EXPECTED_DCID)
+
+    assert len(mock_transports) == 2
+    mock_transports[0].send.assert_called_once()
+    mock_transports[1].send.assert_called_once()
+    mock_configuration.activate_environment.assert_called_once_with(SIM_ZOCALO_ENV)
+
+
+def test_given_other_environment_activated_when_message_sent_then_environment_reactivated(
+    mock_configuration: MagicMock, mock_transports: list[MagicMock]
+):
+    ZocaloTrigger(environment=SIM_ZOCALO_ENV).run_end(EXPECTED_DCID)
+    ZocaloTrigger(environment="other_env").run_end(EXPECTED_DCID)
+    mock_transports[0].is_connected.return_value = False
+
+    ZocaloTrigger(environment=SIM_ZOCALO_ENV).run_end(EXPECTED_DCID)
+
+    assert mock_configuration.active_environments == (
+        SIM_ZOCALO_ENV,
+        "other_env",
+        SIM_ZOCALO_ENV,
+    )
+
+
+def test_given_sending_in_background_when_message_sent_then_caller_not_blocked(
+    mock_transports: list[MagicMock],
+):
+    sending, can_send = threading.Event(), threading.Event()
+
+    def send(*args, **kwargs):
+        sending.set()
+        can_send.wait(1)
+
+    trigger = ZocaloTrigger(environment=SIM_ZOCALO_ENV, send_in_background=True)
+    trigger.run_end(EXPECTED_DCID)
+    _wait_until_sent(trigger)
+    mock_transports[0].send.side_effect = send
+
+    trigger.run_start(ZocaloStartInfo(EXPECTED_DCID, EXPECTED_FILENAME, 0, 100, 0))
+    trigger.run_end(EXPECTED_DCID)
+
+    assert sending.wait(1)
+    assert mock_transports[0].send.call_count == 2
+    can_send.set()
+    _wait_until_sent(trigger)
+    assert [
+        c.args[1]["parameters"]["event"] for c in mock_transports[0].send.mock_calls
+    ] == ["end", "start", "end"]
+
+
+@patch("dodal.devices.zocalo.zocalo_interaction.LOGGER")
+def test_given_sending_in_background_when_send_fails_then_error_logged_not_raised(
+    mock_logger: MagicMock, mock_transports: list[MagicMock]
+):
+    trigger = ZocaloTrigger(environment=SIM_ZOCALO_ENV, send_in_background=True)
+    trigger.run_end(EXPECTED_DCID)
+    _wait_until_sent(trigger)
+    mock_transports[0].send.side_effect = AssertionError("Test exception")
+
+    trigger.run_end(EXPECTED_DCID)
+    _wait_until_sent(trigger)
+
+    mock_logger.error.assert_called_once()
@@ -1,6 +1,6 @@
+import asyncio
 from asyncio import get_running_loop
 from functools import partial
-from queue import Empty
 from unittest.mock import AsyncMock, MagicMock, call, patch
 
 import bluesky.plan_stubs as bps
@@ -16,11 +16,13 @@ from dodal.devices.zocalo.zocalo_results import (
     ZOCALO_READING_PLAN_NAME,
     NoResultsFromZocalo,
     NoZocaloSubscription,
+    SortKeys,
     XrcResult,
     ZocaloResults,
     ZocaloSource,
     get_full_processing_results,
     get_processing_results_from_event,
+    xrc_results_to_array,
 )
 
 TEST_RESULTS: list[XrcResult] = [
@@ -86,13 +88,31 @@ TEST_READING = {
 test_recipe_parameters = {"dcid": 0, "dcgid": 0}
 
 
+def _raw_results(gpu: bool = False, results: list | None = None, dcid: int = 0) -> dict:
+    return {
+        "recipe_parameters": {**test_recipe_parameters, "dcid": dcid, "gpu": gpu},
+        "results": results or [],
+    }
+
+
+async def _put_after_trigger_waiting(zocalo_results: ZocaloResults, raw_results):
+    """Triggers the device and puts the results once it has started waiting"""
+    status = zocalo_results.trigger()
+    await asyncio.sleep(0.01)
+    zocalo_results._put_raw_results(raw_results)
+    return status
+
+
 @pytest.fixture
 async def zocalo_results():
     with (
-        patch("dodal.devices.zocalo.zocalo_results._get_zocalo_connection"),
+        patch("dodal.devices.zocalo.zocalo_results._get_shared_zocalo_connection"),
         patch("dodal.devices.zocalo.zocalo_results.CLEAR_QUEUE_WAIT_S", 0),
     ):
-        yield ZocaloResults(name="zocalo", zocalo_environment=ZOCALO_ENV)
+        zocalo_results = ZocaloResults(name="zocalo", zocalo_environment=ZOCALO_ENV)
+        yield zocalo_results
+        # Stops any comparison left waiting for GPU results in the background
+        await zocalo_results.unstage()
 
 
 @pytest.fixture
@@ -182,44 +202,65 @@ async def test_get_processing_results_from_event(mocked_zocalo_device, RE) -> No
 @patch(
     "dodal.devices.zocalo.zocalo_results.workflows.recipe.wrap_subscribe", autospec=True
 )
-@patch("dodal.devices.zocalo.zocalo_results._get_zocalo_connection", autospec=True)
+@patch(
+    "dodal.devices.zocalo.zocalo_results._get_shared_zocalo_connection", autospec=True
+)
 @patch("dodal.devices.zocalo.zocalo_results.CLEAR_QUEUE_WAIT_S", 0)
 async def test_subscribe_only_on_called_stage(
-    mock_connection: MagicMock, mock_wrap_subscribe: MagicMock, RE: RunEngine
+    mock_connection: MagicMock, mock_wrap_subscribe: MagicMock
 ):
     zocalo_results = ZocaloResults(
-        name="zocalo", zocalo_environment=ZOCALO_ENV, timeout_s=0
+        name="zocalo", zocalo_environment=ZOCALO_ENV, timeout_s=1
     )
     mock_wrap_subscribe.assert_not_called()
     await zocalo_results.stage()
     mock_wrap_subscribe.assert_called_once()
-    zocalo_results._raw_results_received.put([])
-    RE(bps.trigger(zocalo_results))
-    mock_wrap_subscribe.assert_called_once()
-    zocalo_results._raw_results_received.put([])
-    RE(bps.trigger(zocalo_results))
-    zocalo_results._raw_results_received.put([])
-    RE(bps.trigger(zocalo_results))
+    for _ in range(3):
+        zocalo_results._put_raw_results(_raw_results())
+        await zocalo_results.trigger()
     mock_wrap_subscribe.assert_called_once()
 
 
+@patch(
+    "dodal.devices.zocalo.zocalo_results.workflows.recipe.wrap_subscribe", autospec=True
+)
+@patch(
+    "dodal.devices.zocalo.zocalo_results._get_shared_zocalo_connection", autospec=True
+)
+@patch("dodal.devices.zocalo.zocalo_results.CLEAR_QUEUE_WAIT_S", 0)
+async def test_when_unstaged_then_unsubscribed_and_shared_connection_left_open(
+    mock_connection: MagicMock, mock_wrap_subscribe: MagicMock
+):
+    zocalo_results = ZocaloResults(name="zocalo", zocalo_environment=ZOCALO_ENV)
+    await zocalo_results.stage()
+    await zocalo_results.unstage()
+
+    transport = mock_connection.return_value
+    mock_connection.assert_called_once_with(ZOCALO_ENV)
+    transport.unsubscribe.assert_called_once_with(mock_wrap_subscribe.return_value)
+    transport.disconnect.assert_not_called()
+    assert zocalo_results.transport is None
+
+
 @patch("dodal.devices.zocalo.zocalo_results.LOGGER")
 @patch(
     "dodal.devices.zocalo.zocalo_results.workflows.recipe.wrap_subscribe", autospec=True
 )
-@patch("dodal.devices.zocalo.zocalo_results._get_zocalo_connection", new=MagicMock())
+@patch(
+    "dodal.devices.zocalo.zocalo_results._get_shared_zocalo_connection", new=MagicMock()
+)
 async def test_zocalo_results_trigger_log_message(
     mock_wrap_subscribe, mock_logger, RE: RunEngine
 ):
     zocalo_results = ZocaloResults(
         name="zocalo",
         zocalo_environment=ZOCALO_ENV,
-        timeout_s=0,
+        timeout_s=0.1,
         use_cpu_and_gpu=True,
     )
 
     recipe_wrapper = MagicMock()
-    recipe_wrapper.recipe_step = {"parameters": {}}
+    recipe_wrapper.recipe_step = {"parameters": test_recipe_parameters}
 
     def zocalo_plan():
         yield from bps.stage(zocalo_results)
@@ -246,7 +287,7 @@ async def test_zocalo_results_trigger_log_message(
                 "type": "3d",
             },
         )
-        yield from bps.trigger(zocalo_results)
+        yield from bps.trigger(zocalo_results, wait=True)
 
     RE(zocalo_plan())
     mock_logger.info.assert_has_calls(
@@ -258,7 +299,9 @@ async def test_zocalo_results_trigger_log_message(
     )
 
 
-@patch("dodal.devices.zocalo.zocalo_results._get_zocalo_connection", autospec=True)
+@patch(
+    "dodal.devices.zocalo.zocalo_results._get_shared_zocalo_connection", autospec=True
+)
 async def test_when_exception_caused_by_zocalo_message_then_exception_propagated(
     mock_connection, RE: RunEngine
 ):
@@ -272,29 +315,46 @@ async def test_when_exception_caused_by_zocalo_message_then_exception_propagated
     assert isinstance(e.value.__cause__, NoZocaloSubscription)
 
 
-async def test_if_use_cpu_and_gpu_zocalos_then_wait_twice_for_results(
-    zocalo_results: ZocaloResults, RE: RunEngine
+async def test_if_use_cpu_and_gpu_zocalos_then_wait_for_results_from_both(
+    zocalo_results: ZocaloResults,
 ):
     zocalo_results.use_cpu_and_gpu = True
     await zocalo_results.stage()
-    zocalo_results._raw_results_received.put([])
-    zocalo_results._raw_results_received.put([])
-    zocalo_results._raw_results_received.get = MagicMock()
-    RE(bps.trigger(zocalo_results, wait=False))
-    assert zocalo_results._raw_results_received.get.call_count == 2
+    zocalo_results._put_raw_results(_raw_results(gpu=False))
+    zocalo_results._put_raw_results(_raw_results(gpu=True))
+    await zocalo_results.trigger()
+    assert all(q.empty() for q in zocalo_results._raw_results_received.values())
+
+
+async def test_when_results_received_from_transport_thread_then_trigger_completes(
+    zocalo_results: ZocaloResults,
+):
+    with patch(
+        "dodal.devices.zocalo.zocalo_results.workflows.recipe.wrap_subscribe"
+    ) as mock_wrap_subscribe:
+        await zocalo_results.stage()
+    receive_result = mock_wrap_subscribe.call_args.args[2]
+    recipe_wrapper = MagicMock()
+    recipe_wrapper.recipe_step = {"parameters": test_recipe_parameters}
+
+    trigger = zocalo_results.trigger()
+    await asyncio.to_thread(
+        receive_result, recipe_wrapper, {}, {"results": TEST_RESULTS}
+    )
+    await trigger
+
+    assert len(await zocalo_results.centre_of_mass.get_value()) == 3
 
 
 @patch("dodal.devices.zocalo.zocalo_results.LOGGER")
 async def test_source_of_zocalo_results_correctly_identified(
-    mock_logger, zocalo_results: ZocaloResults, RE: RunEngine
+    mock_logger, zocalo_results: ZocaloResults
 ):
     zocalo_results.use_cpu_and_gpu = False
     await zocalo_results.stage()
 
-    zocalo_results._raw_results_received.get = MagicMock(
-        return_value={"recipe_parameters": {"test": 0}, "results": []}
-    )
-    RE(bps.trigger(zocalo_results, wait=False))
+    zocalo_results._put_raw_results(_raw_results())
+    await zocalo_results.trigger()
     mock_logger.info.assert_has_calls(
         [
             call(
@@ -306,113 +366,120 @@ async def test_source_of_zocalo_results_correctly_identified(
 
 @patch("dodal.devices.zocalo.zocalo_results.LOGGER")
 async def test_if_zocalo_results_timeout_from_gpu_then_warn(
-    mock_logger, zocalo_results: ZocaloResults, RE: RunEngine
+    mock_logger, zocalo_results: ZocaloResults
 ):
     zocalo_results.use_cpu_and_gpu = True
+    zocalo_results.timeout_s = 0.1
     await zocalo_results.stage()
-    zocalo_results._raw_results_received.get = MagicMock(
-        side_effect=[
-            {"recipe_parameters": {"test": 0}, "results": []},
-            Empty,
-        ]
-    )
-    RE(bps.trigger(zocalo_results, wait=False))
+    zocalo_results._put_raw_results(_raw_results(gpu=False))
+    await zocalo_results.trigger()
+    assert zocalo_results._gpu_comparison
+    await zocalo_results._gpu_comparison
     mock_logger.warning.assert_called_with(
         f"Zocalo results from GPU timed out. Using results from {ZocaloSource.CPU.value}"
     )
 
 
 async def test_if_zocalo_results_from_gpu_but_not_cpu_then_error(
-    zocalo_results: ZocaloResults, RE: RunEngine
+    zocalo_results: ZocaloResults,
 ):
     zocalo_results.use_cpu_and_gpu = True
+    zocalo_results.timeout_s = 0.1
     await zocalo_results.stage()
-    zocalo_results._raw_results_received.get = MagicMock(
-        side_effect=[
-            {"recipe_parameters": {"test": 0, "gpu": True}, "results": []},
-            Empty,
-        ]
-    )
+    zocalo_results._put_raw_results(_raw_results(gpu=True))
     with pytest.raises(NoResultsFromZocalo):
         await zocalo_results.trigger()
 
 
 @patch("dodal.devices.zocalo.zocalo_results.LOGGER")
 async def test_if_cpu_results_arrive_before_gpu_then_warn(
-    mock_logger, zocalo_results: ZocaloResults, RE: RunEngine
+    mock_logger, zocalo_results: ZocaloResults
 ):
     zocalo_results.use_cpu_and_gpu = True
     await zocalo_results.stage()
-    zocalo_results._raw_results_received.get = MagicMock(
-        return_value={"recipe_parameters": {"test": 0}, "results": []}
-    )
-    RE(bps.trigger(zocalo_results, wait=False))
+    zocalo_results._put_raw_results(_raw_results(gpu=False))
+    status = await _put_after_trigger_waiting(zocalo_results, _raw_results(gpu=True))
+    await status
     mock_logger.warning.assert_called_with(
         f"Received zocalo results from {ZocaloSource.CPU.value} before {ZocaloSource.GPU.value}"
     )
 
 
+@patch("dodal.devices.zocalo.zocalo_results.LOGGER")
+async def test_given_gpu_results_waiting_when_cpu_results_arrive_then_no_timeout(
+    mock_logger, zocalo_results: ZocaloResults
+):
+    zocalo_results.use_cpu_and_gpu = True
+    zocalo_results.timeout_s = 1
+    await zocalo_results.stage()
+    zocalo_results._put_raw_results(_raw_results(gpu=True))
+    status = await _put_after_trigger_waiting(zocalo_results, _raw_results(gpu=False))
+    await status
+    mock_logger.warning.assert_not_called()
+    mock_logger.error.assert_not_called()
+
+
+def _with_changes(result: XrcResult, **changes) -> XrcResult:
+    return XrcResult(**{**result, **changes})  # type: ignore
+
+
 @pytest.mark.parametrize(
-    "dict1,dict2,output",
+    "gpu_first,gpu_results,output",
     [
         (
-            {"recipe_parameters": {"gpu": True}, "results": [{"test": 0}]},
-            {"recipe_parameters": {}, "results": [{"test": 1}]},
-            "Zocalo results from GPU and CPU are not identical.\n Results from GPU: {'test': 0}\n Results from CPU: {'test': 1}",
+            True,
+            [_with_changes(TEST_RESULTS[0], centre_of_mass=[2, 2, 3])],
+            "Zocalo results from GPU and CPU are not identical: 1 crystals matched, 0 from GPU and 0 from CPU unmatched. Largest differences: centre_of_mass=1 (1 crystals)",
         ),
         (
-            {
-                "recipe_parameters": {"gpu": True},
-                "results": [{"test": [[1, 2 + 1e-6, 3], [1, 2, 3]]}],
-            },
-            {"recipe_parameters": {}, "results": [{"test": [[1, 2, 3], [1, 2, 3]]}]},
+            True,
+            [_with_changes(TEST_RESULTS[0], centre_of_mass=[1, 2 + 1e-6, 3])],
             None,
         ),
         (
-            {
-                "recipe_parameters": {"gpu": True},
-                "results": [
-                    {"test": [[1, 2 + 1e-6, 3], [1, 2, 3]], "extra_key": "test"}
-                ],
-            },
-            {"recipe_parameters": {}, "results": [{"test": [[1, 2, 3], [1, 2, 3]]}]},
-            "Zocalo results from GPU and CPU are not identical.\n Results from GPU: {'test': [[1, 2.000001, 3], [1, 2, 3]], 'extra_key': 'test'}\n Results from CPU: {'test': [[1, 2, 3], [1, 2, 3]]}",
+            True,
+            [TEST_RESULTS[0], TEST_RESULTS[2]],
+            "Zocalo results from GPU and CPU are not identical: 1 crystals matched, 1 from GPU and 0 from CPU unmatched",
         ),
         (
-            {
-                "recipe_parameters": {"gpu": False},
-                "results": [{"test": [[1, 2 + 1e-6, 3], [1, 2, 3]]}],
-            },
-            {"recipe_parameters": {}, "results": [{"test": [[1, 3, 3], [1, 2, 3]]}]},
-            "Zocalo results from CPU and CPU are not identical.\n Results from CPU: {'test': [[1, 2.000001, 3], [1, 2, 3]]}\n Results from CPU: {'test': [[1, 3, 3], [1, 2, 3]]}",
+            False,
+            [_with_changes(TEST_RESULTS[0], max_count=105000, n_voxels=37)],
+            "Zocalo results from CPU and GPU are not identical: 1 crystals matched, 0 from CPU and 0 from GPU unmatched. Largest differences: max_count=62 (1 crystals), n_voxels=1 (1 crystals)",
         ),
     ],
 )
 @patch("dodal.devices.zocalo.zocalo_results.LOGGER")
 async def test_warning_if_results_are_different(
-    mock_logger, zocalo_results: ZocaloResults, RE: RunEngine, dict1, dict2, output
+    mock_logger,
+    zocalo_results: ZocaloResults,
+    gpu_first: bool,
+    gpu_results: list[XrcResult],
+    output: str | None,
 ):
     zocalo_results.use_cpu_and_gpu = True
+    cpu = _raw_results(gpu=False, results=[TEST_RESULTS[0]])
+    gpu = _raw_results(gpu=True, results=gpu_results)
+    first, second = (gpu, cpu) if gpu_first else (cpu, gpu)
 
     await zocalo_results.stage()
-    zocalo_results._raw_results_received.get = MagicMock(
-        side_effect=[
-            dict1,
-            dict2,
-        ]
-    )
-    RE(bps.trigger(zocalo_results, wait=False))
-    mock_logger.warning.assert_called_with(
-        output
-    ) if output else mock_logger.warning.assert_not_called()
+    zocalo_results._put_raw_results(first)
+    status = await _put_after_trigger_waiting(zocalo_results, second)
+    await status
+    if zocalo_results._gpu_comparison:
+        await zocalo_results._gpu_comparison
+
+    if output:
+        mock_logger.warning.assert_called_with(output)
+    elif gpu_first:
+        mock_logger.warning.assert_not_called()
 
 
 async def test_if_zocalo_results_timeout_before_any_results_then_error(
     zocalo_results: ZocaloResults,
 ):
     zocalo_results.use_cpu_and_gpu = True
+    zocalo_results.timeout_s = 0.1
     await zocalo_results.stage()
-    zocalo_results._raw_results_received.get = MagicMock(side_effect=Empty)
     with pytest.raises(NoResultsFromZocalo):
         await zocalo_results.trigger()
 
@@ -425,7 +492,9 @@ async def test_if_zocalo_results_timeout_before_any_results_then_error(
 @patch(
     "dodal.devices.zocalo.zocalo_results.workflows.recipe.wrap_subscribe", autospec=True
 )
-@patch("dodal.devices.zocalo.zocalo_results._get_zocalo_connection", new=MagicMock())
+@patch(
+    "dodal.devices.zocalo.zocalo_results._get_shared_zocalo_connection", new=MagicMock()
+)
 @patch("dodal.devices.zocalo.zocalo_results.CLEAR_QUEUE_WAIT_S", 0.1)
 async def test_gpu_results_ignored_and_cpu_results_used_if_toggle_disabled(
     mock_wrap_subscribe, mock_logger, RE: RunEngine, gpu: bool
@@ -433,12 +502,12 @@ async def test_gpu_results_ignored_and_cpu_results_used_if_toggle_disabled(
     zocalo_results = ZocaloResults(
         name="zocalo",
         zocalo_environment=ZOCALO_ENV,
-        timeout_s=0,
+        timeout_s=0.1,
         use_cpu_and_gpu=False,
     )
 
     recipe_wrapper = MagicMock()
-    recipe_wrapper.recipe_step = {"parameters": {"gpu": gpu}}
+    recipe_wrapper.recipe_step = {"parameters": {**test_recipe_parameters, "gpu": gpu}}
 
     def zocalo_plan():
         yield from bps.stage(zocalo_results)
@@ -465,17 +534,17 @@ async def test_gpu_results_ignored_and_cpu_results_used_if_toggle_disabled(
                 "type": "3d",
             },
         )
-        yield from bps.trigger(zocalo_results)
-        if gpu:
-            mock_logger.warning.assert_called_with(
-                "Timed out waiting for zocalo results!"
-            )
-        else:
-            mock_logger.info.assert_called_with(
-                f"Zocalo results from {ZocaloSource.CPU.value} processing: found 1 crystals."
-            )
-
-    RE(zocalo_plan())
+        yield from bps.trigger(zocalo_results, wait=True)
+
+    if gpu:
+        with pytest.raises(FailedStatus):
+            RE(zocalo_plan())
+        mock_logger.warning.assert_called_with("Timed out waiting for zocalo results!")
+    else:
+        RE(zocalo_plan())
+        mock_logger.info.assert_any_call(
+            f"Zocalo results from {ZocaloSource.CPU.value} processing: found 1 crystals."
+        )
 
 
 async def test_given_gpu_enabled_when_no_results_found_then_returns_no_results(
@@ -483,11 +552,111 @@ async def test_given_gpu_enabled_when_no_results_found_then_returns_no_results(
 ):
     zocalo_results.use_cpu_and_gpu = True
     await zocalo_results.stage()
-    zocalo_results._raw_results_received.get = MagicMock(
-        side_effect=[
-            {"recipe_parameters": {"dcgid": 0, "dcid": 0, "gpu": True}, "results": []},
-            {"recipe_parameters": {"dcgid": 0, "dcid": 0}, "results": []},
-        ]
-    )
+    zocalo_results._put_raw_results(_raw_results(gpu=True))
+    zocalo_results._put_raw_results(_raw_results(gpu=False))
     await zocalo_results.trigger()
     assert len(await zocalo_results.centre_of_mass.get_value()) == 0
+
+
+async def test_given_cpu_results_first_when_triggered_then_published_before_gpu_results(
+    zocalo_results: ZocaloResults,
+):
+    zocalo_results.use_cpu_and_gpu = True
+    await zocalo_results.stage()
+    zocalo_results._put_raw_results(_raw_results(gpu=False, results=TEST_RESULTS))
+
+    await zocalo_results.trigger()
+
+    assert len(await zocalo_results.centre_of_mass.get_value()) == 3
+    assert zocalo_results._gpu_comparison and not zocalo_results._gpu_comparison.done()
+    zocalo_results._put_raw_results(_raw_results(gpu=True, results=TEST_RESULTS))
+    await zocalo_results._gpu_comparison
+
+
+async def test_given_gpu_comparison_pending_when_triggered_again_then_comparison_cancelled(
+    zocalo_results: ZocaloResults,
+):
+    zocalo_results.use_cpu_and_gpu = True
+    await zocalo_results.stage()
+    zocalo_results._put_raw_results(_raw_results(gpu=False))
+    await zocalo_results.trigger()
+    comparison = zocalo_results._gpu_comparison
+
+    status = zocalo_results.trigger()
+    await asyncio.sleep(0.01)
+    assert comparison and comparison.cancelled()
+
+    zocalo_results._put_raw_results(_raw_results(gpu=True))
+    zocalo_results._put_raw_results(_raw_results(gpu=False))
+    await status
+    assert all(q.empty() for q in zocalo_results._raw_results_received.values())
+
+    comparison = zocalo_results._gpu_comparison
+    await zocalo_results.unstage()
+    assert comparison and comparison.cancelled()
+    assert zocalo_results._gpu_comparison is None
+
+
+@patch("dodal.devices.zocalo.zocalo_results.LOGGER")
+async def test_given_gpu_results_late_for_first_trigger_then_not_compared_in_second_trigger(
+    mock_logger, zocalo_results: ZocaloResults
+):
+    zocalo_results.use_cpu_and_gpu = True
+    zocalo_results.timeout_s = 0.2
+    await zocalo_results.stage()
+    zocalo_results._put_raw_results(_raw_results(gpu=False, dcid=1))
+    await zocalo_results.trigger()
+    assert zocalo_results._gpu_comparison
+    await zocalo_results._gpu_comparison
+
+    zocalo_results._put_raw_results(
+        _raw_results(gpu=True, results=TEST_RESULTS, dcid=1)
+    )
+    status = zocalo_results.trigger()
+    # Longer than the CPU is given once GPU results for the same trigger arrive
+    await asyncio.sleep(0.15)
+    zocalo_results._put_raw_results(_raw_results(gpu=False, dcid=2))
+    await status
+
+    assert await zocalo_results.ispyb_dcid.get_value() == 2
+    mock_logger.info.assert_any_call(
+        f"Discarding late zocalo results from {ZocaloSource.GPU.value} for (1, 0)"
+    )
+    assert zocalo_results._gpu_comparison and not zocalo_results._gpu_comparison.done()
+    zocalo_results._put_raw_results(_raw_results(gpu=True, dcid=2))
+    await zocalo_results._gpu_comparison
+    assert all(
+        "not identical" not in str(warning)
+        for warning in mock_logger.warning.call_args_list
+    )
+
+
+@pytest.mark.parametrize(
+    "sort_key, expected_max_counts",
+    [
+        ("max_count", [105123, 105062, 102062]),
+        ("n_voxels", [105062, 105123, 102062]),
+        # All total counts are equal, so the order is unchanged
+        ("total_count", [105062, 105123, 102062]),
+    ],
+)
+async def test_when_triggered_then_results_sorted_by_sort_key(
+    zocalo_results: ZocaloResults, sort_key: str, expected_max_counts: list[int]
+):
+    zocalo_results.sort_key = SortKeys[sort_key]
+    await zocalo_results.stage()
+    zocalo_results._put_raw_results(_raw_results(results=TEST_RESULTS))
+
+    await zocalo_results.trigger()
+
+    max_counts = await zocalo_results.max_count.get_value()
+    assert max_counts.tolist() == expected_max_counts
+    assert (await zocalo_results.bounding_box.get_value()).shape == (3, 2, 3)
+
+
+def test_xrc_results_to_array_makes_record_per_crystal():
+    results = xrc_results_to_array(TEST_RESULTS)
+
+    assert results.shape == (3,)
+    assert results[1]["centre_of_mass"].tolist() == [2, 3, 4]
+    assert results["max_count"].tolist() == [r["max_count"] for r in TEST_RESULTS]
@@ -0,0 +1,105 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from ophyd_async.core import DeviceCollector, set_mock_value, soft_signal_rw
+
+from dodal.devices.util.bit_array import BitArray
+
+
+@pytest.fixture
+async def bit_array() -> BitArray[int]:
+    async with DeviceCollector(mock=True):
+        bit_array = BitArray({i: soft_signal_rw(int) for i in range(8)})
+    return bit_array
+
+
+async def test_given_members_set_then_array_matches_in_index_order(
+    bit_array: BitArray[int],
+):
+    set_mock_value(bit_array[1], 1)
+    set_mock_value(bit_array[6], 5)
+
+    assert (await bit_array.get_value()).tolist() == [
+        False,
+        True,
+        False,
+        False,
+        False,
+        False,
+        True,
+        False,
+    ]
+    assert await bit_array.count_set() == 2
+
+
+async def test_given_is_set_function_then_used_for_each_member():
+    async with DeviceCollector(mock=True):
+        bit_array = BitArray(
+            {i: soft_signal_rw(str) for i in range(3)}, is_set=lambda v: v == "IN"
+        )
+    set_mock_value(bit_array[0], "IN")
+    set_mock_value(bit_array[2], "OUT")
+
+    assert (await bit_array.get_value()).tolist() == [True, False, False]
+
+
+async def test_when_array_read_then_members_not_got(bit_array: BitArray[int]):
+    with patch.object(
+        type(bit_array[0]), "get_value", side_effect=AssertionError
+    ) as get_value:
+        for _ in range(3):
+            await bit_array.count_set()
+            await bit_array.get_value()
+    get_value.assert_not_called()
+
+
+async def test_given_member_monitor_not_updated_when_array_read_uncached_then_member_got(
+    bit_array: BitArray[int],
+):
+    bit_array[5].clear_sub(bit_array._callbacks[5])
+    set_mock_value(bit_array[5], 1)
+
+    assert await bit_array.count_set() == 0
+    assert (await bit_array.get_value(cached=False)).tolist() == [
+        False,
+        False,
+        False,
+        False,
+        False,
+        True,
+        False,
+        False,
+    ]
+
+
+async def test_when_members_change_to_expected_then_wait_for_value_returns(
+    bit_array: BitArray[int],
+):
+    expected = [True, False] * 4
+    waiting = asyncio.create_task(bit_array.wait_for_value(expected, timeout=1))
+    await asyncio.sleep(0)
+    assert not waiting.done()
+
+    for i in range(0, 8, 2):
+        set_mock_value(bit_array[i], 1)
+
+    await waiting
+
+
+async def test_given_members_never_match_then_wait_for_value_times_out(
+    bit_array: BitArray[int],
+):
+    set_mock_value(bit_array[0], 1)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await bit_array.wait_for_value([False] * 8, timeout=0.01)
+
+
+async def test_when_reconnected_then_members_still_monitored(
+    bit_array: BitArray[int],
+):
+    await bit_array.connect(mock=True, force_reconnect=True)
+    set_mock_value(bit_array[3], 1)
+
+    assert await bit_array.count_set() == 1
@@ -1,11 +1,29 @@
+import os
+import shutil
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
 import pytest
 from pytest import mark
 
 from dodal.devices.util.lookup_tables import (
+    LookupTable,
     energy_distance_table,
+    get_lookup_table,
+    get_lookup_table_async,
     linear_interpolation_lut,
+    linear_interpolation_lut_array,
 )
 
+ROLL_CONVERTER = "tests/test_data/test_beamline_dcm_roll_converter.txt"
+
+
+@pytest.fixture(autouse=True)
+def no_cached_lookup_tables():
+    with patch.dict("dodal.devices.util.lookup_tables._lookup_tables", clear=True):
+        yield
+
 
 async def test_energy_to_distance_table_correct_format():
     table = await energy_distance_table(
@@ -44,8 +62,101 @@ def test_linear_interpolation_extrapolates_returning_the_last_value(s, expected_
     assert actual_t == expected_t, f"actual {actual_t} != expected {expected_t}"
 
 
-def test_linear_interpolation_rejects_non_monotonic_increasing():
+@pytest.mark.parametrize(
+    "path", [ROLL_CONVERTER, ROLL_CONVERTER[:-4] + "_reversed.txt"]
+)
+def test_linear_interpolation_of_array_matches_interpolating_each_value(path: str):
+    values = np.array([[1.0, 2.0, 3.0], [5.0, 5.25, 7.0]])
+
+    converted = linear_interpolation_lut_array(path)(values)
+
+    assert converted.shape == values.shape
+    assert converted.tolist() == [
+        [linear_interpolation_lut(path)(s) for s in row] for row in values
+    ]
+
+
+@pytest.mark.parametrize(
+    "lut", [linear_interpolation_lut, linear_interpolation_lut_array]
+)
+def test_linear_interpolation_rejects_non_monotonic_increasing(lut):
     with pytest.raises(AssertionError):
-        linear_interpolation_lut(
-            "tests/test_data/test_beamline_dcm_roll_converter_non_monotonic.txt"
-        )
+        lut("tests/test_data/test_beamline_dcm_roll_converter_non_monotonic.txt")
+
+
+@pytest.mark.parametrize(
+    "energy, expected_output", [(5730, 5.4606), (7200, 6.045), (9000, 6.404)]
+)
+def test_correct_closest_distance_to_energy_from_table(energy, expected_output):
+    table = LookupTable.from_rows(
+        np.array([[5700, 5.4606], [7000, 6.045], [9700, 6.404]])
+    )
+    assert table.nearest(energy) == expected_output
+
+
+@pytest.mark.parametrize("rows", [[[1, 10], [3, 30]], [[3, 30], [1, 10]]])
+def test_given_value_between_two_equally_close_then_nearest_uses_lower(rows):
+    table = LookupTable.from_rows(np.array(rows))
+    assert table.nearest(2) == 10
+
+
+def test_nearest_and_interpolate_accept_arrays():
+    table = LookupTable.from_rows(
+        np.array([[9700, 6.404], [5700, 5.4606], [7000, 6.045]])
+    )
+    energies = np.array([5000, 5730, 7200, 9000, 10000])
+
+    assert table.nearest(energies).tolist() == [5.4606, 5.4606, 6.045, 6.404, 6.404]
+    assert np.allclose(
+        table.interpolate(energies),
+        [np.interp(e, [5700, 7000, 9700], [5.4606, 6.045, 6.404]) for e in energies],
+    )
+
+
+def test_given_single_row_table_then_nearest_is_that_row():
+    table = LookupTable.from_rows(np.array([[5700, 5.4606]]))
+    assert table.nearest(1000) == 5.4606
+    assert table.nearest(np.array([1000, 9000])).tolist() == [5.4606, 5.4606]
+
+
+def test_given_table_with_several_target_columns_then_each_can_be_looked_up():
+    table = LookupTable.from_rows(np.array([[1, 10, 100], [2, 20, 200]]))
+    assert table.interpolate(1.5, column=0) == 15
+    assert table.interpolate(1.5, column=1) == 150
+
+
+def test_when_lookup_table_got_twice_then_file_only_read_once():
+    with patch(
+        "dodal.devices.util.lookup_tables.loadtxt", side_effect=np.loadtxt
+    ) as mock_loadtxt:
+        first = get_lookup_table(ROLL_CONVERTER)
+        second = get_lookup_table(ROLL_CONVERTER)
+
+    assert first is second
+    mock_loadtxt.assert_called_once()
+
+
+async def test_when_lookup_table_got_async_then_shared_with_sync():
+    assert await get_lookup_table_async(ROLL_CONVERTER) is get_lookup_table(
+        ROLL_CONVERTER
+    )
+
+
+def test_given_lookup_table_file_modified_then_read_again(tmp_path: Path):
+    path = str(tmp_path / "table.txt")
+    shutil.copy(ROLL_CONVERTER, path)
+    before = linear_interpolation_lut(path)
+
+    with open(path, "a") as stream:
+        stream.write("6.0     10.0\n")
+    modified = os.stat(path).st_mtime_ns
+    os.utime(path, ns=(modified + 1_000_000, modified + 1_000_000))
+
+    assert before(7.0) == 8.0
+    assert linear_interpolation_lut(path)(7.0) == 10.0
+
+
+def test_cached_lookup_table_cannot_be_modified():
+    table = get_lookup_table(ROLL_CONVERTER)
+    with pytest.raises(ValueError):
+        table.rows[0, 0] = 0
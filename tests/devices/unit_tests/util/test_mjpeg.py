@@ -0,0 +1,96 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from dodal.devices.util.mjpeg import MJPEGStream
+
+JPEGS = [
+    b"\xff\xd8first\xff\xd9",
+    b"\xff\xd8second, with a line break\r\n\r\nin it\xff\xd9",
+    b"\xff\xd8third\xff\xd9",
+]
+
+
+def _mock_response(
+    body: bytes, content_type: str = "multipart/x-mixed-replace; boundary=frame"
+) -> MagicMock:
+    """A response which gives the body in reads of at most 7 bytes, so that frames are
+    split over many reads"""
+    position = 0
+
+    async def read(n: int) -> bytes:
+        nonlocal position
+        chunk = body[position : position + min(n, 7)]
+        position += len(chunk)
+        return chunk
+
+    response = MagicMock()
+    response.headers = {"Content-Type": content_type}
+    response.content.read = AsyncMock(side_effect=read)
+    return response
+
+
+def _body(jpegs: list[bytes], with_content_length: bool, boundary=b"frame") -> bytes:
+    body = b""
+    for jpeg in jpegs:
+        body += b"--" + boundary + b"\r\nContent-Type: image/jpeg\r\n"
+        if with_content_length:
+            body += b"Content-Length: %d\r\n" % len(jpeg)
+        body += b"\r\n" + jpeg + b"\r\n"
+    return body + b"--" + boundary + b"--\r\n"
+
+
+@pytest.mark.parametrize("with_content_length", [True, False])
+async def test_given_stream_with_boundary_then_all_frames_read(
+    with_content_length: bool,
+):
+    stream = MJPEGStream(_mock_response(_body(JPEGS, with_content_length)))
+
+    assert [jpeg async for jpeg in stream] == JPEGS
+
+
+async def test_given_content_length_then_frame_containing_boundary_read():
+    jpeg = b"\xff\xd8not a\r\n--frame\r\nboundary\xff\xd9"
+    stream = MJPEGStream(_mock_response(_body([jpeg, JPEGS[0]], True)))
+
+    assert await stream.read_frame() == jpeg
+    assert await stream.read_frame() == JPEGS[0]
+
+
+async def test_given_no_boundary_or_content_length_then_frames_found_by_jpeg_markers():
+    stream = MJPEGStream(
+        _mock_response(
+            _body(JPEGS, with_content_length=False),
+            content_type="multipart/x-mixed-replace",
+        )
+    )
+
+    assert [jpeg async for jpeg in stream] == JPEGS
+
+
+async def test_given_quoted_boundary_then_frames_read():
+    stream = MJPEGStream(
+        _mock_response(
+            _body(JPEGS, with_content_length=False, boundary=b"--my boundary"),
+            content_type='multipart/x-mixed-replace;boundary="--my boundary"',
+        )
+    )
+
+    assert [jpeg async for jpeg in stream] == JPEGS
+
+
+async def test_given_stream_ends_part_way_through_frame_then_read_frame_raises():
+    body = _body(JPEGS[:1], with_content_length=True) + b"--frame\r\n\r\n\xff\xd8"
+    stream = MJPEGStream(_mock_response(body))
+
+    assert await stream.read_frame() == JPEGS[0]
+    with pytest.raises(EOFError):
+        await stream.read_frame()
+
+
+async def test_when_frames_read_then_parsed_data_removed_from_buffer():
+    body = _body(JPEGS * 10, True)
+    stream = MJPEGStream(_mock_response(body))
+
+    async for _ in stream:
+        assert len(stream._buffer) < len(body) / 10
@@ -0,0 +1,124 @@
+import numpy as np
+import pytest
+from bluesky.run_engine import RunEngine
+from conftest import MOCK_DAQ_CONFIG_PATH
+from ophyd_async.core import DeviceCollector, set_mock_value
+
+from dodal.devices.dcm import DCM
+from dodal.devices.detector.det_dist_to_beam_converter import (
+    Axis,
+    DetectorDistanceToBeamXYConverter,
+)
+from dodal.devices.undulator import Undulator
+from dodal.devices.undulator_dcm import UndulatorDCM
+from dodal.devices.util.lookup_tables import (
+    get_lookup_table,
+    linear_interpolation_lut,
+)
+from dodal.plans.energy_scan_setpoints import (
+    EnergyScanSetpoints,
+    calculate_energy_scan_setpoints,
+    energies_to_bragg_angles,
+)
+
+ID_GAP_LOOKUP_TABLE_PATH = (
+    "./tests/devices/unit_tests/test_beamline_undulator_to_gap_lookup_table.txt"
+)
+DET_DIST_LOOKUP_TABLE_PATH = "tests/test_data/test_det_dist_converter.txt"
+SI_111_D_SPACING_ANGSTROM = 3.13560
+ENERGIES_KEV = np.linspace(6, 18, 13)
+
+
+@pytest.fixture
+async def undulator_dcm(RE: RunEngine) -> UndulatorDCM:
+    async with DeviceCollector(mock=True):
+        undulator = Undulator(
+            "UND-01",
+            name="undulator",
+            id_gap_lookup_table_path=ID_GAP_LOOKUP_TABLE_PATH,
+        )
+        dcm = DCM("DCM-01", name="dcm")
+        undulator_dcm = UndulatorDCM(
+            undulator, dcm, MOCK_DAQ_CONFIG_PATH, name="undulator_dcm"
+        )
+    set_mock_value(dcm.crystal_metadata_d_spacing, SI_111_D_SPACING_ANGSTROM)
+    return undulator_dcm
+
+
+def test_bragg_angle_for_energy_matches_braggs_law():
+    # 12.3984 keV is a wavelength of 1 angstrom
+    assert energies_to_bragg_angles(12.3984, 1.0) == pytest.approx(30.0)
+    assert energies_to_bragg_angles([12.3984, 24.7968], 1.0) == pytest.approx(
+        [30.0, np.degrees(np.arcsin(0.25))]
+    )
+
+
+def test_energy_scan_bragg_angles_use_dcm_d_spacing_in_angstrom(
+    undulator_dcm: UndulatorDCM,
+):
+    RE = RunEngine(call_returns_result=True)
+
+    # 12.3984 keV is a wavelength of 1 angstrom
+    setpoints: EnergyScanSetpoints = RE(
+        calculate_energy_scan_setpoints(undulator_dcm, [12.3984])
+    ).plan_result  # type: ignore
+
+    # asin(1 / (2 * 3.1356)) for the Si(111) reflection
+    assert setpoints.bragg_angles_deg.tolist() == pytest.approx([9.1755], abs=1e-4)
+
+
+def test_energy_scan_setpoints_match_looking_up_each_energy(
+    undulator_dcm: UndulatorDCM,
+):
+    RE = RunEngine(call_returns_result=True)
+
+    setpoints: EnergyScanSetpoints = RE(
+        calculate_energy_scan_setpoints(undulator_dcm, ENERGIES_KEV)
+    ).plan_result  # type: ignore
+
+    gap_table = get_lookup_table(ID_GAP_LOOKUP_TABLE_PATH)
+    pitch_lut = linear_interpolation_lut(undulator_dcm.pitch_energy_table_path)
+    roll_lut = linear_interpolation_lut(undulator_dcm.roll_energy_table_path)
+    bragg_angles = [
+        float(energies_to_bragg_angles(energy, SI_111_D_SPACING_ANGSTROM))
+        for energy in ENERGIES_KEV
+    ]
+    assert setpoints.energies_kev.tolist() == ENERGIES_KEV.tolist()
+    assert setpoints.undulator_gaps_mm.tolist() == [
+        gap_table.nearest(energy * 1000) for energy in ENERGIES_KEV
+    ]
+    assert setpoints.bragg_angles_deg.tolist() == pytest.approx(bragg_angles)
+    assert setpoints.dcm_pitches_mrad.tolist() == pytest.approx(
+        [pitch_lut(angle) for angle in bragg_angles]
+    )
+    assert setpoints.dcm_rolls_mrad.tolist() == pytest.approx(
+        [roll_lut(angle) for angle in bragg_angles]
+    )
+    assert setpoints.beam_x_mm is None and setpoints.beam_y_mm is None
+
+
+@pytest.mark.parametrize(
+    "detector_distances_mm", [300.0, np.linspace(200, 500, len(ENERGIES_KEV))]
+)
+def test_energy_scan_setpoints_include_beam_centre_for_detector_distances(
+    undulator_dcm: UndulatorDCM, detector_distances_mm
+):
+    RE = RunEngine(call_returns_result=True)
+    converter = DetectorDistanceToBeamXYConverter(DET_DIST_LOOKUP_TABLE_PATH)
+
+    setpoints: EnergyScanSetpoints = RE(
+        calculate_energy_scan_setpoints(
+            undulator_dcm, ENERGIES_KEV, converter, detector_distances_mm
+        )
+    ).plan_result  # type: ignore
+
+    distances = np.broadcast_to(detector_distances_mm, ENERGIES_KEV.shape)
+    assert setpoints.beam_x_mm is not None and setpoints.beam_y_mm is not None
+    assert setpoints.beam_x_mm.tolist() == [
+        converter.get_beam_xy_from_det_dist(distance, Axis.X_AXIS)
+        for distance in distances
+    ]
+    assert setpoints.beam_y_mm.tolist() == [
+        converter.get_beam_xy_from_det_dist(distance, Axis.Y_AXIS)
+        for distance in distances
+    ]
@@ -1,4 +1,8 @@
+import importlib
 import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -6,12 +10,16 @@ from bluesky.protocols import Readable
 from ophyd import EpicsMotor
 
 from dodal.beamlines import i03, i23
+from dodal.devices.cryostream import CryoStream
 from dodal.utils import (
     _find_next_run_number_from_files,
     collect_factories,
     get_beamline_based_on_environment_variable,
+    get_factory_index,
     get_hostname,
     get_run_number,
+    invoke_factories,
+    lazy_import,
     make_all_devices,
     make_device,
 )
@@ -31,6 +39,40 @@ def test_finds_device_factories() -> None:
     } == factories
 
 
+def test_factory_index_describes_factories() -> None:
+    import tests.fake_beamline_dependencies as fake_beamline
+
+    index = get_factory_index(fake_beamline)
+
+    assert index.keys() == {"device_x", "device_y", "device_z"}
+    assert index["device_z"].dependencies == ("device_x", "device_y")
+    assert index["device_z"].return_type is CryoStream
+    assert index["device_z"].factory is fake_beamline.device_z
+    assert not index["device_y"].is_v2 and not index["device_y"].skip
+
+
+def test_factory_index_is_cached() -> None:
+    import tests.fake_beamline_dependencies as fake_beamline
+
+    index = get_factory_index(fake_beamline)
+    with patch("dodal.utils.signature") as mock_signature:
+        assert get_factory_index(fake_beamline) is index
+        make_device(fake_beamline, "device_z")
+        make_all_devices(fake_beamline)
+    mock_signature.assert_not_called()
+
+
+def test_factory_index_is_recomputed_when_module_reloaded() -> None:
+    import tests.fake_beamline_dependencies as fake_beamline
+
+    index = get_factory_index(fake_beamline)
+    importlib.reload(fake_beamline)
+    new_index = get_factory_index(fake_beamline)
+
+    assert new_index is not index
+    assert new_index["device_x"].factory is fake_beamline.device_x
+
+
 def test_makes_devices() -> None:
     import tests.fake_beamline as fake_beamline
 
@@ -57,6 +99,55 @@ def test_makes_devices_with_module_name() -> None:
     assert {"readable", "motor", "cryo"} == devices.keys() and len(exceptions) == 0
 
 
+def test_makes_independent_devices_concurrently() -> None:
+    # Both factories must be waiting at the barrier at the same time for it to pass
+    barrier = threading.Barrier(2, timeout=5)
+
+    def device_x() -> CryoStream:
+        barrier.wait()
+        return _mock_with_name("readable")
+
+    def device_y() -> EpicsMotor:
+        barrier.wait()
+        return _mock_with_name("motor")
+
+    devices, exceptions = invoke_factories({"device_x": device_x, "device_y": device_y})
+    assert {"readable", "motor"} == devices.keys() and len(exceptions) == 0
+
+
+def test_devices_depending_on_a_failed_device_are_reported_as_exceptions() -> None:
+    import tests.fake_beamline_broken_dependency as fake_beamline
+
+    devices, exceptions = make_all_devices(fake_beamline)
+    assert {"readable"} == devices.keys()
+    assert {"device_y", "device_z"} == exceptions.keys()
+    assert isinstance(exceptions["device_y"], AssertionError)
+    assert isinstance(exceptions["device_z"], RuntimeError)
+
+
+def test_devices_with_circular_dependencies_are_reported_as_exceptions() -> None:
+    def device_x(device_y: EpicsMotor) -> CryoStream:
+        return _mock_with_name("readable")
+
+    def device_y(device_x: CryoStream) -> EpicsMotor:
+        return _mock_with_name("motor")
+
+    def device_z() -> EpicsMotor:
+        return _mock_with_name("other_motor")
+
+    devices, exceptions = invoke_factories(
+        {"device_x": device_x, "device_y": device_y, "device_z": device_z}
+    )
+    assert {"other_motor"} == devices.keys()
+    assert {"device_x", "device_y"} == exceptions.keys()
+
+
+def _mock_with_name(name: str) -> MagicMock:
+    mock = MagicMock()
+    mock.name = name
+    return mock
+
+
 def test_get_hostname() -> None:
     with patch("dodal.utils.socket.gethostname") as mock:
         mock.return_value = "a.b.c"
@@ -213,3 +304,19 @@ def test_get_run_number_uses_prefix(mock_list_dir: MagicMock):
     assert get_run_number("dir", "bar") == 7
     assert get_run_number("dir", "baz") == 29
     assert get_run_number("dir", "qux") == 1
+
+
+def test_lazy_import_imports_module_once_when_first_used_from_many_threads():
+    with (
+        patch.dict(sys.modules),
+        patch("dodal.utils.import_module", wraps=importlib.import_module) as importer,
+    ):
+        sys.modules.pop("colorsys", None)
+        colorsys = lazy_import("colorsys")
+        importer.assert_not_called()
+
+        with ThreadPoolExecutor(8) as executor:
+            hsvs = list(executor.map(lambda _: colorsys.rgb_to_hsv(1, 0, 0), range(8)))
+
+    assert hsvs == [(0.0, 1.0, 1)] * 8
+    importer.assert_called_once_with("colorsys")
@@ -1,4 +1,5 @@
 import logging
+import threading
 from pathlib import Path, PosixPath
 from typing import cast
 from unittest.mock import MagicMock, call, patch
@@ -15,6 +16,7 @@ from dodal.log import (
     BeamlineFilter,
     CircularMemoryHandler,
     DodalLogHandlers,
+    DroppingQueueHandler,
     clear_all_loggers_and_handlers,
     do_default_logging_setup,
     get_logging_file_path,
@@ -215,12 +217,68 @@ def test_given_circular_memory_handler_with_varying_number_of_messages_when_reco
     target.handle.assert_not_called()  # type: ignore
     error_message = logging.LogRecord("Error", logging.ERROR, "", 0, None, None, None)
     circular_handler.emit(error_message)
-    expected_calls = [
-        call(message) for message in info_messages[expected_messages_start_idx:]
+    expected_messages = info_messages[expected_messages_start_idx:] + [error_message]
+    assert _handled(target) == [_summary(message) for message in expected_messages]
+
+
+def test_given_circular_memory_handler_flushed_when_second_error_then_only_new_messages_written():
+    target = MagicMock(spec=logging.Handler)
+    circular_handler = CircularMemoryHandler(10, target=target)
+    circular_handler.handle(_record("Info_0"))
+    circular_handler.handle(_record("Error_0", logging.ERROR))
+    circular_handler.handle(_record("Info_1"))
+    circular_handler.handle(_record("Error_1", logging.ERROR))
+
+    assert [message for _, _, message in _handled(target)] == [
+        "Info_0",
+        "Error_0",
+        "Info_1",
+        "Error_1",
     ]
-    expected_calls.append(call(error_message))
-    assert target.handle.call_count == len(expected_calls)  # type: ignore
-    target.handle.assert_has_calls(expected_calls)  # type: ignore
+    assert len(circular_handler.buffer) == 0
+
+
+def test_given_circular_memory_handler_with_max_bytes_then_oldest_messages_dropped():
+    target = MagicMock(spec=logging.Handler)
+    circular_handler = CircularMemoryHandler(1000, target=target, max_bytes=3000)
+    for i in range(100):
+        circular_handler.handle(_record(f"Info_{i}" + "x" * 90))
+
+    assert circular_handler.buffer_bytes <= 3000
+    assert 0 < len(circular_handler.buffer) < 100
+    circular_handler.handle(_record("Error", logging.ERROR))
+    messages = [message for _, _, message in _handled(target)]
+    assert messages[-2].startswith("Info_99")
+    assert messages[-1] == "Error"
+
+
+def test_circular_memory_handler_keeps_message_exception_and_extras_for_formatting():
+    target = MagicMock(spec=logging.Handler)
+    circular_handler = CircularMemoryHandler(10, target=target)
+    arguments = ["before"]
+    logger = logging.getLogger("test_circular_memory_handler")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(circular_handler)
+    try:
+        try:
+            raise ValueError("Bad value")
+        except ValueError:
+            logger.debug(
+                "%s", arguments, exc_info=True, extra={"ophyd_async_device_name": "dev"}
+            )
+        arguments[0] = "after"
+        logger.error("Error")
+    finally:
+        logger.removeHandler(circular_handler)
+
+    record = target.handle.call_args_list[0].args[0]
+    formatted = log.DEFAULT_FORMATTER.format(record)
+    assert formatted.startswith("[dev]")
+    assert "['before']" in formatted
+    assert "test_log:" in formatted
+    assert "ValueError: Bad value" in formatted
+    assert record.levelname == "DEBUG"
 
 
 def test_when_circular_memory_handler_closed_then_clears_buffer_and_target():
@@ -262,6 +320,125 @@ async def test_ophyd_async_logger_configured(dodal_logger_for_tests):
     assert f"[{test_device_name}]" in stream_handler.stream.write.call_args.args[0]
 
 
+def _record(message: str, level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord("Dodal", level, "", 0, message, None, None)
+
+
+def _summary(record: logging.LogRecord) -> tuple[str, int, str]:
+    return record.name, record.levelno, record.getMessage()
+
+
+def _handled(target: MagicMock) -> list[tuple[str, int, str]]:
+    return [_summary(call.args[0]) for call in target.handle.call_args_list]
+
+
+def _blocking_handler() -> tuple[MagicMock, threading.Event, threading.Event]:
+    """A handler which waits for the returned unblock event before handling each
+    record, and sets the returned started event once it starts waiting"""
+    started, unblock = threading.Event(), threading.Event()
+    handler = MagicMock(spec=logging.Handler)
+    handler.level = logging.DEBUG
+
+    def handle(record):
+        started.set()
+        unblock.wait(5)
+
+    handler.handle.side_effect = handle
+    return handler, started, unblock
+
+
+@patch("dodal.log.GELFTCPHandler", autospec=True)
+def test_given_use_queue_then_handlers_run_from_queue_handler(
+    mock_GELFTCPHandler, dodal_logger_for_tests: logging.Logger
+):
+    mock_GELFTCPHandler.return_value.level = logging.INFO
+    handlers = set_up_all_logging_handlers(
+        dodal_logger_for_tests, Path("tmp/dev"), "dodal.log", True, 10, use_queue=True
+    )
+    queue_handler = handlers.get("queue_handler")
+    assert queue_handler is not None
+    assert dodal_logger_for_tests.handlers == [queue_handler]
+    assert queue_handler.listener.handlers == (
+        handlers["stream_handler"],
+        handlers["graylog_handler"],
+        handlers["info_file_handler"],
+        handlers["debug_memory_handler"],
+    )
+
+    dodal_logger_for_tests.info("test %s", "message")
+    queue_handler.flush()
+
+    graylog_handler = cast(MagicMock, handlers["graylog_handler"])
+    graylog_handler.handle.assert_called_once()
+    record = graylog_handler.handle.call_args.args[0]
+    assert record.getMessage() == "test message"
+    assert record.threadName == threading.current_thread().name
+    queue_handler.close()
+
+
+def test_given_queue_full_then_records_dropped_and_counted_without_waiting():
+    handler, started, unblock = _blocking_handler()
+    queue_handler = DroppingQueueHandler([handler], queue_size=2)
+
+    # The first is taken by the listener, which then waits, and two more fill the queue
+    queue_handler.handle(_record("Info_0"))
+    assert started.wait(5)
+    for i in range(1, 10):
+        queue_handler.handle(_record(f"Info_{i}"))
+
+    assert queue_handler.dropped == 7
+    unblock.set()
+    queue_handler.flush()
+    queue_handler.handle(_record("After"))
+    queue_handler.close()
+
+    messages = [call.args[0].getMessage() for call in handler.handle.call_args_list]
+    assert messages[:3] == ["Info_0", "Info_1", "Info_2"]
+    assert messages[3:] == [
+        "Dropped 7 log messages as the log queue was full",
+        "After",
+    ]
+    assert handler.handle.call_args_list[3].args[0].levelno == logging.WARNING
+
+
+def test_when_queue_handler_closed_then_queued_records_handled_and_handlers_closed():
+    handler, _, unblock = _blocking_handler()
+    queue_handler = DroppingQueueHandler([handler], queue_size=100)
+    for i in range(50):
+        queue_handler.handle(_record(f"Info_{i}"))
+
+    unblock.set()
+    queue_handler.close()
+
+    assert handler.handle.call_count == 50
+    handler.close.assert_called_once()
+    assert queue_handler.dropped == 0
+
+
+def test_queue_handler_passes_unformatted_records_with_arguments_merged():
+    handler = MagicMock(spec=logging.Handler)
+    handler.level = logging.DEBUG
+    queue_handler = DroppingQueueHandler([handler], queue_size=10)
+    arguments = ["before"]
+
+    queue_handler.handle(
+        logging.LogRecord("Dodal", logging.INFO, "", 0, "%s", (arguments,), None)
+    )
+    arguments[0] = "after"
+    queue_handler.flush()
+
+    record = handler.handle.call_args.args[0]
+    assert record.getMessage() == "['before']"
+    assert record.levelname == "INFO"
+    queue_handler.close()
+
+
+@patch("dodal.log.set_up_all_logging_handlers")
+def test_do_default_logging_setup_passes_use_queue(mock_set_up: MagicMock):
+    do_default_logging_setup(use_queue=True)
+    assert mock_set_up.call_args.args[-1] is True
+
+
 def _close_all_handlers(handler_config: DodalLogHandlers):
     for handler in handler_config.values():
         cast(logging.Handler, handler).close()